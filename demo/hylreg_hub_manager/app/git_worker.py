@@ -1,57 +1,413 @@
 """在后台线程执行 git 命令，通过信号返回结果。"""
 
-from PyQt6.QtCore import QObject, QThread, pyqtSignal
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from core.batching import PathResult, run_batched, split_pathspec
+from core.git_runner import CancelToken, timeout_for
+from core.progress import ProgressTracker, expected_paths
 
 
 class GitWorker(QObject):
-    """在后台线程执行 git 命令。"""
+    """在后台线程执行 git 命令。timeout 为 None 时按操作类型取默认超时。"""
 
     finished = pyqtSignal(str, str, int)  # stdout, stderr, returncode
-    output_line = pyqtSignal(str)  # 逐行输出（可选）
+    output_line = pyqtSignal(str, bool)  # 逐行输出：行内容, 是否来自 stderr
 
-    def __init__(self, repo_root: str, args: list[str], timeout: int = 120):
+    def __init__(self, repo_root: str, args: list[str], timeout: int | None = None):
         super().__init__()
         self.repo_root = repo_root
         self.args = args
-        self.timeout = timeout
-        self._cancel = False
+        self.timeout = timeout if timeout is not None else timeout_for(args)
+        self._cancel = CancelToken()
 
     def run(self) -> None:
-        import subprocess
-        try:
-            proc = subprocess.Popen(
-                ["git", *self.args],
-                cwd=self.repo_root,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            stdout, stderr = proc.communicate(timeout=self.timeout)
-            code = proc.returncode or 0
-        except (FileNotFoundError, subprocess.TimeoutExpired, Exception) as e:
-            stdout, stderr, code = "", str(e), -1
-        self.finished.emit(stdout or "", stderr or "", code)
+        from core.git_runner import stream_git
+        stdout, stderr, code = stream_git(
+            self.repo_root,
+            self.args,
+            self.output_line.emit,
+            timeout=self.timeout,
+            cancel=self._cancel,
+        )
+        self.finished.emit(stdout, stderr, code)
 
     def cancel(self) -> None:
-        self._cancel = True
+        """终止正在执行的 git 及其子进程（可在任意线程调用）；尚未开始时 run() 直接返回失败。"""
+        self._cancel.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_cancelled()
 
 
 class GitWorkerThread(QThread):
-    """包装 GitWorker 的 QThread。"""
+    """
+    包装 GitWorker 的 QThread。
+    给定 line_sink 时逐行回调 line_sink(行, 是否 stderr)（在后台线程中调用），
+    用于把输出流式写入线程安全的缓冲区，而不是每行发一个信号。
+    cancel() 终止 git 的整个进程组，线程随即结束。
+    给定 progress 时 stderr 中的 --progress 刷新交给它解析，不进入 line_sink。
+    多路径命令经 core.batching.run_batched 执行，各路径的结果保存在 path_results。
+    """
 
     finished = pyqtSignal(str, str, int)
 
-    def __init__(self, repo_root: str, args: list[str], timeout: int = 120):
+    def __init__(
+        self,
+        repo_root: str,
+        args: list[str],
+        timeout: int | None = None,
+        line_sink: Callable[[str, bool], None] | None = None,
+        cancel_token: CancelToken | None = None,
+        progress: ProgressTracker | None = None,
+    ):
         super().__init__()
         self.repo_root = repo_root
         self.args = args
-        self.timeout = timeout
+        self.timeout = timeout if timeout is not None else timeout_for(args)
+        self.line_sink = line_sink
+        self.cancel_token = cancel_token or CancelToken()
+        self.progress = progress
+        self.path_results: dict[str, PathResult] = {}
+
+    def cancel(self) -> None:
+        self.cancel_token.cancel()
 
     def run(self) -> None:
-        from core.git_runner import run_git
-        stdout, stderr, code = run_git(
-            self.repo_root,
-            self.args,
-            timeout=self.timeout,
-        )
+        from core.git_runner import run_git, stream_git
+
+        def execute(args: list[str]) -> tuple[str, str, int]:
+            if self.line_sink is not None:
+                return stream_git(
+                    self.repo_root,
+                    args,
+                    self.line_sink,
+                    timeout=self.timeout,
+                    cancel=self.cancel_token,
+                    on_progress=self.progress.feed if self.progress is not None else None,
+                )
+            return run_git(self.repo_root, args, timeout=self.timeout, cancel=self.cancel_token)
+
+        stdout, stderr, code, self.path_results = run_batched(self.repo_root, self.args, execute)
         self.finished.emit(stdout, stderr, code)
+
+
+class JobState(str, Enum):
+    """任务状态。"""
+
+    PENDING = "pending"  # 排队或等待前置步骤
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"  # 返回码非 0，或超时
+    CANCELLED = "cancelled"  # 被用户取消（运行中的进程组已终止）
+    SKIPPED = "skipped"  # 前置步骤失败或被取消，未执行
+
+
+@dataclass(eq=False)
+class GitJob:
+    """调度器中的一条 git 命令及其结果。"""
+
+    repo_root: str
+    args: list[str]
+    batch_id: int
+    timeout: int = 120
+    state: JobState = JobState.PENDING
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+    progress: ProgressTracker | None = None  # 带 --progress 的命令才有
+    path_results: dict[str, PathResult] = field(default_factory=dict)  # 多路径命令各路径的结果
+    stdout: str = ""
+    stderr: str = ""
+    returncode: int | None = None  # None 表示尚未执行
+    elapsed: float | None = None  # 执行耗时（秒）；None 表示尚未执行
+    _started: float = 0.0
+    fallback_args: list[str] | None = None  # 前置步骤未成功时改为执行的命令
+    _waiting: int = 0  # 尚未完成的前置步骤数
+    _dependents: list[tuple["GitJob", bool]] = field(default_factory=list)  # (后续任务, 是否要求本任务成功)
+
+    def command(self) -> str:
+        """用于显示的命令文本。"""
+        return "git " + " ".join(self.args)
+
+
+@dataclass
+class PipelineStep:
+    """流水线中的一步。"""
+
+    args: list[str]
+    after: list[int]  # 必须先成功完成的步骤
+    wait: list[int] = field(default_factory=list)  # 只需先结束（成功与否均可）的步骤
+    fallback: list[str] | None = None  # after 中有步骤未成功时改为执行的命令；None 表示跳过
+
+
+class GitPipeline:
+    """
+    带依赖关系的一组 git 命令（DAG）。
+    add() 返回步骤编号，after 指定必须先成功完成的步骤；
+    前置步骤失败时，依赖它的步骤（及其后续）会被取消，除非给出了 fallback（改为执行它）。
+    wait 指定只需先结束的步骤：只排定先后（如都要写 hub 的 index），前者失败不影响后者。
+    例外：多路径的前置步骤部分成功、且后续步骤作用于同一组路径时（如 deinit -- a b → rm -- a b），
+    后续步骤只对前置步骤中成功的路径执行，与按路径各自串联的效果相同。
+    """
+
+    def __init__(self) -> None:
+        self.steps: list[PipelineStep] = []
+
+    def add(
+        self,
+        args: list[str],
+        after: list[int] | None = None,
+        wait: list[int] | None = None,
+        fallback: list[str] | None = None,
+    ) -> int:
+        """追加一个步骤，返回其编号。"""
+        deps = list(after or [])
+        waits = list(wait or [])
+        for dep in deps + waits:
+            if not 0 <= dep < len(self.steps):
+                raise ValueError(f"无效的前置步骤: {dep}")
+        self.steps.append(PipelineStep(list(args), deps, waits, list(fallback) if fallback is not None else None))
+        return len(self.steps) - 1
+
+    def chain(
+        self,
+        commands: list[list[str]],
+        after: list[int] | None = None,
+        wait: list[int] | None = None,
+    ) -> list[int]:
+        """追加一串依次执行的步骤（如同一路径的 deinit → rm），返回各步编号。wait 只作用于第一步。"""
+        ids: list[int] = []
+        prev = list(after or [])
+        for args in commands:
+            step = self.add(args, prev, wait if not ids else None)
+            ids.append(step)
+            prev = [step]
+        return ids
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+@dataclass
+class _Batch:
+    """一批同时提交的任务的进度。"""
+
+    total: int
+    done: int = 0
+    failed: int = 0
+    jobs: list[GitJob] = field(default_factory=list)
+
+
+class GitJobScheduler(QObject):
+    """
+    有界并发的 git 任务调度器：同时最多运行 max_concurrency 个 git 进程。
+    就绪任务按 FIFO 顺序执行；流水线中的步骤在前置步骤成功后才就绪。
+    以批次为单位汇报进度；一批任务全部结束时只发一次 batch_finished。
+    单个任务或整批可随时取消；未指定超时时按操作类型取 timeouts（覆盖 DEFAULT_TIMEOUTS）。
+    """
+
+    job_started = pyqtSignal(object)  # GitJob
+    job_finished = pyqtSignal(object)  # GitJob（已填充结果，或状态为 CANCELLED / SKIPPED）
+    batch_progress = pyqtSignal(int, int, int)  # batch_id, done, total
+    batch_finished = pyqtSignal(int, int)  # batch_id, 失败数（含取消）
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        parent: QObject | None = None,
+        line_sink: Callable[[str, bool], None] | None = None,
+    ):
+        super().__init__(parent)
+        self._max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        # 非空时所有任务的输出逐行流式写入 line_sink（后台线程调用）
+        self.line_sink = line_sink
+        self.timeouts: dict[str, int] = {}  # 操作类型 -> 超时秒数
+        self._queue: deque[GitJob] = deque()  # 已就绪的任务
+        self._running: dict[GitWorkerThread, GitJob] = {}
+        self._batches: dict[int, _Batch] = {}
+        self._next_batch_id = 1
+
+    def max_concurrency(self) -> int:
+        """当前并发上限。"""
+        return self._max_concurrency
+
+    def set_max_concurrency(self, value: int) -> None:
+        """调整并发上限；调大时立即启动排队中的任务。"""
+        self._max_concurrency = max(1, value)
+        self._dispatch()
+
+    def submit(
+        self,
+        repo_root: str,
+        commands: list[list[str]],
+        timeout: int | None = None,
+    ) -> int:
+        """提交一批相互独立的命令（按顺序入队），返回批次 id。"""
+        pipeline = GitPipeline()
+        for args in commands:
+            pipeline.add(args)
+        return self.submit_pipeline(repo_root, pipeline, timeout)
+
+    def submit_pipeline(
+        self,
+        repo_root: str,
+        pipeline: GitPipeline,
+        timeout: int | None = None,
+    ) -> int:
+        """按依赖关系提交一条流水线，返回批次 id。timeout 为 None 时每步按操作类型取超时。"""
+        batch_id = self._next_batch_id
+        self._next_batch_id += 1
+        batch = _Batch(total=len(pipeline))
+        self._batches[batch_id] = batch
+        for step in pipeline.steps:
+            args = step.args
+            job_timeout = timeout if timeout is not None else timeout_for(args, self.timeouts)
+            job = GitJob(repo_root, args, batch_id, job_timeout, fallback_args=step.fallback)
+            if "--progress" in args:
+                job.progress = ProgressTracker(repo_root, expected_paths(args))
+            job._waiting = len(step.after) + len(step.wait)
+            for dep in step.after:
+                batch.jobs[dep]._dependents.append((job, True))
+            for dep in step.wait:
+                batch.jobs[dep]._dependents.append((job, False))
+            batch.jobs.append(job)
+            if not job._waiting:
+                self._queue.append(job)
+        if not batch.jobs:
+            # 保证调用方先拿到 batch_id，再收到 batch_finished
+            QTimer.singleShot(0, lambda: self._finish_batch(batch_id))
+        self._dispatch()
+        return batch_id
+
+    def jobs(self, batch_id: int) -> list[GitJob]:
+        """批次中的全部任务（批次已结束时为空列表）。"""
+        batch = self._batches.get(batch_id)
+        return list(batch.jobs) if batch is not None else []
+
+    def is_busy(self) -> bool:
+        """是否有运行中或排队中的任务。"""
+        return bool(self._running or self._queue)
+
+    def cancel_job(self, job: GitJob) -> None:
+        """
+        取消一个任务：排队或等待中的直接标记为 CANCELLED；运行中的终止其 git 进程组，
+        线程结束后标记为 CANCELLED。依赖它的后续步骤被跳过。
+        """
+        if job.state == JobState.PENDING:
+            job.state = JobState.CANCELLED
+            if job in self._queue:
+                self._queue.remove(job)
+            self._complete(job)
+        elif job.state == JobState.RUNNING:
+            job.cancel_token.cancel()
+
+    def cancel_batch(self, batch_id: int) -> None:
+        """取消一批中尚未结束的全部任务。"""
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            return
+        # 先取消运行中的，避免排队的任务在释放出的名额上启动
+        for job in sorted(batch.jobs, key=lambda j: j.state != JobState.RUNNING):
+            if batch_id not in self._batches:
+                break
+            self.cancel_job(job)
+
+    def cancel_all(self) -> None:
+        """取消所有未结束的批次。"""
+        for batch_id in list(self._batches):
+            self.cancel_batch(batch_id)
+
+    def shutdown(self) -> None:
+        """退出前调用：清空队列，终止运行中的 git 进程组并等待线程结束。"""
+        self._queue.clear()
+        for thread in list(self._running):
+            thread.cancel()
+        for thread in list(self._running):
+            thread.wait()
+
+    def _dispatch(self) -> None:
+        while self._queue and len(self._running) < self._max_concurrency:
+            job = self._queue.popleft()
+            thread = GitWorkerThread(
+                job.repo_root, job.args, job.timeout, self.line_sink, job.cancel_token, job.progress
+            )
+            thread.finished.connect(
+                lambda s, e, c, t=thread: self._on_thread_finished(t, s, e, c)
+            )
+            self._running[thread] = job
+            job.state = JobState.RUNNING
+            job._started = time.perf_counter()
+            self.job_started.emit(job)
+            thread.start()
+
+    def _on_thread_finished(
+        self,
+        thread: GitWorkerThread,
+        stdout: str,
+        stderr: str,
+        returncode: int,
+    ) -> None:
+        job = self._running.pop(thread)
+        # run() 已返回，等待线程真正退出后再释放
+        thread.wait()
+        thread.deleteLater()
+        job.stdout, job.stderr, job.returncode = stdout, stderr, returncode
+        job.path_results = thread.path_results
+        job.elapsed = time.perf_counter() - job._started
+        if job.cancel_token.is_cancelled():
+            job.state = JobState.CANCELLED
+        else:
+            job.state = JobState.SUCCEEDED if returncode == 0 else JobState.FAILED
+        self._complete(job)
+        self._dispatch()
+
+    def _complete(self, job: GitJob) -> None:
+        """记录任务结束，并释放或取消依赖它的步骤。"""
+        self.job_finished.emit(job)
+        batch = self._batches[job.batch_id]
+        batch.done += 1
+        if job.state != JobState.SUCCEEDED:
+            batch.failed += 1
+        for dependent, required in job._dependents:
+            if dependent.state != JobState.PENDING:
+                continue
+            if required and job.state != JobState.SUCCEEDED and not self._narrow(dependent, job):
+                if dependent.fallback_args is None:
+                    dependent.state = JobState.SKIPPED
+                    self._complete(dependent)
+                    continue
+                self._use_fallback(dependent)
+            dependent._waiting -= 1
+            if dependent._waiting == 0:
+                self._queue.append(dependent)
+        self.batch_progress.emit(job.batch_id, batch.done, batch.total)
+        # 级联取消时批次可能已在递归中结束
+        if batch.done >= batch.total and job.batch_id in self._batches:
+            self._finish_batch(job.batch_id)
+
+    @staticmethod
+    def _use_fallback(job: GitJob) -> None:
+        # 后备命令作用于同一组路径（如不带 --reference 的同一条 clone），沿用已显示的进度条目
+        job.args = job.fallback_args
+        job.fallback_args = None
+
+    @staticmethod
+    def _narrow(dependent: GitJob, job: GitJob) -> bool:
+        """前置的多路径任务部分成功时，把作用于同一组路径的后续任务缩小到成功的路径；能缩小时返回 True。"""
+        split = split_pathspec(dependent.args)
+        if job.state != JobState.FAILED or split is None or set(split[1]) != set(job.path_results):
+            return False
+        ok = [path for path in split[1] if job.path_results[path].ok]
+        if not ok:
+            return False
+        dependent.args = [*split[0], "--", *ok]
+        return True
+
+    def _finish_batch(self, batch_id: int) -> None:
+        batch = self._batches.pop(batch_id)
+        self.batch_finished.emit(batch_id, batch.failed)
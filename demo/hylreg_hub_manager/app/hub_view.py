@@ -0,0 +1,197 @@
+"""一个 hub 的标签页：子模块表格/树形视图、后台刷新、文件监视与远端检查。"""
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QStackedWidget, QVBoxLayout, QWidget
+
+from app.refresh_service import RefreshService, RefreshSlots
+from app.repo_watcher import RepoWatcher
+from app.submodule_filter import SubmoduleFilterBar
+from app.submodule_table import SubmoduleTable
+from core.cat_file import CatFilePool, CommitSummaryCache
+from core.dirty_scan import DirtyScanCache
+from core.gitmodules import load_gitmodules
+from core.models import SubmoduleInfo
+from core.remote_check import RemoteCheckCache
+from core.status_cache import StatusCache
+from core.submodule_tree import SubmoduleLevelCache
+
+
+@dataclass
+class HubContext:
+    """所有 hub 共用的缓存与加载名额（缓存均以仓库或 git 目录的绝对路径为键，可安全共用）。"""
+
+    slots: RefreshSlots
+    cache: StatusCache = field(default_factory=StatusCache)
+    dirty_cache: DirtyScanCache = field(default_factory=DirtyScanCache)
+    remote_cache: RemoteCheckCache = field(default_factory=RemoteCheckCache)
+    cat_files: CatFilePool = field(default_factory=CatFilePool)
+    summaries: CommitSummaryCache = field(default_factory=CommitSummaryCache)
+    levels: SubmoduleLevelCache = field(default_factory=SubmoduleLevelCache)
+
+
+class HubView(QWidget):
+    """
+    一个 hub 的全部界面状态。不在前台时仍保留表格、文件监视与后台刷新（低优先级），
+    切换回来时无需重新加载。第一次 refresh() 时后台线程先发出磁盘缓存，再重新加载并扫描工作区。
+    树形视图与远端检查在第一次使用时才创建。
+    """
+
+    status_message = pyqtSignal(str)  # 状态栏消息（主窗口只显示前台 hub 的）
+    error_line = pyqtSignal(str)  # 写入输出面板的错误
+    data_shown = pyqtSignal(str)  # "cached"（磁盘缓存）或 "fresh"（首次加载完成）
+
+    def __init__(self, repo_root: str, context: HubContext, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._repo_root = repo_root
+        self._context = context
+        self._tree = None
+        self._remote_checker = None
+        self._watch_pending = repo_root  # 建立监视需要遍历全部子模块，推迟到首次加载结束后
+        self._gitmodules_errors: list = []  # 已报告过的 .gitmodules 错误
+
+        self._table = SubmoduleTable(self)
+        self._filter_bar = SubmoduleFilterBar(self)  # 只作用于表格，树形视图下隐藏
+        self._views = QStackedWidget(self)  # 表格与树形视图
+        self._views.addWidget(self._table)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._filter_bar)
+        layout.addWidget(self._views)
+        self._filter_bar.changed.connect(self._table.set_filter)
+        self._filter_bar.focused.connect(self._table.prepare_filter)
+        self._filter_bar.select_all.connect(self._select_filtered)
+        self._table.filter_counts.connect(self._filter_bar.set_counts)
+
+        self._refresh = RefreshService(
+            self,
+            context.cache,
+            context.dirty_cache,
+            context.remote_cache,
+            context.cat_files,
+            context.summaries,
+            context.slots,
+        )
+        self._watcher = RepoWatcher(self)
+        self._refresh.started.connect(lambda: self._table.set_refreshing(True))
+        self._refresh.idle.connect(self._on_refresh_idle)
+        self._refresh.cached.connect(self._on_cached_loaded)
+        self._refresh.loaded.connect(self._on_loaded)
+        self._refresh.updated.connect(self._table.update_submodules)
+        self._watcher.changed.connect(self._on_repo_files_changed)
+
+    def repo_root(self) -> str:
+        return self._repo_root
+
+    def title(self) -> str:
+        """标签页标题：仓库目录名。"""
+        return Path(self._repo_root).name or self._repo_root
+
+    def table(self) -> SubmoduleTable:
+        return self._table
+
+    def submodules(self) -> list[SubmoduleInfo]:
+        """当前显示的第一层子模块。"""
+        return self._table.table_model().submodules()
+
+    def selected_paths(self) -> list[str]:
+        if self._views.currentWidget() is self._tree:
+            return self._tree.selected_paths()
+        return self._table.selected_paths()
+
+    def refresh(self, paths: list[str] | None = None) -> None:
+        """请求后台刷新；paths 非空时只重新计算这些子模块。"""
+        self._refresh.request(self._repo_root, paths)
+
+    def set_foreground(self, foreground: bool) -> None:
+        """前台 hub 优先取得加载名额，后台 hub 的刷新以低优先级进行。"""
+        self._refresh.set_foreground(foreground)
+
+    def set_tree_mode(self, enabled: bool) -> None:
+        if enabled and self._tree is None:
+            from app.submodule_tree import SubmoduleTree
+
+            self._tree = SubmoduleTree(self._table.table_model(), self, self._context.levels)
+            self._tree.set_repo(self._repo_root)
+            self._views.addWidget(self._tree)
+        self._views.setCurrentWidget(self._tree if enabled else self._table)
+        self._filter_bar.setVisible(not enabled)
+
+    def focus_filter(self) -> None:
+        """聚焦筛选框（树形视图下先切回表格由主窗口负责）。"""
+        self._filter_bar.focus()
+
+    def _select_filtered(self) -> None:
+        # 选中筛选出的全部行，后续操作（更新、删除、检查远端等）即作用于这些子模块
+        self._table.selectAll()
+        self._table.setFocus()
+
+    def check_remotes(self) -> None:
+        """对选中（未选中时为全部）子模块检查远端。"""
+        if self._remote_checker is None:
+            from app.remote_checker import RemoteChecker
+
+            self._remote_checker = RemoteChecker(self, self._context.remote_cache)
+            self._remote_checker.progress.connect(
+                lambda done, total: self.status_message.emit(f"正在检查远端: {done}/{total}")
+            )
+            self._remote_checker.finished.connect(self._on_remote_checked)
+        selected = set(self.selected_paths())
+        items = [info for info in self.submodules() if not selected or info.path in selected]
+        if not self._remote_checker.check(self._repo_root, items):
+            self.status_message.emit("远端检查进行中，请稍候")
+            return
+        self.status_message.emit(f"正在检查 {len(items)} 个子模块的远端…")
+
+    def shutdown(self) -> None:
+        """关闭标签页或退出前调用：停止监视并等待后台线程结束。"""
+        self._watcher.set_repo("")
+        self._refresh.shutdown()
+        if self._remote_checker is not None:
+            self._remote_checker.shutdown()
+        if self._tree is not None:
+            self._tree.shutdown()
+
+    def _on_cached_loaded(self, items: list) -> None:
+        self._table.set_submodules(items)
+        self.data_shown.emit("cached")
+
+    def _on_loaded(self, items: list) -> None:
+        self._table.set_submodules(items)
+        if self._tree is not None:
+            self._tree.revalidate()
+        # .gitmodules 已按 mtime 缓存解析结果，这里不会重新解析；同样的错误只报告一次
+        errors = load_gitmodules(self._repo_root).errors
+        if errors != self._gitmodules_errors:
+            self._gitmodules_errors = errors
+            for error in errors:
+                self.error_line.emit(f"[.gitmodules] 第 {error.line} 行: {error.message}")
+
+    def _on_refresh_idle(self) -> None:
+        self._table.set_refreshing(False)
+        if self._watch_pending:
+            self._watch_pending = ""
+            self._watcher.set_repo(self._repo_root)
+            self.data_shown.emit("fresh")
+
+    def _on_repo_files_changed(self, paths: list[str] | None) -> None:
+        """终端等外部修改了仓库：全量或只刷新受影响的子模块。"""
+        self._refresh.request(self._repo_root, paths)
+
+    def _on_remote_checked(self, items: list, errors: dict) -> None:
+        # 检查期间表格可能已被刷新，只把远端两列合并到当前行上
+        counts = {info.path: (info.remote_ahead, info.remote_behind) for info in items}
+        self._table.update_submodules([
+            replace(info, remote_ahead=counts[info.path][0], remote_behind=counts[info.path][1])
+            for info in self.submodules()
+            if info.path in counts
+        ])
+        for path, message in sorted(errors.items()):
+            self.error_line.emit(f"[检查远端] {path}: {message}")
+        behind = sum(1 for info in items if info.remote_behind)
+        text = f"远端检查完成，{behind} 个子模块落后于远端"
+        if errors:
+            text += f"，{len(errors)} 个失败"
+        self.status_message.emit(text)
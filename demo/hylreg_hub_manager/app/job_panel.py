@@ -0,0 +1,208 @@
+"""进行中的 git 任务列表：每批与每条命令都可取消，带 --progress 的命令显示各子模块的进度。"""
+
+from PyQt6.QtCore import QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QApplication,
+    QHeaderView,
+    QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionProgressBar,
+    QStyleOptionViewItem,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QWidget,
+)
+
+from app.git_worker import GitJob, JobState
+
+_PROGRESS_ROLE = Qt.ItemDataRole.UserRole  # 进度列：0..1，None 表示不显示进度条
+
+
+class _ProgressDelegate(QStyledItemDelegate):
+    """在进度列绘制进度条（不为每行创建控件，几百个子模块也只有绘制开销）。"""
+
+    def paint(self, painter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        value = index.data(_PROGRESS_ROLE)
+        if value is None:
+            super().paint(painter, option, index)
+            return
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 2, -2, -2)
+        bar.minimum, bar.maximum = 0, 1000
+        bar.progress = round(value * 1000)
+        bar.text = index.data(Qt.ItemDataRole.DisplayRole) or f"{round(value * 100)}%"
+        bar.textVisible = True
+        bar.state = option.state
+        QApplication.style().drawControl(QStyle.ControlElement.CE_ProgressBar, bar, painter)
+
+
+class JobPanel(QTreeWidget):
+    """
+    一批命令为一个顶层节点，其下是各条命令；节点右侧的“取消”按钮发出 cancel_batch / cancel_job。
+    命令结束后去掉其取消按钮，整批结束后移除该批；没有进行中的批次时面板隐藏。
+    带进度的命令其下再列出各子模块；进度由定时器每 PROGRESS_INTERVAL_MS 读取一次快照，
+    与 git 刷新进度的频率无关，且只更新变化了的行。
+    """
+
+    cancel_job = pyqtSignal(object)  # GitJob
+    cancel_batch = pyqtSignal(int)  # batch_id
+
+    PROGRESS_INTERVAL_MS = 250
+    COL_COMMAND, COL_STATE, COL_PROGRESS, COL_CANCEL = range(4)
+    _STATE_TEXT = {
+        JobState.PENDING: "排队中",
+        JobState.RUNNING: "运行中",
+        JobState.SUCCEEDED: "完成",
+        JobState.FAILED: "失败",
+        JobState.CANCELLED: "已取消",
+        JobState.SKIPPED: "已跳过",
+    }
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setHeaderLabels(["任务", "状态", "进度", ""])
+        self.setRootIsDecorated(True)
+        self.setUniformRowHeights(True)
+        self.setItemDelegateForColumn(self.COL_PROGRESS, _ProgressDelegate(self))
+        header = self.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(self.COL_COMMAND, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(self.COL_STATE, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(self.COL_PROGRESS, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(self.COL_CANCEL, QHeaderView.ResizeMode.ResizeToContents)
+        self.setColumnWidth(self.COL_PROGRESS, 220)
+        self._batches: dict[int, QTreeWidgetItem] = {}
+        self._batch_jobs: dict[int, list[GitJob]] = {}
+        self._jobs: dict[int, QTreeWidgetItem] = {}  # id(GitJob) -> 节点
+        # 带进度的运行中任务：id(GitJob) -> (任务, 上次读取的 version, 路径 -> 子模块节点)
+        self._tracked: dict[int, tuple[GitJob, int, dict[str, QTreeWidgetItem]]] = {}
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(JobPanel.PROGRESS_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._poll_progress)
+        self.setVisible(False)
+
+    def add_batch(self, batch_id: int, title: str, jobs: list[GitJob]) -> None:
+        """登记刚提交的一批任务。"""
+        if not jobs:
+            return
+        batch_item = QTreeWidgetItem([title, f"0/{len(jobs)}", "", ""])
+        batch_item.setData(self.COL_PROGRESS, _PROGRESS_ROLE, 0.0)
+        self.addTopLevelItem(batch_item)
+        self._add_cancel_button(batch_item, lambda: self.cancel_batch.emit(batch_id))
+        for job in jobs:
+            item = QTreeWidgetItem([job.command(), self._STATE_TEXT[job.state], "", ""])
+            batch_item.addChild(item)
+            self._jobs[id(job)] = item
+            self._add_cancel_button(item, lambda j=job: self.cancel_job.emit(j))
+            if job.progress is not None:
+                item.setData(self.COL_PROGRESS, _PROGRESS_ROLE, 0.0)
+                if job.state == JobState.RUNNING:
+                    self._track(job)
+        # 只有一条命令且没有子模块进度时不必展开
+        batch_item.setExpanded(len(jobs) > 1 or any(job.progress is not None for job in jobs))
+        self._batches[batch_id] = batch_item
+        self._batch_jobs[batch_id] = list(jobs)
+        self.setVisible(True)
+
+    def update_job(self, job: GitJob) -> None:
+        """任务开始或结束时调用。"""
+        item = self._jobs.get(id(job))
+        if item is None:
+            return
+        item.setText(self.COL_STATE, self._STATE_TEXT[job.state])
+        if job.state == JobState.RUNNING and job.progress is not None:
+            self._track(job)
+        if job.state not in (JobState.PENDING, JobState.RUNNING):
+            if id(job) in self._tracked:
+                # 写出最后一次进度，完成的命令记为 100%
+                self._update_progress(job)
+                del self._tracked[id(job)]
+            if job.state == JobState.SUCCEEDED and job.progress is not None:
+                item.setData(self.COL_PROGRESS, _PROGRESS_ROLE, 1.0)
+            self.removeItemWidget(item, self.COL_CANCEL)
+            del self._jobs[id(job)]
+            self._update_batch_progress(job.batch_id)
+
+    def update_batch(self, batch_id: int, done: int, total: int) -> None:
+        item = self._batches.get(batch_id)
+        if item is not None:
+            item.setText(self.COL_STATE, f"{done}/{total}")
+
+    def remove_batch(self, batch_id: int) -> None:
+        """整批结束。"""
+        item = self._batches.pop(batch_id, None)
+        jobs = self._batch_jobs.pop(batch_id, [])
+        if item is None:
+            return
+        # 整批取消时部分任务可能没有单独收到 update_job
+        for job in jobs:
+            self._jobs.pop(id(job), None)
+            self._tracked.pop(id(job), None)
+        self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+        if not self._batches:
+            self.setVisible(False)
+
+    def _add_cancel_button(self, item: QTreeWidgetItem, on_click) -> None:
+        button = QPushButton("取消", self)
+        button.setFlat(True)
+        button.clicked.connect(on_click)
+        self.setItemWidget(item, self.COL_CANCEL, button)
+
+    # ---- 进度 ----
+
+    def _track(self, job: GitJob) -> None:
+        if id(job) not in self._tracked:
+            self._tracked[id(job)] = (job, -1, {})
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _poll_progress(self) -> None:
+        if not self._tracked:
+            self._progress_timer.stop()
+            return
+        changed: set[int] = set()
+        for job, version, _ in list(self._tracked.values()):
+            if job.progress.version != version:
+                self._update_progress(job)
+                changed.add(job.batch_id)
+        for batch_id in changed:
+            self._update_batch_progress(batch_id)
+
+    def _update_progress(self, job: GitJob) -> None:
+        """把任务的进度快照写入其节点与各子模块节点，只改动变化了的行。"""
+        _, _, rows = self._tracked[id(job)]
+        job_item = self._jobs.get(id(job))
+        if job_item is None:
+            return
+        version = job.progress.version
+        overall, items = job.progress.snapshot()
+        self._tracked[id(job)] = (job, version, rows)
+        job_item.setData(self.COL_PROGRESS, _PROGRESS_ROLE, overall)
+        for progress in items:
+            row = rows.get(progress.path)
+            if row is None:
+                row = QTreeWidgetItem([progress.path or "（未归属）", "", "", ""])
+                job_item.addChild(row)
+                rows[progress.path] = row
+            text = "完成" if progress.done else progress.phase
+            if row.text(self.COL_STATE) != text:
+                row.setText(self.COL_STATE, text)
+            if row.data(self.COL_PROGRESS, _PROGRESS_ROLE) != progress.fraction:
+                row.setData(self.COL_PROGRESS, _PROGRESS_ROLE, progress.fraction)
+        if items and not job_item.isExpanded() and len(items) <= 20:
+            job_item.setExpanded(True)
+
+    def _update_batch_progress(self, batch_id: int) -> None:
+        """整批进度：已结束的命令计 1，运行中的按其进度，其余计 0。"""
+        item = self._batches.get(batch_id)
+        jobs = self._batch_jobs.get(batch_id)
+        if item is None or not jobs:
+            return
+        total = 0.0
+        for job in jobs:
+            if job.state not in (JobState.PENDING, JobState.RUNNING):
+                total += 1.0
+            elif job.state == JobState.RUNNING and job.progress is not None:
+                total += job.progress.snapshot()[0]
+        item.setData(self.COL_PROGRESS, _PROGRESS_ROLE, total / len(jobs))
@@ -0,0 +1,85 @@
+"""后台按层读取嵌套子模块（树形视图展开时使用）。"""
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.submodule_tree import SubmoduleLevelCache, load_level
+from core.tracing import get_tracer
+
+
+class _LevelThread(QThread):
+    """依次读取若干个工作区的下一层子模块。"""
+
+    loaded = pyqtSignal(int, str, list)  # generation, 工作区绝对路径, list[SubmoduleInfo]
+
+    def __init__(self, generation: int, worktrees: list[str], cache: SubmoduleLevelCache):
+        super().__init__()
+        self.generation = generation
+        self.worktrees = worktrees
+        self.cache = cache
+
+    def run(self) -> None:
+        tracer = get_tracer()
+        for worktree in self.worktrees:
+            if self.isInterruptionRequested():
+                return
+            with tracer.span("tree.load_level", path=worktree):
+                try:
+                    items = load_level(worktree, self.cache)
+                except Exception:
+                    items = []
+            self.loaded.emit(self.generation, worktree, items)
+
+
+class LevelLoader(QObject):
+    """
+    同一时刻只运行一个后台线程；运行期间的请求排队，线程结束后一起处理，重复的请求合并。
+    切换仓库时调用 cancel()，旧请求带回的结果会被丢弃。
+    """
+
+    loaded = pyqtSignal(str, list)  # 工作区绝对路径, 该层的 list[SubmoduleInfo]
+
+    def __init__(self, parent: QObject | None = None, cache: SubmoduleLevelCache | None = None):
+        super().__init__(parent)
+        self.cache = cache or SubmoduleLevelCache()
+        self._generation = 0
+        self._pending: dict[str, None] = {}  # 保持请求顺序
+        self._thread: _LevelThread | None = None
+
+    def request(self, worktree: str) -> None:
+        """请求读取 worktree 的下一层。"""
+        self._pending[worktree] = None
+        if self._thread is None:
+            self._start()
+
+    def cancel(self) -> None:
+        """丢弃等待中的请求与正在进行的结果。"""
+        self._generation += 1
+        self._pending.clear()
+        if self._thread is not None:
+            self._thread.requestInterruption()
+
+    def shutdown(self) -> None:
+        """退出前调用：丢弃结果并等待后台线程结束。"""
+        self.cancel()
+        if self._thread is not None:
+            self._thread.wait()
+
+    def _start(self) -> None:
+        if not self._pending:
+            return
+        thread = _LevelThread(self._generation, list(self._pending), self.cache)
+        self._pending.clear()
+        thread.loaded.connect(self._on_loaded)
+        thread.finished.connect(self._on_thread_finished)
+        self._thread = thread
+        thread.start()
+
+    def _on_loaded(self, generation: int, worktree: str, items: list) -> None:
+        if generation == self._generation:
+            self.loaded.emit(worktree, items)
+
+    def _on_thread_finished(self) -> None:
+        if self._thread is not None:
+            self._thread.deleteLater()
+            self._thread = None
+        self._start()
@@ -9,20 +9,45 @@ from PyQt6.QtWidgets import (
     QFileDialog,
     QApplication,
     QStatusBar,
+    QTabWidget,
 )
-from PyQt6.QtCore import Qt, QThread
+from collections.abc import Callable
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction
 
 from app.repo_selector import RepoSelector
-from app.submodule_table import SubmoduleTable
 from app.submodule_actions import SubmoduleActions
 from app.output_panel import OutputPanel
-from app.git_worker import GitWorkerThread
-from core.git_runner import load_submodules
+from app.git_worker import GitJob, GitJobScheduler, GitPipeline, JobState
+from app.hub_view import HubContext, HubView
+from app.job_panel import JobPanel
+from app.refresh_service import RefreshSlots
+from app.settings import (
+    KEY_LAST_REPO,
+    KEY_OPEN_REPOS,
+    app_settings,
+    git_timeouts,
+    load_init_options,
+    load_reference_settings,
+    save_init_options,
+    save_reference_enabled,
+)
+from core.batching import chunk_paths, parallel_groups
+from core.init_options import References, init_steps
+from core.reference_store import ReferenceStore
 
 
 class MainWindow(QMainWindow):
-    """主窗口。"""
+    """
+    主窗口。每个打开的 hub 是一个标签页（HubView），所有 hub 共用一个 git 任务调度器、
+    一组缓存与加载名额（HubContext）；后台标签页继续监视文件并以低优先级刷新，切换时无需重新加载。
+    构造时只创建首屏需要的控件；性能面板、树形视图、远端检查等在第一次使用时才导入和创建。
+    上次打开的 hub 由 restore_last_repo() 在窗口显示后恢复，加载在后台进行。
+    """
+
+    data_shown = pyqtSignal(str)  # 前台 hub 显示了数据："cached"（磁盘缓存）或 "fresh"（重新加载完成）
 
     def __init__(self) -> None:
         super().__init__()
@@ -30,8 +55,25 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(800, 500)
         self.resize(1000, 650)
 
-        self._repo_path = ""
-        self._worker_thread: QThread | None = None
+        self._context = HubContext(RefreshSlots(self))
+        # 定期关闭闲置的 cat-file 进程（等待退出在后台线程中进行，不阻塞界面）
+        self._cat_file_reaper = QTimer(self)
+        self._cat_file_reaper.setInterval(30_000)
+        self._cat_file_reaper.timeout.connect(self._context.cat_files.close_idle)
+        self._cat_file_reaper.start()
+        self._perf_panel = None  # 第一次打开时创建
+        # 本地对象缓存：clone 子模块时借用，后台定期抓取与淘汰（刷新线程第一次使用时才创建）
+        reference = load_reference_settings()
+        self._reference_store = ReferenceStore(max_bytes=reference.max_mb * 1024 * 1024)
+        self._reference_refresher = None
+        self._reference_timer = QTimer(self)
+        self._reference_timer.setInterval(reference.refresh_minutes * 60_000)
+        self._reference_timer.timeout.connect(self._on_refresh_references)
+        self._reference_timer.start()
+        self._scheduler = GitJobScheduler(parent=self)
+        self._scheduler.timeouts = git_timeouts()
+        # batch_id -> (提交命令的 hub, 完成后是否刷新, 完成回调)
+        self._batch_handlers: dict[int, tuple[HubView, bool, Callable[[int], None] | None]] = {}
 
         self._build_menubar()
         self._build_ui()
@@ -45,15 +87,47 @@ class MainWindow(QMainWindow):
         open_act.setShortcut("Ctrl+O")
         open_act.triggered.connect(self._on_open_repo)
         file_menu.addAction(open_act)
+        close_act = QAction("关闭仓库(&C)", self)
+        close_act.setShortcut("Ctrl+W")
+        close_act.triggered.connect(lambda: self._close_hub(self._hubs.currentIndex()))
+        file_menu.addAction(close_act)
         refresh_act = QAction("刷新(&R)", self)
         refresh_act.setShortcut("F5")
         refresh_act.triggered.connect(self._on_refresh)
         file_menu.addAction(refresh_act)
+        cancel_act = QAction("取消全部 git 任务", self)
+        cancel_act.setShortcut("Ctrl+Shift+X")
+        cancel_act.triggered.connect(lambda: self._scheduler.cancel_all())
+        file_menu.addAction(cancel_act)
+        file_menu.addSeparator()
+        self._reference_act = QAction("clone 时使用本地对象缓存", self)
+        self._reference_act.setCheckable(True)
+        self._reference_act.setChecked(load_reference_settings().enabled)
+        self._reference_act.toggled.connect(save_reference_enabled)
+        file_menu.addAction(self._reference_act)
+        reference_refresh_act = QAction("刷新并清理对象缓存", self)
+        reference_refresh_act.triggered.connect(self._on_refresh_references)
+        file_menu.addAction(reference_refresh_act)
         file_menu.addSeparator()
         exit_act = QAction("退出(&X)", self)
         exit_act.setShortcut("Ctrl+Q")
         exit_act.triggered.connect(QApplication.quit)
         file_menu.addAction(exit_act)
+        view_menu = menubar.addMenu("视图(&V)")
+        self._perf_act = QAction("性能面板(&P)", self)
+        self._perf_act.setCheckable(True)
+        self._perf_act.setShortcut("Ctrl+Shift+P")
+        self._perf_act.toggled.connect(self._on_toggle_perf_panel)
+        view_menu.addAction(self._perf_act)
+        self._tree_act = QAction("树形显示嵌套子模块(&T)", self)
+        self._tree_act.setCheckable(True)
+        self._tree_act.setShortcut("Ctrl+T")
+        self._tree_act.toggled.connect(self._on_toggle_tree)
+        view_menu.addAction(self._tree_act)
+        filter_act = QAction("筛选子模块(&F)", self)
+        filter_act.setShortcut("Ctrl+F")
+        filter_act.triggered.connect(self._on_focus_filter)
+        view_menu.addAction(filter_act)
 
     def _build_ui(self) -> None:
         central = QWidget(self)
@@ -66,23 +140,118 @@ class MainWindow(QMainWindow):
         self._actions = SubmoduleActions(self)
         layout.addWidget(self._actions)
 
-        self._table = SubmoduleTable(self)
+        self._hubs = QTabWidget(self)
+        self._hubs.setTabsClosable(True)
+        self._hubs.setMovable(True)
+        self._hubs.setDocumentMode(True)
+        self._jobs = JobPanel(self)  # 有进行中的任务时才显示
         self._output = OutputPanel(self)
         splitter = QSplitter(Qt.Orientation.Vertical)
-        splitter.addWidget(self._table)
+        splitter.addWidget(self._hubs)
+        splitter.addWidget(self._jobs)
         splitter.addWidget(self._output)
         splitter.setStretchFactor(0, 1)
         splitter.setStretchFactor(1, 0)
+        splitter.setStretchFactor(2, 0)
         layout.addWidget(splitter)
 
     def _connect_signals(self) -> None:
         self._repo_selector.path_changed.connect(self._on_repo_changed)
+        self._hubs.currentChanged.connect(self._on_hub_switched)
+        self._hubs.tabCloseRequested.connect(self._close_hub)
+        self._hubs.tabBar().tabMoved.connect(lambda *_: self._save_open_hubs())
         self._actions.add_submodule.connect(self._on_add_submodule)
         self._actions.init_selected.connect(self._on_init_selected)
         self._actions.init_all.connect(self._on_init_all)
         self._actions.update_to_record.connect(self._on_update_to_record)
         self._actions.update_to_remote.connect(self._on_update_to_remote)
+        self._actions.check_remotes.connect(self._on_check_remotes)
         self._actions.remove_selected.connect(self._on_remove_selected)
+        self._actions.init_options_changed.connect(self._on_init_options_changed)
+        self._scheduler.line_sink = self._output.push_line
+        self._scheduler.job_started.connect(self._on_job_started)
+        self._scheduler.job_finished.connect(self._on_job_finished)
+        self._scheduler.batch_progress.connect(self._on_batch_progress)
+        self._scheduler.batch_finished.connect(self._on_batch_finished)
+        self._scheduler.job_started.connect(self._jobs.update_job)
+        self._scheduler.job_finished.connect(self._jobs.update_job)
+        self._scheduler.batch_progress.connect(self._jobs.update_batch)
+        self._scheduler.batch_finished.connect(self._jobs.remove_batch)
+        self._jobs.cancel_job.connect(self._scheduler.cancel_job)
+        self._jobs.cancel_batch.connect(self._scheduler.cancel_batch)
+
+    # ---- hub 标签页 ----
+
+    def _current_hub(self) -> HubView | None:
+        return self._hubs.currentWidget()
+
+    def _hub_views(self) -> list[HubView]:
+        return [self._hubs.widget(i) for i in range(self._hubs.count())]
+
+    def _find_hub(self, path: str) -> int:
+        for index, hub in enumerate(self._hub_views()):
+            if hub.repo_root() == path:
+                return index
+        return -1
+
+    def _open_hub(self, path: str, foreground: bool = True) -> HubView:
+        """打开 hub（已打开时直接返回）；foreground 为 False 时在后台标签页中以低优先级加载。"""
+        index = self._find_hub(path)
+        if index >= 0:
+            if foreground:
+                self._hubs.setCurrentIndex(index)
+            return self._hubs.widget(index)
+        hub = HubView(path, self._context, self)
+        hub.set_foreground(foreground)
+        hub.status_message.connect(lambda text, h=hub: self._show_hub_message(h, text))
+        hub.error_line.connect(lambda text, h=hub: self._output.append_stderr(self._hub_prefix(h) + text))
+        hub.data_shown.connect(lambda kind, h=hub: self._on_hub_data_shown(h, kind))
+        index = self._hubs.addTab(hub, hub.title())
+        self._hubs.setTabToolTip(index, path)
+        hub.refresh()
+        if foreground:
+            self._hubs.setCurrentIndex(index)
+        self._save_open_hubs()
+        return hub
+
+    def _close_hub(self, index: int) -> None:
+        hub = self._hubs.widget(index)
+        if hub is None:
+            return
+        self._hubs.removeTab(index)
+        hub.shutdown()
+        hub.deleteLater()
+        self._save_open_hubs()
+        if self._hubs.count() == 0:
+            self._repo_selector.clear()
+            self.statusBar().showMessage("请选择 hub 仓库根目录")
+
+    def _on_hub_switched(self, index: int) -> None:
+        current = self._current_hub()
+        for hub in self._hub_views():
+            hub.set_foreground(hub is current)
+        if current is None:
+            return
+        current.set_tree_mode(self._tree_act.isChecked())
+        self._actions.set_init_options(load_init_options(current.repo_root()))
+        self._repo_selector.show_path(current.repo_root())
+        app_settings().setValue(KEY_LAST_REPO, current.repo_root())
+        self.statusBar().showMessage(f"已打开: {current.repo_root()}")
+
+    def _save_open_hubs(self) -> None:
+        app_settings().setValue(KEY_OPEN_REPOS, [hub.repo_root() for hub in self._hub_views()])
+
+    def _hub_prefix(self, hub: HubView) -> str:
+        """打开多个 hub 时，输出面板中的消息前加上 hub 名称。"""
+        return f"[{hub.title()}] " if self._hubs.count() > 1 else ""
+
+    def _show_hub_message(self, hub: HubView, text: str) -> None:
+        if hub is self._current_hub():
+            self.statusBar().showMessage(text)
+
+    def _on_hub_data_shown(self, hub: HubView, kind: str) -> None:
+        if hub is self._current_hub():
+            self.data_shown.emit(kind)
 
     def _on_open_repo(self) -> None:
         path = QFileDialog.getExistingDirectory(
@@ -93,96 +262,290 @@ class MainWindow(QMainWindow):
         if path:
             self._repo_selector.set_path(path)
 
+    def restore_last_repo(self) -> str:
+        """
+        重新打开上次的全部 hub（窗口显示后调用），返回前台 hub 的路径；没有可恢复的仓库时返回空串。
+        前台 hub 先取得加载名额，其余在后台标签页中以低优先级加载。
+        """
+        settings = app_settings()
+        active = str(settings.value(KEY_LAST_REPO, "") or "")
+        paths = [str(p) for p in settings.value(KEY_OPEN_REPOS, [], type=list) if p]
+        if active and active not in paths:
+            paths.append(active)
+        paths = [p for p in paths if (Path(p) / ".git").exists()]
+        if not paths or self._hubs.count():
+            return ""
+        if active not in paths:
+            active = paths[0]
+        self._open_hub(active)
+        for path in paths:
+            if path != active:
+                self._open_hub(path, foreground=False)
+        # 恢复保存时的标签顺序
+        bar = self._hubs.tabBar()
+        for target, path in enumerate(paths):
+            current = self._find_hub(path)
+            if current != target:
+                bar.moveTab(current, target)
+        return active
+
     def _on_repo_changed(self, path: str) -> None:
-        self._repo_path = path
-        self._refresh_submodules()
-        self.statusBar().showMessage(f"已打开: {path}")
+        self._open_hub(path)
+
+    def _on_toggle_perf_panel(self, visible: bool) -> None:
+        if self._perf_panel is None:
+            if not visible:
+                return
+            from app.perf_panel import PerfPanel
+
+            self._perf_panel = PerfPanel(self)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self._perf_panel)
+            self._perf_panel.visibilityChanged.connect(self._sync_perf_action)
+        self._perf_panel.setVisible(visible)
+
+    def _sync_perf_action(self, visible: bool) -> None:
+        # 用户点面板的关闭按钮时同步菜单勾选状态；最小化窗口等引起的隐藏不算
+        if not visible and not self._perf_panel.isHidden():
+            return
+        self._perf_act.setChecked(visible)
+
+    def _on_toggle_tree(self, checked: bool) -> None:
+        # 只切换前台 hub；其他 hub 在切换到前台时再应用，未查看的 hub 不创建树形视图
+        hub = self._current_hub()
+        if hub is not None:
+            hub.set_tree_mode(checked)
+
+    def _on_focus_filter(self) -> None:
+        hub = self._current_hub()
+        if hub is None:
+            return
+        # 筛选只作用于表格
+        self._tree_act.setChecked(False)
+        hub.focus_filter()
 
     def _on_refresh(self) -> None:
-        if self._repo_path:
-            self._refresh_submodules()
-            self.statusBar().showMessage("已刷新子模块列表")
+        hub = self._current_hub()
+        if hub is not None:
+            # 手动刷新时忽略当前仓库的扫描缓存，重新检查其所有子模块的工作区；其他 hub 不受影响
+            self._context.dirty_cache.clear(hub.repo_root())
+            hub.refresh()
+            self.statusBar().showMessage("正在刷新子模块列表…")
         else:
             self.statusBar().showMessage("请先选择仓库")
 
-    def _refresh_submodules(self) -> None:
-        if not self._repo_path:
-            self._table.set_submodules([])
-            return
-        items = load_submodules(self._repo_path)
-        self._table.set_submodules(items)
-
     def _selected_paths(self) -> list[str]:
-        return self._table.selected_paths()
+        hub = self._current_hub()
+        return hub.selected_paths() if hub is not None else []
+
+    # ---- git 命令 ----
 
     def _run_git_and_show(self, args: list[str], then_refresh: bool = True) -> None:
-        if not self._repo_path:
+        self._run_batch([args], then_refresh)
+
+    def _run_batch(
+        self,
+        commands: list[list[str]] | GitPipeline,
+        then_refresh: bool = True,
+        on_done: Callable[[int], None] | None = None,
+    ) -> list[GitJob]:
+        """
+        在前台 hub 中提交一批 git 命令（或一条流水线）到共用的调度器；整批结束后只刷新一次该 hub。
+        on_done(失败数) 在整批结束后调用。返回提交的任务（没有当前 hub 时为空列表）。
+        """
+        hub = self._current_hub()
+        if hub is None:
             self.statusBar().showMessage("请先选择仓库")
+            return []
+        if isinstance(commands, GitPipeline):
+            batch_id = self._scheduler.submit_pipeline(hub.repo_root(), commands)
+        else:
+            batch_id = self._scheduler.submit(hub.repo_root(), commands)
+        self._batch_handlers[batch_id] = (hub, then_refresh, on_done)
+        jobs = self._scheduler.jobs(batch_id)
+        title = jobs[0].command() if len(jobs) == 1 else f"{len(jobs)} 条命令"
+        self._jobs.add_batch(batch_id, f"[{hub.title()}] {title}", jobs)
+        return jobs
+
+    def _job_prefix(self, job: GitJob) -> str:
+        if self._hubs.count() < 2:
+            return ""
+        return f"[{Path(job.repo_root).name}] "
+
+    def _on_job_started(self, job: GitJob) -> None:
+        self._output.append_command(self._job_prefix(job) + job.command())
+
+    def _on_job_finished(self, job: GitJob) -> None:
+        if job.state == JobState.SKIPPED:
+            self._output.append_stderr(f"[已跳过] {self._job_prefix(job)}{job.command()}（前置步骤失败或被取消）")
             return
-        cmd = "git " + " ".join(args)
-        self._output.append_command(cmd)
-        self._worker_thread = GitWorkerThread(self._repo_path, args)
-        self._worker_thread.finished.connect(
-            lambda s, e, c: self._on_git_finished(s, e, c, then_refresh)
-        )
-        self._worker_thread.start()
+        if job.state == JobState.CANCELLED:
+            self._output.append_stderr(f"[已取消] {self._job_prefix(job)}{job.command()}")
+            return
+        # 输出已通过 line_sink 流式写入面板，这里只追加返回码
+        self._output.append_result(job.returncode, job.elapsed)
+        if job.returncode != 0 and job.path_results:
+            # 合并执行的命令：逐个列出失败与未执行的路径
+            ok = sum(1 for result in job.path_results.values() if result.ok)
+            self._output.append_stderr(f"[部分失败] {ok}/{len(job.path_results)} 个路径成功")
+            for path, result in job.path_results.items():
+                if result.ok is False:
+                    self._output.append_stderr(f"  [失败] {path}: {result.message}")
+                elif result.ok is None:
+                    self._output.append_stderr(f"  [未执行] {path}")
+        if job.returncode == -1 and job.elapsed >= job.timeout:
+            self._output.append_stderr(f"[超时] {self._job_prefix(job)}{job.command()} 超过 {job.timeout} 秒，已终止")
 
-    def _on_git_finished(
-        self,
-        stdout: str,
-        stderr: str,
-        returncode: int,
-        then_refresh: bool,
-    ) -> None:
-        if stdout:
-            self._output.append_stdout(stdout)
-        if stderr:
-            self._output.append_stderr(stderr)
-        self._output.append_result(returncode)
-        if then_refresh:
-            self._refresh_submodules()
-        self._worker_thread = None
+    def _on_batch_progress(self, batch_id: int, done: int, total: int) -> None:
+        if total > 1:
+            self.statusBar().showMessage(f"批量任务进行中: {done}/{total}")
+
+    def _on_batch_finished(self, batch_id: int, failed: int) -> None:
+        hub, then_refresh, on_done = self._batch_handlers.pop(batch_id, (None, False, None))
+        if then_refresh and hub in self._hub_views():
+            hub.refresh()
         self.statusBar().showMessage(
-            "命令完成" if returncode == 0 else f"命令退出码: {returncode}"
+            "命令完成" if failed == 0 else f"命令完成，{failed} 条失败"
         )
+        if on_done is not None:
+            on_done(failed)
+
+    def closeEvent(self, event) -> None:
+        self._scheduler.shutdown()
+        if self._reference_refresher is not None:
+            self._reference_refresher.shutdown()
+        for hub in self._hub_views():
+            hub.shutdown()
+        self._context.cat_files.shutdown()
+        self._output.close_log()
+        super().closeEvent(event)
 
     def _on_add_submodule(self, url: str, path: str) -> None:
-        self._run_git_and_show(["submodule", "add", url, path])
+        hub = self._current_hub()
+        references = self._references(hub)
+        ref = references([url], True).get(url) if references is not None else None
+        plain = ["submodule", "add", "--progress", url, path]
+        if ref is None:
+            self._run_git_and_show(plain)
+            return
+        store, seed = ref
+        args = ["submodule", "add", "--progress", "--reference", store, url, path]
+        if seed is None:
+            self._run_git_and_show(args)
+            return
+        # 第一次遇到该上游：先建立缓存，再借用它 clone；建立失败时改为普通 clone
+        pipeline = GitPipeline()
+        seed_step = pipeline.add(seed)
+        pipeline.add(args, [seed_step], fallback=plain)
+        self._run_batch(pipeline)
+
+    def _references(self, hub: HubView | None) -> References | None:
+        """启用对象缓存时返回为该 hub 登记 URL 并给出缓存的函数（见 ReferenceStore.prepare）。"""
+        if hub is None or not self._reference_act.isChecked():
+            return None
+        return lambda urls, seed: self._reference_store.prepare(urls, hub.repo_root(), seed)
+
+    def _on_refresh_references(self) -> None:
+        if self._reference_refresher is None:
+            from app.reference_refresher import ReferenceRefresher
+
+            self._reference_refresher = ReferenceRefresher(self._reference_store, self)
+            self._reference_refresher.finished.connect(self._on_references_refreshed)
+        if self._reference_refresher.refresh():
+            self.statusBar().showMessage("正在刷新本地对象缓存…")
+
+    def _on_references_refreshed(self, errors: dict, evicted: list, total: int) -> None:
+        for key, error in errors.items():
+            self._output.append_stderr(f"[对象缓存] {key}: {error}")
+        text = f"本地对象缓存已刷新，共 {total / 1024 / 1024:.0f} MB"
+        if evicted:
+            text += f"，淘汰 {len(evicted)} 个: {', '.join(evicted)}"
+        self.statusBar().showMessage(text)
 
     def _on_init_selected(self) -> None:
         paths = self._selected_paths()
         if not paths:
             QMessageBox.information(self, "提示", "请先在表格中选中要初始化的子模块")
             return
-        args = ["submodule", "update", "--init", "--recursive"] + paths
-        self._run_git_and_show(args)
+        self._run_init(paths)
 
     def _on_init_all(self) -> None:
-        self._run_git_and_show(["submodule", "update", "--init", "--recursive"])
+        self._run_init(None)
+
+    def _run_init(self, paths: list[str] | None) -> None:
+        """初始化或更新到记录版本；未初始化的子模块按当前 hub 的快速初始化选项 clone。"""
+        hub = self._current_hub()
+        if hub is None:
+            self.statusBar().showMessage("请先选择仓库")
+            return
+        steps = init_steps(
+            hub.submodules(), paths, self._actions.init_options(), self._references(hub)
+        )
+        if len(steps) == 1:
+            self._run_git_and_show(steps[0].args)
+            return
+        pipeline = GitPipeline()
+        for step in steps:
+            pipeline.add(step.args, step.after, wait=step.wait, fallback=step.fallback)
+        self._run_batch(pipeline)
+
+    def _on_init_options_changed(self, options) -> None:
+        hub = self._current_hub()
+        if hub is not None:
+            save_init_options(hub.repo_root(), options)
 
     def _on_update_to_record(self) -> None:
         paths = self._selected_paths()
         if not paths:
             QMessageBox.information(self, "提示", "请先在表格中选中要更新的子模块")
             return
-        args = ["submodule", "update", "--init", "--recursive"] + paths
-        self._run_git_and_show(args)
+        self._run_init(paths)
 
     def _on_update_to_remote(self) -> None:
         paths = self._selected_paths()
         if not paths:
             QMessageBox.information(self, "提示", "请先在表格中选中要更新到远端的子模块")
             return
-        for p in paths:
-            self._run_git_and_show(["submodule", "update", "--remote", p])
+        # 合并为少数几条多路径命令；git 在一条命令内逐个 fetch，按 parallel_groups 保留一定并行
+        prefix = ["submodule", "update", "--remote", "--progress"]
+        groups = parallel_groups(paths, self._scheduler.max_concurrency())
+        jobs = self._run_batch(
+            [[*prefix, "--", *chunk] for chunk in chunk_paths(paths, prefix, groups)],
+            on_done=lambda failed: self._report_remote_update(jobs),
+        )
+
+    def _report_remote_update(self, jobs: list[GitJob]) -> None:
+        """按路径统计“更新到远端”的结果：全部失败时只在状态栏报告，有成功的才提示提交。"""
+        updated = failed = 0
+        for job in jobs:
+            if job.path_results:
+                ok = sum(1 for result in job.path_results.values() if result.ok)
+                updated += ok
+                failed += len(job.path_results) - ok
+                continue
+            count = len(job.args) - job.args.index("--") - 1
+            if job.state == JobState.SUCCEEDED:
+                updated += count
+            else:
+                failed += count
+        if updated == 0:
+            self.statusBar().showMessage(f"更新到远端失败：{failed} 个子模块未更新，详见输出面板")
+            return
+        summary = f"已更新 {updated} 个子模块到远端" + (f"，{failed} 个失败（详见输出面板）" if failed else "")
         QMessageBox.information(
             self,
             "提示",
-            "已更新到远端。若需在主仓库记录新 commit，请执行：\n"
+            f"{summary}。若需在主仓库记录新 commit，请执行：\n"
             "git add <子模块路径>\n"
             "git commit -m \"chore: 更新子模块\"",
         )
 
+    def _on_check_remotes(self) -> None:
+        hub = self._current_hub()
+        if hub is None:
+            self.statusBar().showMessage("请先选择仓库")
+            return
+        hub.check_remotes()
+
     def _on_remove_selected(self) -> None:
         paths = self._selected_paths()
         if not paths:
@@ -197,7 +560,15 @@ class MainWindow(QMainWindow):
         )
         if reply != QMessageBox.StandardButton.Yes:
             return
-        for p in paths:
-            self._run_git_and_show(["submodule", "deinit", "-f", p])
-            self._run_git_and_show(["rm", "-f", p])
-        self.statusBar().showMessage("删除后请提交主仓库变更")
+        # deinit 与 rm 都要写 hub 的 config / index：每块路径各一条命令，各块依次执行；
+        # 块之间只排先后（wait），某块失败不影响其余块；某些路径 deinit 失败时，rm 只作用于成功的路径
+        deinit = ["submodule", "deinit", "-f"]
+        pipeline = GitPipeline()
+        wait: list[int] = []
+        for chunk in chunk_paths(paths, deinit):
+            steps = pipeline.chain([[*deinit, "--", *chunk], ["rm", "-f", "--", *chunk]], wait=wait)
+            wait = [steps[-1]]
+        self._run_batch(
+            pipeline,
+            on_done=lambda failed: self.statusBar().showMessage("删除后请提交主仓库变更"),
+        )
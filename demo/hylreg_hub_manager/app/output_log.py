@@ -0,0 +1,141 @@
+"""输出面板的滚动日志文件：保存全部输出，支持从末尾向前分页读取。"""
+
+import re
+from pathlib import Path
+
+from core.paths import app_data_dir
+
+_LOG_NAME = re.compile(r"^output-(\d{6})\.log$")
+_READ_CHUNK = 64 * 1024
+
+
+class OutputLog:
+    """
+    按序号滚动的日志文件 output-000001.log、output-000002.log …
+    当前文件超过 max_bytes 时开新文件，最多保留 max_files 个。
+    读取位置用 (文件序号, 字节偏移) 表示，滚动后依然有效。
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_bytes: int = 8 * 1024 * 1024,
+        max_files: int = 8,
+    ):
+        self.directory = directory or app_data_dir() / "logs"
+        self.max_bytes = max_bytes
+        self.max_files = max(1, max_files)
+        self._file = None
+        self._seq = 0
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            seqs = self._sequences()
+            self._seq = seqs[-1] if seqs else 1
+            self._file = open(self._path(self._seq), "ab")
+        except OSError:
+            self._file = None  # 无法写日志时仅保留内存中的输出
+
+    def append(self, lines: list[str]) -> None:
+        """追加若干行。"""
+        if self._file is None or not lines:
+            return
+        try:
+            self._file.write(("\n".join(lines) + "\n").encode("utf-8", errors="replace"))
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            self._file = None
+
+    def end_cursor(self) -> tuple[int, int]:
+        """日志末尾的位置。"""
+        try:
+            return self._seq, self._path(self._seq).stat().st_size
+        except OSError:
+            return self._seq, 0
+
+    def read_older(
+        self,
+        cursor: tuple[int, int],
+        count: int,
+        skip: int = 0,
+    ) -> tuple[list[str], tuple[int, int] | None]:
+        """
+        从 cursor 向前跳过 skip 行后读取至多 count 行（按时间正序返回）。
+        返回 (行列表, 新位置)；新位置为 None 表示已到最早的日志。
+        耗时只与 skip + count 成正比，与日志总大小无关。
+        """
+        seq, offset = cursor
+        oldest = self._sequences()
+        oldest_seq = oldest[0] if oldest else seq
+        collected: list[str] = []
+        wanted = skip + count
+        while len(collected) < wanted:
+            if seq < oldest_seq:
+                return self._take(collected, skip), None
+            path = self._path(seq)
+            if not path.exists():
+                seq, offset = seq - 1, -1
+                continue
+            if offset < 0:
+                offset = path.stat().st_size
+            lines, offset = self._read_back(path, offset, wanted - len(collected))
+            collected.extend(lines)
+            if offset == 0:
+                seq, offset = seq - 1, -1
+        if offset < 0:
+            # 当前文件已读完，新位置落在上一个文件末尾
+            prev = self._path(seq)
+            offset = prev.stat().st_size if prev.exists() else 0
+        return self._take(collected, skip), (seq, offset)
+
+    def close(self) -> None:
+        """关闭当前日志文件。"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _path(self, seq: int) -> Path:
+        return self.directory / f"output-{seq:06d}.log"
+
+    def _sequences(self) -> list[int]:
+        seqs = []
+        for entry in self.directory.iterdir():
+            m = _LOG_NAME.match(entry.name)
+            if m:
+                seqs.append(int(m.group(1)))
+        return sorted(seqs)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._seq += 1
+        self._file = open(self._path(self._seq), "ab")
+        for seq in self._sequences()[: -self.max_files]:
+            self._path(seq).unlink(missing_ok=True)
+
+    @staticmethod
+    def _take(newest_first: list[str], skip: int) -> list[str]:
+        lines = newest_first[skip:]
+        lines.reverse()
+        return lines
+
+    @staticmethod
+    def _read_back(path: Path, offset: int, count: int) -> tuple[list[str], int]:
+        """从文件 offset（行边界）处向前读取至多 count 行（新的在前），返回 (行, 新 offset)。"""
+        lines: list[str] = []
+        with open(path, "rb") as f:
+            pos = end = offset
+            buf = b""  # 文件中 [pos, end) 的内容
+            while len(lines) < count and end > 0:
+                body = buf[:-1] if buf.endswith(b"\n") else buf
+                idx = body.rfind(b"\n")
+                if idx == -1 and pos > 0:
+                    step = min(_READ_CHUNK, pos)
+                    pos -= step
+                    f.seek(pos)
+                    buf = f.read(step) + buf
+                    continue
+                lines.append(body[idx + 1 :].decode("utf-8", errors="replace"))
+                buf = buf[: idx + 1]
+                end = pos + idx + 1
+        return lines, end
@@ -1,47 +1,222 @@
 """显示 git 命令输出的只读文本框。"""
 
-from PyQt6.QtWidgets import QPlainTextEdit, QVBoxLayout, QWidget
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+import threading
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+
+from app.output_log import OutputLog
 
 
 class OutputPanel(QWidget):
-    """底部输出面板：只读，显示最近执行的 git 命令及输出。"""
+    """
+    底部输出面板：只读，显示最近执行的 git 命令及输出。
+    后台线程通过 push_line() 写入缓冲区，由定时器约每 FLUSH_INTERVAL_MS 批量刷到界面。
+    内存中最多保留 max_lines 行（环形，超出时丢弃最早的行）；全部输出同时写入滚动日志，
+    可通过“加载更早输出”从磁盘分页查看。
+    """
+
+    FLUSH_INTERVAL_MS = 50
+    DEFAULT_MAX_LINES = 10_000
+
+    _wake = pyqtSignal()  # 缓冲区由空变为非空时发出（跨线程排队）
 
-    def __init__(self, parent: QWidget | None = None):
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        max_lines: int = DEFAULT_MAX_LINES,
+        log: OutputLog | None = None,
+    ):
         super().__init__(parent)
         self._text = QPlainTextEdit(self)
         self._text.setReadOnly(True)
         self._text.setPlaceholderText("执行 git 命令后，输出将显示在这里…")
+        self._text.setMaximumBlockCount(max_lines)
         font = QFont("Monospace", 10)
         self._text.setFont(font)
+        self._log = log or OutputLog()
+
+        self._older_btn = QPushButton("加载更早输出…", self)
+        self._older_btn.clicked.connect(self._on_load_older)
+        bar = QHBoxLayout()
+        bar.setContentsMargins(0, 0, 0, 0)
+        bar.addStretch(1)
+        bar.addWidget(self._older_btn)
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(bar)
         layout.addWidget(self._text)
 
+        self._stdout_format = QTextCharFormat()
+        self._stderr_format = QTextCharFormat()
+        self._stderr_format.setForeground(QColor("#c0392b"))
+
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, bool]] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(OutputPanel.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._wake.connect(self._on_wake, Qt.ConnectionType.QueuedConnection)
+
+    def max_lines(self) -> int:
+        """内存中保留的最大行数。"""
+        return self._text.maximumBlockCount()
+
+    def set_max_lines(self, max_lines: int) -> None:
+        """设置内存中保留的最大行数（更早的行仍可从日志加载）。"""
+        self._text.setMaximumBlockCount(max(1, max_lines))
+
+    def push_line(self, line: str, is_stderr: bool = False) -> None:
+        """线程安全：把一行输出放入缓冲区，稍后批量显示。"""
+        with self._lock:
+            was_empty = not self._pending
+            self._pending.append((line, is_stderr))
+        if was_empty:
+            self._wake.emit()
+
+    def flush(self) -> None:
+        """把缓冲区中的行一次性写入文本框。"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            self._flush_timer.stop()
+            return
+        overflow = len(pending) - self.max_lines()
+        if overflow > 0:
+            # 超出容量的部分直接写入日志，不再进入文本框
+            self._log.append([line for line, _ in pending[:overflow]])
+            pending = pending[overflow:]
+        # 相邻同类行合并为一次插入
+        chunks: list[tuple[list[str], bool]] = []
+        for line, is_stderr in pending:
+            if chunks and chunks[-1][1] == is_stderr:
+                chunks[-1][0].append(line)
+            else:
+                chunks.append(([line], is_stderr))
+        follow = self._at_bottom()
+        for lines, is_stderr in chunks:
+            self._append(lines, is_stderr)
+        self._follow(follow)
+
     def append_command(self, cmd: str) -> None:
         """追加一条命令（带前缀）。"""
-        self._text.appendPlainText(f"$ {cmd}")
-        self._text.ensureCursorVisible()
+        self._append_now([f"$ {cmd}"])
 
     def append_stdout(self, text: str) -> None:
         """追加标准输出。"""
         if text:
-            self._text.appendPlainText(text.rstrip())
-        self._text.ensureCursorVisible()
+            self._append_now(text.rstrip().split("\n"))
 
     def append_stderr(self, text: str) -> None:
-        """追加标准错误（可高亮）。"""
+        """追加标准错误（高亮显示）。"""
         if text:
-            self._text.appendPlainText(text.rstrip())
-        self._text.ensureCursorVisible()
+            self._append_now(text.rstrip().split("\n"), is_stderr=True)
 
-    def append_result(self, returncode: int) -> None:
-        """追加返回码。"""
-        self._text.appendPlainText(f"[exit {returncode}]")
-        self._text.appendPlainText("")
-        self._text.ensureCursorVisible()
+    def append_result(self, returncode: int, elapsed: float | None = None) -> None:
+        """追加返回码（及耗时，单位秒）。"""
+        text = f"[exit {returncode}]" if elapsed is None else f"[exit {returncode}, {elapsed:.2f}s]"
+        self._append_now([text, ""])
 
     def clear(self) -> None:
-        """清空输出。"""
+        """清空输出（日志文件保留）。"""
+        with self._lock:
+            self._pending.clear()
         self._text.clear()
+
+    def close_log(self) -> None:
+        """退出前调用：写出剩余输出并关闭日志文件。"""
+        self.flush()
+        self._log.close()
+
+    def _on_wake(self) -> None:
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _on_load_older(self) -> None:
+        self.flush()
+        dialog = _HistoryDialog(self._log, self._text.blockCount(), self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
+    def _append_now(self, lines: list[str], is_stderr: bool = False) -> None:
+        """先写出缓冲区中的行，再追加 lines，保证顺序。"""
+        self.flush()
+        follow = self._at_bottom()
+        self._append(lines, is_stderr)
+        self._follow(follow)
+
+    def _append(self, lines: list[str], is_stderr: bool = False) -> None:
+        """在末尾追加若干行（每行一个文本块）并写入日志；开销与已有行数无关。"""
+        fmt = self._stderr_format if is_stderr else self._stdout_format
+        cursor = QTextCursor(self._text.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self._text.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(lines), fmt)
+        self._log.append(lines)
+
+    def _at_bottom(self) -> bool:
+        bar = self._text.verticalScrollBar()
+        return bar.value() >= bar.maximum()
+
+    def _follow(self, follow: bool) -> None:
+        """追加前停在底部时才自动滚动，避免打断正在查看历史的用户。"""
+        if follow:
+            bar = self._text.verticalScrollBar()
+            bar.setValue(bar.maximum())
+
+
+class _HistoryDialog(QDialog):
+    """从日志文件分页加载比面板中更早的输出。"""
+
+    PAGE_LINES = 2000
+
+    def __init__(self, log: OutputLog, in_memory_lines: int, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("更早的输出")
+        self.resize(800, 500)
+        self._log = log
+        self._cursor: tuple[int, int] | None = log.end_cursor()
+        self._skip = in_memory_lines  # 面板中已显示的行不再重复加载
+
+        self._text = QPlainTextEdit(self)
+        self._text.setReadOnly(True)
+        self._text.setFont(QFont("Monospace", 10))
+        self._status = QLabel(self)
+        self._more_btn = QPushButton("加载更早", self)
+        self._more_btn.clicked.connect(self._load_page)
+
+        bar = QHBoxLayout()
+        bar.addWidget(self._status, 1)
+        bar.addWidget(self._more_btn)
+        layout = QVBoxLayout(self)
+        layout.addLayout(bar)
+        layout.addWidget(self._text)
+        self._load_page()
+
+    def _load_page(self) -> None:
+        if self._cursor is None:
+            return
+        lines, self._cursor = self._log.read_older(
+            self._cursor, _HistoryDialog.PAGE_LINES, skip=self._skip
+        )
+        self._skip = 0
+        if lines:
+            cursor = QTextCursor(self._text.document())
+            cursor.movePosition(QTextCursor.MoveOperation.Start)
+            cursor.insertText("\n".join(lines) + ("\n" if not self._text.document().isEmpty() else ""))
+        if self._cursor is None:
+            self._more_btn.setEnabled(False)
+            self._status.setText("已到达最早的日志")
+        else:
+            self._status.setText(f"已加载 {self._text.blockCount()} 行")
@@ -0,0 +1,179 @@
+"""性能面板：按命令汇总 git 调用与刷新阶段的耗时，列出最近的调用，可导出 Chrome trace。"""
+
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDockWidget,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QSplitter,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.tracing import CATEGORY_GIT, Tracer, get_tracer
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
+
+class _Item(QTableWidgetItem):
+    """数值列右对齐，并按 UserRole 中的数值而不是文本排序。"""
+
+    def __init__(self, text: str, number: float | None = None):
+        super().__init__(text)
+        if number is not None:
+            self.setData(Qt.ItemDataRole.UserRole, number)
+            self.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+    def __lt__(self, other: QTableWidgetItem) -> bool:
+        mine = self.data(Qt.ItemDataRole.UserRole)
+        theirs = other.data(Qt.ItemDataRole.UserRole)
+        if mine is not None and theirs is not None:
+            return mine < theirs
+        return super().__lt__(other)
+
+
+class PerfPanel(QDockWidget):
+    """
+    可停靠的“性能”面板。上表按 (类别, 名称) 汇总次数、总耗时与 p50/p95/最大值，
+    下表列出最近 RECENT_ROWS 次记录（命令、目录、耗时、输出字节、退出码）。
+    只在面板可见且有新记录时每 REFRESH_MS 重新汇总一次。
+    """
+
+    REFRESH_MS = 1000
+    RECENT_ROWS = 500
+
+    STATS_HEADERS = ["名称", "类别", "次数", "总耗时 ms", "p50 ms", "p95 ms", "最大 ms"]
+    RECENT_HEADERS = ["时间", "名称", "耗时 ms", "命令", "目录", "输出字节", "退出码"]
+
+    def __init__(self, parent: QWidget | None = None, tracer: Tracer | None = None):
+        super().__init__("性能", parent)
+        self.setObjectName("PerfPanel")
+        self._tracer = tracer or get_tracer()
+        self._shown_version = -1
+        # perf_counter 与墙上时间的差，用于把 span 起点显示为本地时间
+        self._clock_offset = time.time() - time.perf_counter()
+        self._build_ui()
+        self._timer = QTimer(self)
+        self._timer.setInterval(PerfPanel.REFRESH_MS)
+        self._timer.timeout.connect(self._refresh)
+        self.visibilityChanged.connect(self._on_visibility_changed)
+
+    def _build_ui(self) -> None:
+        body = QWidget(self)
+        layout = QVBoxLayout(body)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        bar = QHBoxLayout()
+        self._summary = QLabel("")
+        clear_btn = QPushButton("清空")
+        clear_btn.clicked.connect(self._on_clear)
+        export_btn = QPushButton("导出 Chrome trace…")
+        export_btn.clicked.connect(self._on_export)
+        bar.addWidget(self._summary, 1)
+        bar.addWidget(clear_btn)
+        bar.addWidget(export_btn)
+        layout.addLayout(bar)
+
+        self._stats = self._make_table(PerfPanel.STATS_HEADERS)
+        self._stats.setSortingEnabled(True)
+        self._stats.sortByColumn(3, Qt.SortOrder.DescendingOrder)
+        self._recent = self._make_table(PerfPanel.RECENT_HEADERS)  # 保持时间顺序，不排序
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self._stats)
+        splitter.addWidget(self._recent)
+        layout.addWidget(splitter)
+        self.setWidget(body)
+
+    @staticmethod
+    def _make_table(headers: list[str]) -> QTableWidget:
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setWordWrap(False)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def _on_visibility_changed(self, visible: bool) -> None:
+        if visible:
+            self._refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _refresh(self) -> None:
+        version = self._tracer.version
+        if version == self._shown_version:
+            return
+        self._shown_version = version
+        self._fill_stats()
+        self._fill_recent()
+
+    def _fill_stats(self) -> None:
+        stats = self._tracer.stats()
+        table = self._stats
+        table.setSortingEnabled(False)
+        table.setRowCount(len(stats))
+        git_total = 0.0
+        for row, s in enumerate(stats):
+            if s.category == CATEGORY_GIT:
+                git_total += s.total
+            table.setItem(row, 0, _Item(s.name))
+            table.setItem(row, 1, _Item(s.category))
+            table.setItem(row, 2, _Item(str(s.count), s.count))
+            table.setItem(row, 3, _Item(_ms(s.total), s.total))
+            table.setItem(row, 4, _Item(_ms(s.p50), s.p50))
+            table.setItem(row, 5, _Item(_ms(s.p95), s.p95))
+            table.setItem(row, 6, _Item(_ms(s.max), s.max))
+        table.setSortingEnabled(True)
+        count = sum(s.count for s in stats if s.category == CATEGORY_GIT)
+        self._summary.setText(f"git 调用 {count} 次，共 {git_total:.2f} s")
+
+    def _fill_recent(self) -> None:
+        spans = self._tracer.spans()[-PerfPanel.RECENT_ROWS:]
+        spans.reverse()  # 最新的在最上面
+        table = self._recent
+        table.setRowCount(len(spans))
+        for row, span in enumerate(spans):
+            at = time.strftime("%H:%M:%S", time.localtime(span.start + self._clock_offset))
+            code = span.args.get("exit_code")
+            out_bytes = span.args.get("out_bytes")
+            table.setItem(row, 0, _Item(at))
+            table.setItem(row, 1, _Item(span.name))
+            table.setItem(row, 2, _Item(_ms(span.duration), span.duration))
+            table.setItem(row, 3, _Item(str(span.args.get("command", ""))))
+            table.setItem(row, 4, _Item(str(span.args.get("cwd") or span.args.get("repo") or "")))
+            table.setItem(row, 5, _Item("" if out_bytes is None else str(out_bytes), out_bytes))
+            table.setItem(row, 6, _Item("" if code is None else str(code), code))
+
+    def _on_clear(self) -> None:
+        self._tracer.clear()
+        self._refresh()
+
+    def _on_export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "导出 Chrome trace",
+            "hylreg_hub_manager-trace.json",
+            "JSON (*.json)",
+        )
+        if not path:
+            return
+        try:
+            count = self._tracer.export_chrome_trace(path)
+        except OSError as e:
+            self._summary.setText(f"导出失败: {e}")
+            return
+        self._summary.setText(f"已导出 {count} 条记录到 {path}（可在 chrome://tracing 或 Perfetto 中打开）")
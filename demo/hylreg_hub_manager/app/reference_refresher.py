@@ -0,0 +1,59 @@
+"""后台刷新本地对象缓存：抓取各 fork 的新提交，超过容量时淘汰最久未用的缓存。"""
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.git_runner import CancelToken
+from core.reference_store import ReferenceStore
+
+
+class _RefreshThread(QThread):
+    """在后台线程依次执行 refresh 与 prune（低优先级，不与界面和子模块加载争抢）。"""
+
+    refreshed = pyqtSignal(dict, list, int)  # 缓存名 -> 错误, 淘汰的缓存名, 刷新后的总字节数
+
+    def __init__(self, store: ReferenceStore):
+        super().__init__()
+        self.store = store
+        self.cancel_token = CancelToken()
+
+    def run(self) -> None:
+        errors = self.store.refresh(self.cancel_token)
+        evicted = self.store.prune(cancel=self.cancel_token)
+        total = sum(info.size for info in self.store.usage())
+        self.refreshed.emit(errors, evicted, total)
+
+
+class ReferenceRefresher(QObject):
+    """同一时刻只运行一次刷新；刷新期间再次请求会被忽略。"""
+
+    finished = pyqtSignal(dict, list, int)  # 缓存名 -> 错误, 淘汰的缓存名, 总字节数
+
+    def __init__(self, store: ReferenceStore, parent: QObject | None = None):
+        super().__init__(parent)
+        self.store = store
+        self._thread: _RefreshThread | None = None
+
+    def refresh(self) -> bool:
+        """开始刷新；已有刷新在进行时返回 False。"""
+        if self._thread is not None:
+            return False
+        thread = _RefreshThread(self.store)
+        thread.refreshed.connect(self.finished)
+        thread.finished.connect(self._on_thread_finished)
+        self._thread = thread
+        thread.start(QThread.Priority.LowPriority)
+        return True
+
+    def is_busy(self) -> bool:
+        return self._thread is not None
+
+    def shutdown(self) -> None:
+        """退出前调用：终止进行中的 git fetch / repack 并等待后台线程结束。"""
+        if self._thread is not None:
+            self._thread.cancel_token.cancel()
+            self._thread.wait()
+
+    def _on_thread_finished(self) -> None:
+        if self._thread is not None:
+            self._thread.deleteLater()
+            self._thread = None
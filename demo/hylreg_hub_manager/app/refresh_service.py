@@ -0,0 +1,311 @@
+"""后台刷新子模块列表：合并重复请求，丢弃过期结果。"""
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.cat_file import CatFilePool, CommitSummaryCache, describe_commits
+from core.dirty_scan import DirtyScanCache, scan_dirty
+from core.git_runner import load_submodules
+from core.remote_check import RemoteCheckCache, apply_cached_remote_status
+from core.status_cache import StatusCache, fingerprint
+from core.tracing import Tracer, get_tracer
+
+
+class _LoadThread(QThread):
+    """
+    在后台线程执行 load_submodules；全量加载的结果写入磁盘缓存。
+    with_cached 为 True 时先读出磁盘缓存发出 cached，界面无需在主线程读取 SQLite；
+    缓存的指纹与仓库当前一致时不再执行 load_submodules。
+    随后扫描工作区：先套用扫描缓存立即发出 loaded，再并行扫描其余子模块并发出 scanned。
+    远端领先/落后数只从 remote_cache 中套用，刷新本身不访问网络。
+    commit 说明与日期先套用 summaries 缓存，其余在扫描之后经 cat-file 进程池读取。
+    """
+
+    cached = pyqtSignal(int, list)  # generation, 磁盘缓存中的 list[SubmoduleInfo]
+    loaded = pyqtSignal(int, list)  # generation, list[SubmoduleInfo]
+    scanned = pyqtSignal(int, list)  # generation, 扫描后发生变化的 SubmoduleInfo
+
+    def __init__(
+        self,
+        generation: int,
+        repo_root: str,
+        paths: list[str] | None = None,
+        cache: StatusCache | None = None,
+        dirty_cache: DirtyScanCache | None = None,
+        remote_cache: RemoteCheckCache | None = None,
+        cat_files: CatFilePool | None = None,
+        summaries: CommitSummaryCache | None = None,
+        with_cached: bool = False,
+    ):
+        super().__init__()
+        self.generation = generation
+        self.repo_root = repo_root
+        self.paths = paths
+        self.cache = cache
+        self.dirty_cache = dirty_cache
+        self.remote_cache = remote_cache
+        self.cat_files = cat_files
+        self.summaries = summaries
+        self.with_cached = with_cached
+
+    def run(self) -> None:
+        tracer = get_tracer()
+        scope = "全量" if self.paths is None else f"{len(self.paths)} 个"
+        with tracer.span("refresh", repo=self.repo_root, scope=scope):
+            self._run(tracer)
+
+    def _run(self, tracer: Tracer) -> None:
+        hit = None
+        if self.with_cached and self.cache is not None:
+            with tracer.span("refresh.cache_load"):
+                hit = self.cache.load(self.repo_root)
+            if hit is not None:
+                self.cached.emit(self.generation, hit[0])
+        # 指纹在加载前计算：加载期间仓库若有变化，下次打开时会重新校验
+        stamp = ""
+        if self.cache and self.paths is None:
+            with tracer.span("refresh.fingerprint"):
+                stamp = fingerprint(self.repo_root)
+        if hit is not None and stamp and hit[1] == stamp:
+            # 指纹一致：缓存即当前的 load_submodules 结果，直接进入扫描
+            items = hit[0]
+        else:
+            with tracer.span("refresh.load") as span:
+                items = load_submodules(self.repo_root, self.paths)
+                span.args["count"] = len(items)
+            if stamp:
+                with tracer.span("refresh.cache_store"):
+                    self.cache.store(self.repo_root, items, stamp)
+        if self.remote_cache is not None:
+            with tracer.span("refresh.remote_cached"):
+                items = apply_cached_remote_status(self.repo_root, items, self.remote_cache)
+        with tracer.span("refresh.quick"):
+            quick = self._describe(items, cached_only=True)
+            if self.dirty_cache is not None:
+                quick = scan_dirty(self.repo_root, quick, self.dirty_cache, cached_only=True)
+        self.loaded.emit(self.generation, quick)
+        full = items
+        if self.dirty_cache is not None:
+            with tracer.span("refresh.scan_dirty"):
+                full = scan_dirty(self.repo_root, full, self.dirty_cache)
+        with tracer.span("refresh.describe_commits"):
+            full = self._describe(full, cached_only=False)
+        changed = [new for old, new in zip(quick, full) if old != new]
+        if changed:
+            self.scanned.emit(self.generation, changed)
+
+    def _describe(self, items: list, cached_only: bool) -> list:
+        if self.cat_files is None or self.summaries is None:
+            return items
+        return describe_commits(
+            self.repo_root, items, self.cat_files, self.summaries, cached_only
+        )
+
+
+class RefreshSlots(QObject):
+    """
+    多个 RefreshService（多个 hub）共用的加载名额：同时最多运行 max_concurrent 个加载线程，
+    从而限制同时运行的 git 进程与扫描线程总数。等待中的服务前台优先，其次按请求先后。
+    """
+
+    def __init__(self, parent: QObject | None = None, max_concurrent: int = 2):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self._active: set["RefreshService"] = set()
+        self._waiting: list["RefreshService"] = []
+
+    def acquire(self, service: "RefreshService") -> bool:
+        """有空闲名额时立即占用并返回 True；否则排队，名额空出时回调 service._on_slot_granted()。"""
+        if len(self._active) < self.max_concurrent:
+            self._active.add(service)
+            return True
+        if service not in self._waiting:
+            self._waiting.append(service)
+        return False
+
+    def release(self, service: "RefreshService") -> None:
+        self._active.discard(service)
+        self._grant()
+
+    def withdraw(self, service: "RefreshService") -> None:
+        """取消排队（切换仓库或关闭 hub 时）。"""
+        if service in self._waiting:
+            self._waiting.remove(service)
+
+    def _grant(self) -> None:
+        while self._waiting and len(self._active) < self.max_concurrent:
+            service = next((s for s in self._waiting if s.foreground), self._waiting[0])
+            self._waiting.remove(service)
+            self._active.add(service)
+            service._on_slot_granted()
+
+
+class RefreshService(QObject):
+    """
+    子模块列表的后台刷新服务。
+    同一时刻最多运行一个加载线程；运行期间到达的请求合并为一次后续刷新
+    （全量请求覆盖增量请求，多个增量请求合并路径）。
+    仓库路径变化或 cancel() 之后，旧线程带回的结果会被丢弃。
+    给定 slots 时，启动加载前先取得共用名额；foreground 为 False 的服务排在后面，线程以低优先级运行。
+    """
+
+    started = pyqtSignal()  # 开始一次加载
+    cached = pyqtSignal(list)  # 切换仓库后先发出磁盘缓存中的列表（没有缓存时不发出）
+    loaded = pyqtSignal(list)  # 全量结果 list[SubmoduleInfo]，仅包含最新有效结果
+    updated = pyqtSignal(list)  # 增量结果：仅包含被重新计算的子模块
+    idle = pyqtSignal()  # 没有正在进行或等待中的加载
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        cache: StatusCache | None = None,
+        dirty_cache: DirtyScanCache | None = None,
+        remote_cache: RemoteCheckCache | None = None,
+        cat_files: CatFilePool | None = None,
+        summaries: CommitSummaryCache | None = None,
+        slots: RefreshSlots | None = None,
+    ):
+        super().__init__(parent)
+        self.slots = slots
+        self.foreground = True
+        self.cache = cache
+        self.dirty_cache = dirty_cache
+        self.remote_cache = remote_cache
+        self.cat_files = cat_files
+        self.summaries = summaries
+        self._repo_root = ""
+        self._generation = 0
+        self._pending_full = False
+        self._pending_paths: set[str] = set()
+        self._show_cached = False
+        self._thread: _LoadThread | None = None
+        self._has_slot = False
+        self._waiting_slot = False
+
+    def request(self, repo_root: str, paths: list[str] | None = None) -> None:
+        """
+        请求刷新 repo_root；paths 非空时只重新计算这些子模块。
+        若已有加载在进行，则合并为一次后续刷新。
+        """
+        if paths is not None and not paths:
+            return
+        if repo_root != self._repo_root:
+            self._repo_root = repo_root
+            self._generation += 1
+            self._pending_paths.clear()
+            self._show_cached = True
+            paths = None
+        if paths is None:
+            self._pending_full = True
+        else:
+            self._pending_paths.update(paths)
+        if self._thread is None and not self._waiting_slot:
+            self._start()
+
+    def cancel(self) -> None:
+        """丢弃正在进行的加载结果，并取消等待中的刷新。"""
+        self._generation += 1
+        self._pending_full = False
+        self._pending_paths.clear()
+        self._repo_root = ""
+        if self._waiting_slot:
+            self._waiting_slot = False
+            self.slots.withdraw(self)
+
+    def set_foreground(self, foreground: bool) -> None:
+        """前台（当前显示的）hub 优先取得加载名额；后台 hub 的加载线程降为低优先级。"""
+        self.foreground = foreground
+        if self._thread is not None:
+            self._thread.setPriority(
+                QThread.Priority.NormalPriority if foreground else QThread.Priority.LowPriority
+            )
+
+    def is_busy(self) -> bool:
+        """是否有加载正在进行。"""
+        return self._thread is not None
+
+    def shutdown(self) -> None:
+        """退出前调用：丢弃结果并等待后台线程结束。"""
+        self.cancel()
+        if self._thread is not None:
+            self._thread.wait()
+
+    def _has_pending(self) -> bool:
+        return self._pending_full or bool(self._pending_paths)
+
+    def _start(self) -> None:
+        if not self._repo_root:
+            self._pending_full = False
+            self._pending_paths.clear()
+            self.loaded.emit([])
+            self.idle.emit()
+            return
+        if self.slots is not None and not self._has_slot:
+            if not self.slots.acquire(self):
+                self._waiting_slot = True
+                return
+            self._has_slot = True
+        paths = None if self._pending_full else sorted(self._pending_paths)
+        with_cached = self._show_cached and paths is None
+        self._pending_full = False
+        self._pending_paths.clear()
+        self._show_cached = False
+        thread = _LoadThread(
+            self._generation,
+            self._repo_root,
+            paths,
+            self.cache,
+            self.dirty_cache,
+            self.remote_cache,
+            self.cat_files,
+            self.summaries,
+            with_cached,
+        )
+        thread.cached.connect(self._on_cached)
+        thread.loaded.connect(self._on_loaded)
+        thread.scanned.connect(self._on_scanned)
+        thread.finished.connect(self._on_thread_finished)
+        self._thread = thread
+        self.started.emit()
+        thread.start(QThread.Priority.InheritPriority if self.foreground else QThread.Priority.LowPriority)
+
+    def _on_slot_granted(self) -> None:
+        self._waiting_slot = False
+        self._has_slot = True
+        if self._has_pending() and self._repo_root:
+            self._start()
+        else:
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        if self._has_slot:
+            self._has_slot = False
+            self.slots.release(self)
+
+    def _on_cached(self, generation: int, items: list) -> None:
+        if generation == self._generation:
+            self.cached.emit(items)
+
+    def _on_loaded(self, generation: int, items: list) -> None:
+        if generation != self._generation:
+            return
+        if self._thread is not None and self._thread.paths is not None:
+            self.updated.emit(items)
+        else:
+            self.loaded.emit(items)
+
+    def _on_scanned(self, generation: int, items: list) -> None:
+        if generation == self._generation:
+            self.updated.emit(items)
+
+    def _on_thread_finished(self) -> None:
+        if self._thread is not None:
+            self._thread.deleteLater()
+            self._thread = None
+        # 先归还名额，排队中的其他 hub 有机会先运行；本服务还有待处理的请求时重新排队
+        self._release_slot()
+        if self._has_pending() and self._repo_root:
+            self._start()
+        else:
+            self._pending_full = False
+            self._pending_paths.clear()
+            self.idle.emit()
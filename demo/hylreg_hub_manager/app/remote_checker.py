@@ -0,0 +1,95 @@
+"""后台检查子模块相对远端的领先/落后情况。"""
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.git_runner import CancelToken
+from core.models import SubmoduleInfo
+from core.remote_check import RemoteCheckCache, check_remotes
+
+
+class _CheckThread(QThread):
+    """在后台线程执行 check_remotes。"""
+
+    progress = pyqtSignal(int, int, int)  # generation, done, total
+    checked = pyqtSignal(int, list, dict)  # generation, list[SubmoduleInfo], path -> 错误
+
+    def __init__(
+        self,
+        generation: int,
+        repo_root: str,
+        items: list[SubmoduleInfo],
+        cache: RemoteCheckCache,
+    ):
+        super().__init__()
+        self.generation = generation
+        self.repo_root = repo_root
+        self.items = items
+        self.cache = cache
+        self.cancel_token = CancelToken()
+
+    def run(self) -> None:
+        items, errors = check_remotes(
+            self.repo_root,
+            self.items,
+            self.cache,
+            on_progress=lambda done, total: self.progress.emit(self.generation, done, total),
+            cancel=self.cancel_token,
+        )
+        self.checked.emit(self.generation, items, errors)
+
+
+class RemoteChecker(QObject):
+    """
+    同一时刻只运行一次检查；检查期间再次请求会被忽略。
+    cancel() 终止进行中的 git fetch，并丢弃旧检查带回的结果。
+    """
+
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(list, dict)  # 检查后的 list[SubmoduleInfo], path -> 错误
+
+    def __init__(self, parent: QObject | None = None, cache: RemoteCheckCache | None = None):
+        super().__init__(parent)
+        self.cache = cache or RemoteCheckCache()
+        self._generation = 0
+        self._thread: _CheckThread | None = None
+
+    def check(self, repo_root: str, items: list[SubmoduleInfo]) -> bool:
+        """开始检查；已有检查在进行时返回 False。"""
+        if self._thread is not None:
+            return False
+        thread = _CheckThread(self._generation, repo_root, items, self.cache)
+        thread.progress.connect(self._on_progress)
+        thread.checked.connect(self._on_checked)
+        thread.finished.connect(self._on_thread_finished)
+        self._thread = thread
+        thread.start()
+        return True
+
+    def cancel(self) -> None:
+        """终止正在进行的检查并丢弃其结果。"""
+        self._generation += 1
+        if self._thread is not None:
+            self._thread.cancel_token.cancel()
+
+    def is_busy(self) -> bool:
+        """是否有检查正在进行。"""
+        return self._thread is not None
+
+    def shutdown(self) -> None:
+        """退出前调用：丢弃结果并等待后台线程结束。"""
+        self.cancel()
+        if self._thread is not None:
+            self._thread.wait()
+
+    def _on_progress(self, generation: int, done: int, total: int) -> None:
+        if generation == self._generation:
+            self.progress.emit(done, total)
+
+    def _on_checked(self, generation: int, items: list, errors: dict) -> None:
+        if generation == self._generation:
+            self.finished.emit(items, errors)
+
+    def _on_thread_finished(self) -> None:
+        if self._thread is not None:
+            self._thread.deleteLater()
+            self._thread = None
@@ -13,7 +13,7 @@ from PyQt6.QtCore import pyqtSignal
 
 
 class RepoSelector(QWidget):
-    """当前仓库路径：只读输入框 + 浏览按钮。"""
+    """当前仓库路径：只读输入框 + 浏览按钮（选择的仓库在新标签页中打开）。"""
 
     path_changed = pyqtSignal(str)
 
@@ -48,6 +48,10 @@ class RepoSelector(QWidget):
         self._path_edit.setText(path)
         self.path_changed.emit(path)
 
+    def show_path(self, path: str) -> None:
+        """只显示路径（切换标签页时），不发出 path_changed。"""
+        self._path_edit.setText(path)
+
     def path(self) -> str:
         """当前选中的路径。"""
         return self._path_edit.text().strip()
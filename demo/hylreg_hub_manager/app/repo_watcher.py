@@ -0,0 +1,157 @@
+"""监视 hub 仓库的关键文件，防抖后通知需要刷新的范围。"""
+
+import os
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from core.git_runner import parse_gitmodules_sections, resolve_git_dir
+from core.status_reader import StatusReaderError, head_files, read_gitlinks
+
+
+class RepoWatcher(QObject):
+    """
+    用 QFileSystemWatcher 监视 .gitmodules、.git/index、.git/HEAD、.git/config
+    以及各子模块 git 目录下的 HEAD（及其指向的分支引用）。事件经 DEBOUNCE_MS 防抖后比较文件快照：
+    - .gitmodules 或 config 变化、被监视的文件出现或消失、index 中增删了子模块：发出 changed(None)，需要全量刷新；
+    - index 或 HEAD 变化（git add / commit / checkout 等）：与上次的 gitlink 快照比较，
+      只发出 commit 或 stage 变化了的子模块；
+    - 子模块 HEAD 变化：发出 changed([path, ...])，只需重新计算这些子模块。
+    git 以“写临时文件再重命名”的方式更新这些文件，因此同时监视所在目录，并重新登记变化了的文件；
+    只有结构变化时才重建全部监视。
+    """
+
+    DEBOUNCE_MS = 300
+
+    changed = pyqtSignal(object)  # None 表示全量；否则为 list[str] 子模块路径
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_event)
+        self._watcher.directoryChanged.connect(self._on_event)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(RepoWatcher.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._on_settled)
+        self._repo_root = ""
+        self._git_dir: Path | None = None
+        # 文件 -> 所属子模块路径（hub 级文件为 None）
+        self._owners: dict[str, str | None] = {}
+        self._snapshot: dict[str, tuple[int, int] | None] = {}
+        self._module_dirs: dict[str, Path] = {}  # 子模块路径 -> 其 git 目录
+        self._gitlinks: dict[str, tuple[str, int]] | None = None  # 上次读到的 index 中的 gitlink
+
+    def set_repo(self, repo_root: str) -> None:
+        """切换监视的仓库；空字符串表示停止监视。"""
+        self._debounce.stop()
+        self._repo_root = repo_root
+        self._rebuild()
+
+    def repo_root(self) -> str:
+        """当前监视的仓库。"""
+        return self._repo_root
+
+    def _on_event(self, _path: str) -> None:
+        self._debounce.start()
+
+    def _on_settled(self) -> None:
+        if not self._repo_root:
+            return
+        changed: list[str] = []
+        structural = False
+        for file, old in self._snapshot.items():
+            stamp = _stamp(file)
+            if stamp == old:
+                continue
+            self._snapshot[file] = stamp
+            changed.append(file)
+            if (old is None) != (stamp is None):
+                structural = True  # 被监视的文件出现或消失（如子模块被初始化或删除）
+        if not changed:
+            return
+        hub_files = {Path(file).name for file in changed if self._owners[file] is None}
+        if structural or hub_files & {".gitmodules", "config"}:
+            self._rebuild()
+            self.changed.emit(None)
+            return
+
+        paths = {self._owners[file] for file in changed if self._owners[file] is not None}
+        if hub_files:
+            # index 或 HEAD：只有 gitlink 的 commit / stage 变化的子模块需要重新计算
+            old_links, self._gitlinks = self._gitlinks, self._read_gitlinks()
+            if old_links is None or self._gitlinks is None or old_links.keys() != self._gitlinks.keys():
+                self.changed.emit(None)
+                return
+            paths.update(path for path, link in self._gitlinks.items() if old_links[path] != link)
+        # 子模块可能切换了分支：只重新登记这些子模块的引用文件
+        for path in paths & self._module_dirs.keys():
+            self._watch_module(path)
+        self._watcher.addPaths([file for file in changed if self._snapshot[file] is not None])
+        if paths:
+            self.changed.emit(sorted(paths))
+
+    def _read_gitlinks(self) -> dict[str, tuple[str, int]] | None:
+        if self._git_dir is None:
+            return None
+        try:
+            return read_gitlinks(self._git_dir / "index")
+        except StatusReaderError:
+            return None
+
+    def _rebuild(self) -> None:
+        """重新计算需要监视的文件并登记到 QFileSystemWatcher。"""
+        self._owners = {}
+        self._snapshot = {}
+        self._module_dirs = {}
+        self._gitlinks = None
+        current = self._watcher.files() + self._watcher.directories()
+        if current:
+            self._watcher.removePaths(current)
+        if not self._repo_root:
+            return
+
+        root = Path(self._repo_root)
+        self._git_dir = git_dir = resolve_git_dir(root)
+        self._add_file(root / ".gitmodules", None)
+        dirs: set[Path] = {root}
+        if git_dir is not None:
+            dirs.add(git_dir)
+            for name in ("index", "HEAD", "config"):
+                self._add_file(git_dir / name, None)
+            for name, path, _ in parse_gitmodules_sections(self._repo_root):
+                module_dir = resolve_git_dir(root / path)
+                if module_dir is None:
+                    module_dir = git_dir / "modules" / name
+                self._module_dirs[path] = module_dir
+                dirs.add(module_dir)
+                self._watch_module(path, add=False)
+            self._gitlinks = self._read_gitlinks()
+
+        watch = [file for file, stamp in self._snapshot.items() if stamp is not None]
+        watch.extend(str(d) for d in dirs if d.is_dir())
+        if watch:
+            self._watcher.addPaths(watch)
+
+    def _watch_module(self, path: str, add: bool = True) -> None:
+        """登记子模块决定 HEAD 的文件；在分支上提交只会改动 refs/heads/<分支>，HEAD 文件本身不变。"""
+        files = [str(file) for file in head_files(self._module_dirs[path])]
+        for file in files:
+            self._add_file(Path(file), path)
+        if add:
+            self._watcher.addPaths([file for file in files if self._snapshot[file] is not None])
+
+    def _add_file(self, file: Path, owner: str | None) -> None:
+        key = str(file)
+        self._owners[key] = owner
+        if key not in self._snapshot:
+            self._snapshot[key] = _stamp(key)
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    """文件的 (mtime_ns, size)，不存在时为 None。"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,101 @@
+"""界面设置：保存在应用数据目录下的 settings.ini（随 HYLREG_HUB_MANAGER_DATA 一起切换）。"""
+
+import hashlib
+from dataclasses import asdict, dataclass, fields
+
+from PyQt6.QtCore import QSettings
+
+from core.init_options import InitOptions
+from core.paths import app_data_dir
+from core.reference_store import DEFAULT_MAX_BYTES
+
+KEY_LAST_REPO = "last_repo"  # 前台 hub
+KEY_OPEN_REPOS = "open_repos"  # 打开的全部 hub（按标签顺序）
+GROUP_TIMEOUTS = "timeouts"  # 各类 git 操作的超时秒数，如 "submodule update" = 1800
+GROUP_INIT_OPTIONS = "init_options"  # 每个 hub 的快速初始化选项，子组名为路径的摘要
+GROUP_REFERENCE = "reference_store"  # 本地对象缓存：enabled、max_mb、refresh_minutes
+
+
+def app_settings() -> QSettings:
+    """应用设置（INI 格式）。"""
+    return QSettings(str(app_data_dir() / "settings.ini"), QSettings.Format.IniFormat)
+
+
+def git_timeouts() -> dict[str, int]:
+    """设置中覆盖的超时：操作类型 -> 秒数（见 core.git_runner.DEFAULT_TIMEOUTS）。无效的值被忽略。"""
+    settings = app_settings()
+    settings.beginGroup(GROUP_TIMEOUTS)
+    result: dict[str, int] = {}
+    for key in settings.childKeys():
+        try:
+            seconds = int(settings.value(key))
+        except (TypeError, ValueError):
+            continue
+        if seconds > 0:
+            result[key] = seconds
+    settings.endGroup()
+    return result
+
+
+def _hub_group(repo_root: str) -> str:
+    # 路径中的 / 会被 QSettings 当作分组，改用摘要
+    return f"{GROUP_INIT_OPTIONS}/{hashlib.sha1(repo_root.encode('utf-8')).hexdigest()[:16]}"
+
+
+def load_init_options(repo_root: str) -> InitOptions:
+    """读取 hub 的快速初始化选项；未保存过或值无效时用默认值。"""
+    settings = app_settings()
+    settings.beginGroup(_hub_group(repo_root))
+    values = {}
+    for f in fields(InitOptions):  # 字段均为 int 或 bool
+        if settings.contains(f.name):
+            try:
+                values[f.name] = settings.value(f.name, type=f.type)
+            except (TypeError, ValueError):
+                pass
+    settings.endGroup()
+    options = InitOptions(**values)
+    if options.jobs < 1 or options.depth < 0:
+        return InitOptions()
+    return options
+
+
+def save_init_options(repo_root: str, options: InitOptions) -> None:
+    settings = app_settings()
+    settings.beginGroup(_hub_group(repo_root))
+    settings.setValue("repo", repo_root)
+    for key, value in asdict(options).items():
+        settings.setValue(key, value)
+    settings.endGroup()
+
+
+@dataclass(frozen=True)
+class ReferenceSettings:
+    """本地对象缓存的设置（全局，不分 hub）。"""
+
+    enabled: bool = False  # clone 子模块时借用缓存（需用户在菜单中开启）
+    max_mb: int = DEFAULT_MAX_BYTES // (1024 * 1024)  # 超过时按最久未用淘汰
+    refresh_minutes: int = 360  # 后台抓取与淘汰的间隔
+
+
+def load_reference_settings() -> ReferenceSettings:
+    """读取对象缓存设置；值无效时用默认值。"""
+    settings = app_settings()
+    settings.beginGroup(GROUP_REFERENCE)
+    values = {}
+    for f in fields(ReferenceSettings):
+        if settings.contains(f.name):
+            try:
+                values[f.name] = settings.value(f.name, type=f.type)
+            except (TypeError, ValueError):
+                pass
+    settings.endGroup()
+    result = ReferenceSettings(**values)
+    if result.max_mb < 1 or result.refresh_minutes < 1:
+        return ReferenceSettings(enabled=result.enabled)
+    return result
+
+
+def save_reference_enabled(enabled: bool) -> None:
+    settings = app_settings()
+    settings.setValue(f"{GROUP_REFERENCE}/enabled", enabled)
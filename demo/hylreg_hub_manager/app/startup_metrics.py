@@ -0,0 +1,62 @@
+"""启动耗时测量（main.py --measure-startup）：首次绘制、显示缓存数据、加载完成的时刻。"""
+
+import json
+import sys
+import time
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication, QMainWindow
+
+
+class StartupMetrics(QObject):
+    """
+    从进程启动时刻 t0（time.perf_counter()）起计时，结果以一行 JSON 写到 stderr 后退出程序：
+    没有可恢复的仓库时在首次绘制后退出，否则等到加载完成；超过 timeout 秒也会退出。
+    """
+
+    def __init__(self, t0: float, window: QMainWindow, timeout: float = 120.0):
+        super().__init__(window)
+        self._t0 = t0
+        self._window = window
+        self._result: dict = {"first_paint_ms": None, "cached_data_ms": None, "data_ms": None, "repo": ""}
+        self._wait_data = False
+        self._done = False
+        window.installEventFilter(self)
+        window.data_shown.connect(self._on_data_shown)
+        QTimer.singleShot(int(timeout * 1000), self._finish)
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._t0) * 1000, 1)
+
+    def expect_data(self, repo: str) -> None:
+        """正在恢复仓库：等数据加载完成再退出。"""
+        self._result["repo"] = repo
+        self._wait_data = True
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint and self._result["first_paint_ms"] is None:
+            self._result["first_paint_ms"] = self._elapsed_ms()
+            # 在事件循环的下一轮判断：此时 restore_last_repo 已经执行
+            QTimer.singleShot(0, self._maybe_finish)
+        return False
+
+    def _on_data_shown(self, kind: str) -> None:
+        key = "cached_data_ms" if kind == "cached" else "data_ms"
+        if self._result[key] is None:
+            self._result[key] = self._elapsed_ms()
+        if kind == "fresh":
+            self._maybe_finish()
+
+    def _maybe_finish(self) -> None:
+        if self._result["first_paint_ms"] is None:
+            return
+        if not self._wait_data or self._result["data_ms"] is not None:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._window.removeEventFilter(self)
+        print(json.dumps(self._result, ensure_ascii=False), file=sys.stderr, flush=True)
+        QApplication.instance().quit()
@@ -7,19 +7,26 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QGroupBox,
     QInputDialog,
+    QCheckBox,
+    QLabel,
+    QSpinBox,
 )
 from PyQt6.QtCore import pyqtSignal
 
+from core.init_options import InitOptions
+
 
 class SubmoduleActions(QWidget):
-    """添加/初始化/更新/删除等按钮。"""
+    """添加/初始化/更新/检查远端/删除等按钮，以及初始化的加速选项。"""
 
     add_submodule = pyqtSignal(str, str)  # url, path
     init_selected = pyqtSignal()
     init_all = pyqtSignal()
     update_to_record = pyqtSignal()
     update_to_remote = pyqtSignal()
+    check_remotes = pyqtSignal()
     remove_selected = pyqtSignal()
+    init_options_changed = pyqtSignal(object)  # InitOptions（用户修改时发出）
 
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
@@ -47,15 +54,73 @@ class SubmoduleActions(QWidget):
         self._update_record_btn.clicked.connect(lambda: self.update_to_record.emit())
         self._update_remote_btn = QPushButton("更新到远端最新")
         self._update_remote_btn.clicked.connect(lambda: self.update_to_remote.emit())
+        self._check_remote_btn = QPushButton("检查远端")
+        self._check_remote_btn.setToolTip("抓取远端并统计选中（未选中时为全部）子模块的领先/落后提交数")
+        self._check_remote_btn.clicked.connect(lambda: self.check_remotes.emit())
         self._remove_btn = QPushButton("删除选中")
         self._remove_btn.clicked.connect(lambda: self.remove_selected.emit())
         row2.addWidget(self._update_record_btn)
         row2.addWidget(self._update_remote_btn)
+        row2.addWidget(self._check_remote_btn)
         row2.addWidget(self._remove_btn)
         inner.addLayout(row2)
 
+        # 快速初始化：只作用于尚未初始化的子模块的 clone
+        row3 = QHBoxLayout()
+        row3.addWidget(QLabel("初始化选项："))
+        self._jobs_spin = QSpinBox()
+        self._jobs_spin.setRange(1, 64)
+        self._jobs_spin.setPrefix("并行 ")
+        self._jobs_spin.setToolTip("同时 clone 的子模块数（--jobs）")
+        self._depth_spin = QSpinBox()
+        self._depth_spin.setRange(0, 100_000)
+        self._depth_spin.setPrefix("深度 ")
+        self._depth_spin.setSpecialValueText("完整历史")
+        self._depth_spin.setToolTip(
+            "只取最近 N 个提交（--depth）。记录的 commit 不在远端分支最近 N 个提交内时，"
+            "需要服务器允许按 commit 抓取"
+        )
+        self._blobless_chk = QCheckBox("按需下载文件内容")
+        self._blobless_chk.setToolTip("部分克隆（--filter=blob:none）：历史完整，文件内容在检出时才下载；需服务器支持")
+        self._shallow_chk = QCheckBox("遵循 .gitmodules 的 shallow")
+        self._shallow_chk.setToolTip(".gitmodules 中 shallow = true 的子模块只取 1 个提交")
+        for spin in (self._jobs_spin, self._depth_spin):
+            spin.valueChanged.connect(self._emit_init_options)
+        for chk in (self._blobless_chk, self._shallow_chk):
+            chk.toggled.connect(self._emit_init_options)
+        row3.addWidget(self._jobs_spin)
+        row3.addWidget(self._depth_spin)
+        row3.addWidget(self._blobless_chk)
+        row3.addWidget(self._shallow_chk)
+        row3.addStretch(1)
+        inner.addLayout(row3)
+        self.set_init_options(InitOptions())
+
         layout.addWidget(grp)
 
+    def init_options(self) -> InitOptions:
+        return InitOptions(
+            jobs=self._jobs_spin.value(),
+            depth=self._depth_spin.value(),
+            blobless=self._blobless_chk.isChecked(),
+            recommend_shallow=self._shallow_chk.isChecked(),
+        )
+
+    def set_init_options(self, options: InitOptions) -> None:
+        """显示某个 hub 保存的选项（切换 hub 时调用），不发出 init_options_changed。"""
+        widgets = (self._jobs_spin, self._depth_spin, self._blobless_chk, self._shallow_chk)
+        for widget in widgets:
+            widget.blockSignals(True)
+        self._jobs_spin.setValue(options.jobs)
+        self._depth_spin.setValue(options.depth)
+        self._blobless_chk.setChecked(options.blobless)
+        self._shallow_chk.setChecked(options.recommend_shallow)
+        for widget in widgets:
+            widget.blockSignals(False)
+
+    def _emit_init_options(self) -> None:
+        self.init_options_changed.emit(self.init_options())
+
     def _on_add(self) -> None:
         url, ok = QInputDialog.getText(
             self,
@@ -0,0 +1,73 @@
+"""子模块表格上方的筛选栏。"""
+
+from PyQt6.QtWidgets import (
+    QWidget,
+    QHBoxLayout,
+    QLineEdit,
+    QComboBox,
+    QLabel,
+    QPushButton,
+)
+from PyQt6.QtCore import QEvent, QObject, Qt, pyqtSignal
+
+from core.models import SubmoduleInfo, SubmoduleStatus
+
+
+class SubmoduleFilterBar(QWidget):
+    """
+    输入即筛选（路径、URL 子串或 commit 前缀，可用 path: url: commit: status: 限定）+ 状态下拉框，
+    显示匹配数；“选中全部结果”选中筛选出的所有行，供现有的批量操作使用。Esc 清空输入。
+    """
+
+    changed = pyqtSignal(str, object)  # 查询文本, SubmoduleStatus | None
+    focused = pyqtSignal()  # 输入框获得焦点（可在此时建立索引）
+    select_all = pyqtSignal()
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._edit = QLineEdit(self)
+        self._edit.setPlaceholderText("筛选：路径、URL、commit 前缀；可用 path: url: commit: status: 限定")
+        self._edit.setClearButtonEnabled(True)
+        self._edit.installEventFilter(self)
+        self._status = QComboBox(self)
+        self._status.addItem("全部状态", None)
+        for status in SubmoduleStatus:
+            self._status.addItem(SubmoduleInfo("", "", "", status).status_display(), status)
+        self._count = QLabel(self)
+        self._select_btn = QPushButton("选中全部结果", self)
+        self._select_btn.setEnabled(False)
+        self._edit.textChanged.connect(self._emit_changed)
+        self._status.currentIndexChanged.connect(self._emit_changed)
+        self._select_btn.clicked.connect(self.select_all)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._edit, 1)
+        layout.addWidget(self._status)
+        layout.addWidget(self._count)
+        layout.addWidget(self._select_btn)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self._edit:
+            if event.type() == QEvent.Type.FocusIn:
+                self.focused.emit()
+            elif event.type() == QEvent.Type.KeyPress and event.key() == Qt.Key.Key_Escape and self._edit.text():
+                self._edit.clear()
+                return True
+        return super().eventFilter(watched, event)
+
+    def focus(self) -> None:
+        """聚焦输入框并全选已有文本。"""
+        self._edit.setFocus(Qt.FocusReason.ShortcutFocusReason)
+        self._edit.selectAll()
+
+    def set_counts(self, visible: int, total: int) -> None:
+        self._count.setText(f"{visible} / {total}")
+
+    def _emit_changed(self) -> None:
+        query = self._edit.text()
+        status = self._status.currentData()
+        filtering = bool(query.strip()) or status is not None
+        if not filtering:
+            self._count.clear()
+        self._select_btn.setEnabled(filtering)
+        self.changed.emit(query, status)
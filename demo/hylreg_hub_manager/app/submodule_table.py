@@ -1,69 +1,521 @@
-"""子模块列表表格。"""
+"""子模块列表表格（模型/视图）。"""
+
+from datetime import datetime
 
 from PyQt6.QtWidgets import (
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QAbstractItemView,
+    QLabel,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QItemSelection, QItemSelectionModel, QModelIndex, pyqtSignal
+
+from core.models import SubmoduleInfo, SubmoduleStatus
+from core.submodule_index import SubmoduleIndex
 
-from core.models import SubmoduleInfo
+# 绘制每个单元格时视图会查询十来种角色，只有这几种有数据：先按角色过滤，其余直接返回
+_USER_ROLE = int(Qt.ItemDataRole.UserRole)
+_DATA_ROLES = frozenset({int(Qt.ItemDataRole.DisplayRole), int(Qt.ItemDataRole.ToolTipRole), _USER_ROLE})
 
 
-class SubmoduleTable(QTableWidget):
-    """子模块列表：路径、URL、commit、状态。"""
+class SubmoduleTableModel(QAbstractTableModel):
+    """
+    以子模块路径为键的表格模型。
+    set_submodules() 将新列表与当前行做差异比较，只发出增、删、改信号，
+    因此视图的选中状态与滚动位置在刷新后保持不变。
+    """
 
     COL_PATH = 0
     COL_URL = 1
     COL_COMMIT = 2
     COL_STATUS = 3
+    COL_CHANGES = 4
+    COL_REMOTE_AHEAD = 5
+    COL_REMOTE_BEHIND = 6
+    COL_SUBJECT = 7
+    COL_DATE = 8
+
+    HEADERS = ["路径", "URL", "Commit", "状态", "改动", "领先远端", "落后远端", "提交说明", "提交日期"]
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setColumnCount(4)
-        self.setHorizontalHeaderLabels(["路径", "URL", "Commit", "状态"])
-        self.horizontalHeader().setSectionResizeMode(
-            SubmoduleTable.COL_PATH,
-            QHeaderView.ResizeMode.ResizeToContents,
-        )
-        self.horizontalHeader().setSectionResizeMode(
-            SubmoduleTable.COL_URL,
-            QHeaderView.ResizeMode.Stretch,
-        )
-        self.horizontalHeader().setSectionResizeMode(
-            SubmoduleTable.COL_COMMIT,
-            QHeaderView.ResizeMode.ResizeToContents,
-        )
-        self.horizontalHeader().setSectionResizeMode(
-            SubmoduleTable.COL_STATUS,
-            QHeaderView.ResizeMode.ResizeToContents,
-        )
+        self._rows: list[SubmoduleInfo] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(SubmoduleTableModel.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return SubmoduleTableModel.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role not in _DATA_ROLES or not index.isValid():
+            return None
+        return self.cell(index.row(), index.column(), role)
+
+    def cell(self, row: int, col: int, role: int):
+        """第 row 行第 col 列在 role（显示、提示或 UserRole）下的数据。"""
+        info = self._rows[row]
+        if role == _USER_ROLE:
+            return info
+        return SubmoduleTableModel.display_text(info, col)
+
+    @staticmethod
+    def display_text(info: SubmoduleInfo, col: int) -> str | None:
+        """第 col 列显示的文本（树形视图共用）。"""
+        if col == SubmoduleTableModel.COL_PATH:
+            return info.path
+        if col == SubmoduleTableModel.COL_URL:
+            return info.url
+        if col == SubmoduleTableModel.COL_COMMIT:
+            return info.commit
+        if col == SubmoduleTableModel.COL_STATUS:
+            return info.status_display()
+        if col == SubmoduleTableModel.COL_CHANGES:
+            return str(info.changed_files) if info.changed_files else ""
+        if col == SubmoduleTableModel.COL_REMOTE_AHEAD:
+            return _count_text(info.remote_ahead)
+        if col == SubmoduleTableModel.COL_REMOTE_BEHIND:
+            return _count_text(info.remote_behind)
+        if col == SubmoduleTableModel.COL_SUBJECT:
+            return info.commit_subject
+        if col == SubmoduleTableModel.COL_DATE:
+            return _date_text(info.commit_date)
+        return None
+
+    def info(self, row: int) -> SubmoduleInfo:
+        """第 row 行的子模块信息。"""
+        return self._rows[row]
+
+    def submodules(self) -> list[SubmoduleInfo]:
+        """当前全部行（只读副本）。"""
+        return list(self._rows)
+
+    def rows_of(self, paths: set[str]) -> list[int]:
+        """paths 中的路径所在的行号（升序）。"""
+        return [row for row, info in enumerate(self._rows) if info.path in paths]
+
+    def set_submodules(self, items: list[SubmoduleInfo]) -> None:
+        """用新列表更新模型：按路径比较，只对变化的行发信号。"""
+        new_paths = {info.path for info in items}
+        self._remove_missing(new_paths)
+
+        # 保留下来的行相对顺序变化时（如 .gitmodules 被重排）退化为整体重置
+        current = self._path_set()
+        kept = [info.path for info in items if info.path in current]
+        if kept != [info.path for info in self._rows]:
+            self.beginResetModel()
+            self._rows = list(items)
+            self.endResetModel()
+            return
+
+        changed: list[int] = []
+        row = 0
+        pos = 0
+        while pos < len(items):
+            info = items[pos]
+            if row < len(self._rows) and self._rows[row].path == info.path:
+                if self._rows[row] != info:
+                    self._rows[row] = info
+                    changed.append(row)
+                row += 1
+                pos += 1
+                continue
+            # 连续的新路径一次性插入
+            end = pos
+            while end < len(items) and (
+                row >= len(self._rows) or items[end].path != self._rows[row].path
+            ):
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, row + (end - pos) - 1)
+            self._rows[row:row] = items[pos:end]
+            self.endInsertRows()
+            row += end - pos
+            pos = end
+        self._emit_changed(changed)
+
+    def update_submodules(self, items: list[SubmoduleInfo]) -> None:
+        """增量更新：按路径替换已有行，不在表格中的路径忽略。"""
+        rows = {info.path: row for row, info in enumerate(self._rows)}
+        changed: list[int] = []
+        for info in items:
+            row = rows.get(info.path)
+            if row is not None and self._rows[row] != info:
+                self._rows[row] = info
+                changed.append(row)
+        self._emit_changed(sorted(changed))
+
+    def _path_set(self) -> set[str]:
+        return {info.path for info in self._rows}
+
+    def _remove_missing(self, keep: set[str]) -> None:
+        """从后往前按连续区间删除不在 keep 中的行。"""
+        row = len(self._rows) - 1
+        while row >= 0:
+            if self._rows[row].path in keep:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._rows[row].path not in keep:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._rows[row + 1 : last + 1]
+            self.endRemoveRows()
+
+    def _emit_changed(self, rows: list[int]) -> None:
+        """对连续的变化行合并发出 dataChanged。"""
+        last_col = self.columnCount() - 1
+        start = 0
+        while start < len(rows):
+            end = start
+            while end + 1 < len(rows) and rows[end + 1] == rows[end] + 1:
+                end += 1
+            self.dataChanged.emit(
+                self.index(rows[start], 0),
+                self.index(rows[end], last_col),
+            )
+            start = end + 1
+
+
+def _count_text(count: int | None) -> str:
+    """None 表示尚未检查，显示为空；0 显示为 0。"""
+    return "" if count is None else str(count)
+
+
+def _date_text(timestamp: int | None) -> str:
+    """Unix 时间戳按本地时区显示到分钟。"""
+    if not timestamp:
+        return ""
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+class SubmoduleFilterModel(QAbstractTableModel):
+    """
+    表格视图与 SubmoduleTableModel 之间的筛选层。未筛选时原样转发源模型的增、删、改信号；
+    筛选时只显示给定的源行（升序行号列表），筛选条件或源模型的行变化时整体重置一次。
+    不用 QSortFilterProxyModel：它对每一行调用 Python 的 filterAcceptsRow，上万行时一次筛选要几十毫秒。
+    """
+
+    def __init__(self, source: SubmoduleTableModel, parent=None):
+        super().__init__(parent)
+        self._source = source
+        self._matches: set[str] | None = None
+        self._rows: list[int] | None = None  # 可见的源行号；None 表示不筛选
+        self._positions: dict[int, int] | None = None  # 源行号 -> 可见行，转发 dataChanged 时按需建立
+        self._holding = False  # begin_source_update() 与 end_source_update() 之间
+        source.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        source.rowsInserted.connect(self._on_rows_inserted)
+        source.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        source.rowsRemoved.connect(self._on_rows_removed)
+        source.modelAboutToBeReset.connect(self._on_source_about_to_reset)
+        source.modelReset.connect(self._on_source_reset)
+        source.dataChanged.connect(self._on_source_data_changed)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._source.rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return self._source.columnCount(parent)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        return self._source.headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role not in _DATA_ROLES or not index.isValid():
+            return None
+        return self._source.cell(self.source_row(index.row()), index.column(), role)
+
+    def source_row(self, row: int) -> int:
+        """可见的第 row 行对应的源行号。"""
+        return row if self._rows is None else self._rows[row]
+
+    def source_rows(self) -> list[int] | range:
+        """全部可见行对应的源行号。"""
+        return range(self._source.rowCount()) if self._rows is None else self._rows
+
+    def is_filtering(self) -> bool:
+        return self._rows is not None
+
+    def matches(self) -> set[str] | None:
+        """当前筛选的路径集合；None 表示不筛选。"""
+        return self._matches
+
+    def set_matches(self, paths: set[str] | None) -> None:
+        """只显示路径在 paths 中的行（保持源模型顺序）；None 取消筛选。整体重置一次。"""
+        if not self._holding:
+            self.beginResetModel()
+        self._matches = paths
+        self._rows = None if paths is None else self._source.rows_of(paths)
+        self._positions = None
+        self._holding = False
+        self.endResetModel()
+
+    def begin_source_update(self) -> None:
+        """筛选中批量修改源模型前调用：到 end_source_update() 为止只重置一次，期间不读取源模型。"""
+        if self._rows is not None and not self._holding:
+            self.beginResetModel()
+            self._holding = True
+
+    def end_source_update(self, paths: set[str] | None) -> None:
+        """源模型修改完毕，按新的匹配结果重新筛选。"""
+        if self._holding:
+            self.set_matches(paths)
+
+    # ---- 源模型信号 ----
+    # 筛选中源模型的行变化会使行号失效：未经 begin_source_update() 的修改按原匹配结果逐次重置
+
+    def _on_rows_about_to_be_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+        elif not self._holding:
+            self.beginResetModel()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.endInsertRows()
+        elif not self._holding:
+            self._refilter()
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        elif not self._holding:
+            self.beginResetModel()
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._rows is None:
+            self.endRemoveRows()
+        elif not self._holding:
+            self._refilter()
+
+    def _on_source_about_to_reset(self) -> None:
+        if self._rows is None or not self._holding:
+            self.beginResetModel()
+
+    def _on_source_reset(self) -> None:
+        if self._rows is None:
+            self.endResetModel()
+        elif not self._holding:
+            self._refilter()
+
+    def _refilter(self) -> None:
+        self._rows = self._source.rows_of(self._matches)
+        self._positions = None
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=None) -> None:
+        if self._holding:
+            return
+        if self._rows is None:
+            self.dataChanged.emit(self.index(top_left.row(), top_left.column()),
+                                  self.index(bottom_right.row(), bottom_right.column()))
+            return
+        if self._positions is None:
+            self._positions = {source: row for row, source in enumerate(self._rows)}
+        visible = [
+            self._positions[source]
+            for source in range(top_left.row(), bottom_right.row() + 1)
+            if source in self._positions
+        ]
+        if visible:
+            self.dataChanged.emit(self.index(min(visible), top_left.column()),
+                                  self.index(max(visible), bottom_right.column()))
+
+
+class SubmoduleTable(QTableView):
+    """
+    子模块列表：路径、URL、commit、状态、未提交改动数、相对远端的领先/落后数、commit 说明与日期。
+    行高固定，刷新时保留选中与滚动位置。set_filter() 按 SubmoduleIndex 的查询语法筛选显示的行，
+    索引在第一次筛选（或 prepare_filter()）时建立，之后随刷新增量更新。
+    """
+
+    filter_counts = pyqtSignal(int, int)  # 筛选中：显示的行数, 全部行数
+
+    COL_PATH = SubmoduleTableModel.COL_PATH
+    COL_URL = SubmoduleTableModel.COL_URL
+    COL_COMMIT = SubmoduleTableModel.COL_COMMIT
+    COL_STATUS = SubmoduleTableModel.COL_STATUS
+    COL_CHANGES = SubmoduleTableModel.COL_CHANGES
+    COL_REMOTE_AHEAD = SubmoduleTableModel.COL_REMOTE_AHEAD
+    COL_REMOTE_BEHIND = SubmoduleTableModel.COL_REMOTE_BEHIND
+    COL_SUBJECT = SubmoduleTableModel.COL_SUBJECT
+    COL_DATE = SubmoduleTableModel.COL_DATE
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._model = SubmoduleTableModel(self)
+        self._filter = SubmoduleFilterModel(self._model, self)
+        self._index: SubmoduleIndex | None = None
+        self._query = ""
+        self._status: SubmoduleStatus | None = None
+        self._kept_selection: tuple[set[str], str | None] = (set(), None)
+        self._filter.modelAboutToBeReset.connect(self._keep_selection)
+        self.setModel(self._filter)
+        # 在 setModel() 之后连接：选择模型在 modelReset 时清空选中，恢复须在它之后
+        self._filter.modelReset.connect(self._restore_selection)
+
+        # 按内容自适应列宽/行高需要遍历所有行，大仓库下改为固定尺寸
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(SubmoduleTable.COL_URL, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(SubmoduleTable.COL_PATH, 220)
+        self.setColumnWidth(SubmoduleTable.COL_COMMIT, 110)
+        self.setColumnWidth(SubmoduleTable.COL_STATUS, 80)
+        self.setColumnWidth(SubmoduleTable.COL_CHANGES, 50)
+        self.setColumnWidth(SubmoduleTable.COL_REMOTE_AHEAD, 70)
+        self.setColumnWidth(SubmoduleTable.COL_REMOTE_BEHIND, 70)
+        self.setColumnWidth(SubmoduleTable.COL_SUBJECT, 240)
+        self.setColumnWidth(SubmoduleTable.COL_DATE, 120)
+        rows = self.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.fontMetrics().height() + 8)
+
         self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.setAlternatingRowColors(True)
+        self.setWordWrap(False)
+
+        # 刷新中提示：悬浮在视口右上角，不遮挡也不禁用表格
+        self._refreshing_label = QLabel("正在刷新…", self.viewport())
+        self._refreshing_label.setStyleSheet(
+            "QLabel { background: palette(highlight); color: palette(highlighted-text);"
+            " padding: 2px 8px; border-radius: 3px; }"
+        )
+        self._refreshing_label.hide()
+
+    def set_refreshing(self, refreshing: bool) -> None:
+        """显示/隐藏“正在刷新”提示，表格保持可操作。"""
+        if refreshing:
+            self._place_refreshing_label()
+            self._refreshing_label.show()
+            self._refreshing_label.raise_()
+        else:
+            self._refreshing_label.hide()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._place_refreshing_label()
+
+    def _place_refreshing_label(self) -> None:
+        label = self._refreshing_label
+        label.adjustSize()
+        label.move(self.viewport().width() - label.width() - 6, 6)
+
+    def table_model(self) -> SubmoduleTableModel:
+        """表格模型。"""
+        return self._model
 
     def set_submodules(self, items: list[SubmoduleInfo]) -> None:
-        """用子模块列表刷新表格。"""
-        self.setRowCount(len(items))
-        for row, info in enumerate(items):
-            self.setItem(row, SubmoduleTable.COL_PATH, QTableWidgetItem(info.path))
-            self.setItem(row, SubmoduleTable.COL_URL, QTableWidgetItem(info.url))
-            self.setItem(row, SubmoduleTable.COL_COMMIT, QTableWidgetItem(info.commit))
-            self.setItem(
-                row,
-                SubmoduleTable.COL_STATUS,
-                QTableWidgetItem(info.status_display()),
+        """用子模块列表刷新表格（增量更新）。"""
+        self._filter.begin_source_update()
+        self._model.set_submodules(items)
+        if self._index is not None:
+            self._index.update(items)
+        self._end_source_update()
+
+    def update_submodules(self, items: list[SubmoduleInfo]) -> None:
+        """只更新给定子模块所在的行。"""
+        self._model.update_submodules(items)
+        if self._index is not None:
+            self._index.apply(items)
+        if self._filter.is_filtering():
+            # 状态、commit 的变化可能改变匹配结果，没变时不重置
+            matches = self._index.search(self._query, self._status)
+            if matches != self._filter.matches():
+                self._filter.set_matches(matches)
+                self._emit_counts()
+
+    def prepare_filter(self) -> None:
+        """建立筛选索引（上万个子模块约需 0.2 秒），在筛选框获得焦点时调用，避免第一次输入卡顿。"""
+        if self._index is None:
+            self._index = SubmoduleIndex()
+            self._index.update(self._model.submodules())
+
+    def set_filter(self, query: str, status: SubmoduleStatus | None = None) -> None:
+        """按查询与状态筛选显示的行；都为空时显示全部。选中行中仍可见的保持选中。"""
+        self._query = query
+        self._status = status
+        if not query.strip() and status is None:
+            if self._filter.is_filtering():
+                self._filter.set_matches(None)
+        else:
+            self.prepare_filter()
+            matches = self._index.search(query, status)
+            # 多输入一个字符常常不改变结果（如全部路径都含该前缀），此时不重置
+            if matches != self._filter.matches():
+                self._filter.set_matches(matches)
+        current = self.currentIndex()
+        if current.isValid():
+            self.scrollTo(current)
+        else:
+            self.scrollToTop()
+        self._emit_counts()
+
+    def is_filtering(self) -> bool:
+        return self._filter.is_filtering()
+
+    def _end_source_update(self) -> None:
+        if self._filter.is_filtering():
+            self._filter.end_source_update(self._index.search(self._query, self._status))
+            self._emit_counts()
+
+    def _emit_counts(self) -> None:
+        if self._filter.is_filtering():
+            self.filter_counts.emit(self._filter.rowCount(), self._model.rowCount())
+
+    def _keep_selection(self) -> None:
+        # 筛选模型重置前记下选中的路径与当前行（此时源模型尚未修改）
+        current = self.currentIndex()
+        self._kept_selection = (
+            set(self.selected_paths()),
+            self._path_at(current.row()) if current.isValid() else None,
+        )
+
+    def _restore_selection(self) -> None:
+        paths, current_path = self._kept_selection
+        self._kept_selection = (set(), None)
+        if not paths and current_path is None:
+            return
+        selection = QItemSelection()
+        last_col = self._filter.columnCount() - 1
+        visible = self._visible_paths()
+        start = -1
+        for row, path in enumerate([*visible, None]):
+            if path is not None and path in paths:
+                if start < 0:
+                    start = row
+            elif start >= 0:
+                # 连续选中的行合并为一个区间
+                selection.select(self._filter.index(start, 0), self._filter.index(row - 1, last_col))
+                start = -1
+        selection_model = self.selectionModel()
+        if current_path is not None and current_path in visible:
+            selection_model.setCurrentIndex(
+                self._filter.index(visible.index(current_path), 0), QItemSelectionModel.SelectionFlag.NoUpdate
             )
-        if items:
-            self.resizeRowsToContents()
+        if not selection.isEmpty():
+            selection_model.select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+
+    def _path_at(self, row: int) -> str:
+        return self._model.info(self._filter.source_row(row)).path
+
+    def _visible_paths(self) -> list[str]:
+        infos = self._model.submodules()
+        return [infos[row].path for row in self._filter.source_rows()]
 
     def selected_paths(self) -> list[str]:
-        """返回当前选中的行对应的路径列表。"""
-        paths: list[str] = []
-        for idx in self.selectionModel().selectedRows():
-            row = idx.row()
-            path_item = self.item(row, SubmoduleTable.COL_PATH)
-            if path_item:
-                paths.append(path_item.text())
-        return paths
+        """返回当前选中的行对应的路径列表（按显示顺序）。"""
+        rows: set[int] = set()
+        for selected in self.selectionModel().selection():
+            rows.update(range(selected.top(), selected.bottom() + 1))
+        if not rows:
+            return []
+        infos = self._model.submodules()
+        sources = self._filter.source_rows()
+        return [infos[sources[row]].path for row in sorted(rows)]
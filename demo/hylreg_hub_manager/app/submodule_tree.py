@@ -0,0 +1,304 @@
+"""子模块树形视图：第一层与表格相同，嵌套的子模块在展开时才在后台读取。"""
+
+from pathlib import Path
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QTreeView
+
+from app.level_loader import LevelLoader
+from app.submodule_table import SubmoduleTableModel
+from core.models import SubmoduleInfo
+from core.submodule_tree import SubmoduleLevelCache, may_have_nested
+
+
+class _Node:
+    """树中的一个子模块。children 为 None 表示下一层尚未读取。"""
+
+    __slots__ = ("info", "parent", "row", "worktree", "children", "loading", "nested")
+
+    def __init__(self, info: SubmoduleInfo | None, parent: "_Node | None", worktree: str):
+        self.info = info
+        self.parent = parent
+        self.row = 0
+        self.worktree = worktree
+        self.children: list[_Node] | None = None
+        self.loading = False
+        self.nested: bool | None = None  # 是否可能有下一层，第一次询问时才 stat
+
+
+class SubmoduleTreeModel(QAbstractItemModel):
+    """
+    子模块树模型。第一层由 set_submodules() 设置（与表格模型相同的按路径差异更新），
+    更深的层由 Qt 的 canFetchMore/fetchMore 在节点展开时交给 LevelLoader 在后台读取；
+    从未展开过的子树不产生任何开销。revalidate() 重新校验已读取过的层。
+    """
+
+    def __init__(self, parent: QObject | None = None, cache: SubmoduleLevelCache | None = None):
+        super().__init__(parent)
+        self._root = _Node(None, None, "")
+        self._root.children = []
+        self._by_worktree: dict[str, _Node] = {}
+        self._loader = LevelLoader(self, cache)
+        self._loader.loaded.connect(self._on_level_loaded)
+
+    # ---- Qt 接口 ----
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        node = self._node(parent)
+        if node.children is None or not (0 <= row < len(node.children)):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        children = self._node(parent).children
+        return 0 if children is None else len(children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(SubmoduleTableModel.HEADERS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        if node.children is not None:
+            return bool(node.children) or node.loading
+        if node.nested is None:
+            node.nested = may_have_nested(node.worktree, node.info)
+        return node.nested
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._node(parent)
+        return node is not self._root and node.children is None and not node.loading and self.hasChildren(parent)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self._node(parent)
+        if node is self._root or node.loading:
+            return
+        node.loading = True
+        self._loader.request(node.worktree)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return SubmoduleTableModel.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node: _Node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return SubmoduleTableModel.display_text(node.info, index.column())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if index.column() == SubmoduleTableModel.COL_PATH:
+                return node.worktree
+            return SubmoduleTableModel.display_text(node.info, index.column())
+        if role == Qt.ItemDataRole.UserRole:
+            return node.info
+        return None
+
+    # ---- 对外接口 ----
+
+    def set_repo(self, repo_root: str) -> None:
+        """切换仓库：清空整棵树并丢弃未完成的读取。"""
+        self._loader.cancel()
+        self.beginResetModel()
+        self._root = _Node(None, None, repo_root)
+        self._root.children = []
+        self._by_worktree = {}
+        self.endResetModel()
+
+    def set_submodules(self, items: list[SubmoduleInfo]) -> None:
+        """设置第一层。"""
+        self._sync_children(self._root, QModelIndex(), items)
+
+    def revalidate(self) -> None:
+        """重新请求已读取过的各层：指纹未变的层直接取缓存，结果相同时不发出信号。"""
+        stack = list(self._root.children)
+        while stack:
+            node = stack.pop()
+            if node.children is not None:
+                self._loader.request(node.worktree)
+                stack.extend(node.children)
+
+    def is_top_level(self, index: QModelIndex) -> bool:
+        return index.isValid() and index.internalPointer().parent is self._root
+
+    def shutdown(self) -> None:
+        self._loader.shutdown()
+
+    # ---- 内部 ----
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node: _Node) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _on_level_loaded(self, worktree: str, items: list) -> None:
+        node = self._by_worktree.get(worktree)
+        if node is None:
+            return  # 节点已被移除
+        node.loading = False
+        if node.children is None:
+            node.children = []
+            if not items:
+                # 没有下一层：刷新该行以去掉展开箭头
+                index = self._index_of(node)
+                self.dataChanged.emit(index, index.siblingAtColumn(self.columnCount() - 1))
+                return
+        self._sync_children(node, self._index_of(node), items)
+
+    def _make_node(self, info: SubmoduleInfo, parent: _Node) -> _Node:
+        node = _Node(info, parent, str(Path(parent.worktree) / info.path))
+        self._by_worktree[node.worktree] = node
+        return node
+
+    def _forget(self, node: _Node) -> None:
+        """从索引中移除节点及其子树。"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._by_worktree.pop(current.worktree, None)
+            if current.children:
+                stack.extend(current.children)
+
+    def _renumber(self, node: _Node) -> None:
+        for row, child in enumerate(node.children):
+            child.row = row
+
+    def _sync_children(self, node: _Node, parent: QModelIndex, items: list[SubmoduleInfo]) -> None:
+        """按路径比较，把 node 的子节点更新为 items，只对变化的行发信号；保留节点以保留其展开的子树。"""
+        children = node.children
+        keep = {info.path for info in items}
+        # 从后往前按连续区间删除
+        row = len(children) - 1
+        while row >= 0:
+            if children[row].info.path in keep:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and children[row].info.path not in keep:
+                row -= 1
+            self.beginRemoveRows(parent, row + 1, last)
+            for removed in children[row + 1:last + 1]:
+                self._forget(removed)
+            del children[row + 1:last + 1]
+            self._renumber(node)
+            self.endRemoveRows()
+
+        current = {child.info.path for child in children}
+        kept = [info.path for info in items if info.path in current]
+        if kept != [child.info.path for child in children]:
+            # 保留下来的行相对顺序变化：按新顺序重排节点
+            by_path = {child.info.path: child for child in children}
+            self.layoutAboutToBeChanged.emit([parent] if parent.isValid() else [])
+            old = {id(child): child.row for child in children}
+            children[:] = [by_path[path] for path in kept]
+            self._renumber(node)
+            for child in children:
+                for col in range(self.columnCount()):
+                    self.changePersistentIndex(
+                        self.createIndex(old[id(child)], col, child),
+                        self.createIndex(child.row, col, child),
+                    )
+            self.layoutChanged.emit([parent] if parent.isValid() else [])
+
+        last_col = self.columnCount() - 1
+        row = 0
+        pos = 0
+        while pos < len(items):
+            info = items[pos]
+            if row < len(children) and children[row].info.path == info.path:
+                child = children[row]
+                if child.info != info:
+                    if child.info.status != info.status:
+                        child.nested = None
+                    child.info = info
+                    self.dataChanged.emit(
+                        self.createIndex(row, 0, child), self.createIndex(row, last_col, child)
+                    )
+                row += 1
+                pos += 1
+                continue
+            end = pos
+            while end < len(items) and (row >= len(children) or items[end].path != children[row].info.path):
+                end += 1
+            self.beginInsertRows(parent, row, row + (end - pos) - 1)
+            children[row:row] = [self._make_node(info, node) for info in items[pos:end]]
+            self._renumber(node)
+            self.endInsertRows()
+            row += end - pos
+            pos = end
+        self._renumber(node)
+
+
+class SubmoduleTree(QTreeView):
+    """
+    子模块树：列与表格相同，第一层跟随 source（表格模型）变化，嵌套的子模块只在展开时读取。
+    嵌套子模块只供查看；选中时 selected_paths() 只返回第一层的路径。
+    """
+
+    def __init__(self, source: SubmoduleTableModel, parent=None, cache: SubmoduleLevelCache | None = None):
+        super().__init__(parent)
+        self._source = source
+        self._model = SubmoduleTreeModel(self, cache)
+        self.setModel(self._model)
+        self.setUniformRowHeights(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setAlternatingRowColors(True)
+        self.setWordWrap(False)
+        header = self.header()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(SubmoduleTableModel.COL_URL, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(SubmoduleTableModel.COL_PATH, 260)
+        self.setColumnWidth(SubmoduleTableModel.COL_COMMIT, 110)
+        self.setColumnWidth(SubmoduleTableModel.COL_SUBJECT, 240)
+
+        # 表格模型的连续变化合并为一次同步
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(0)
+        self._sync_timer.timeout.connect(self._sync_from_source)
+        for signal in (
+            source.modelReset,
+            source.rowsInserted,
+            source.rowsRemoved,
+            source.dataChanged,
+        ):
+            signal.connect(self._sync_timer.start)
+
+    def set_repo(self, repo_root: str) -> None:
+        """切换仓库。"""
+        self._model.set_repo(repo_root)
+        self._sync_from_source()
+
+    def revalidate(self) -> None:
+        """hub 刷新后调用：重新校验已展开过的各层。"""
+        self._model.revalidate()
+
+    def selected_paths(self) -> list[str]:
+        """选中的第一层子模块路径（嵌套子模块被忽略）。"""
+        return [
+            idx.data(Qt.ItemDataRole.UserRole).path
+            for idx in self.selectionModel().selectedRows()
+            if self._model.is_top_level(idx)
+        ]
+
+    def shutdown(self) -> None:
+        """退出前调用：等待后台读取结束。"""
+        self._model.shutdown()
+
+    def _sync_from_source(self) -> None:
+        self._model.set_submodules(self._source.submodules())
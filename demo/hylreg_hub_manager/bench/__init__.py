@@ -0,0 +1 @@
+"""性能基准：合成 hub 生成器与分阶段计时。"""
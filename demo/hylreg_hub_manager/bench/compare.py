@@ -0,0 +1,67 @@
+"""
+比较两次基准结果：按 (参数, 阶段) 对齐，列出中位耗时与峰值内存的变化。
+任一阶段变慢超过阈值时返回非 0，便于在 CI 中拦截性能回退。
+
+    python -m bench.compare base.json new.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _load(path: str) -> dict[tuple[str, str], dict]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    stages: dict[tuple[str, str], dict] = {}
+    for result in data.get("results", []):
+        spec = result["spec"]
+        key = f"n={spec['count']} d={spec['depth']} dirty={spec['dirty_ratio']:g}"
+        for name, stage in result["stages"].items():
+            if "median_s" in stage:
+                stages[(key, name)] = stage
+    return stages
+
+
+def compare(base: dict, new: dict, threshold: float, min_seconds: float) -> list[str]:
+    """打印对比表，返回超过阈值的回退项。"""
+    regressions: list[str] = []
+    print(f"{'参数':<28} {'阶段':<30} {'基准 ms':>10} {'当前 ms':>10} {'变化':>8} {'内存变化':>9}")
+    for key in sorted(base.keys() & new.keys()):
+        old, cur = base[key], new[key]
+        t0, t1 = old["median_s"], cur["median_s"]
+        ratio = (t1 - t0) / t0 if t0 > 0 else 0.0
+        mem = (cur["peak_kib"] - old["peak_kib"]) / old["peak_kib"] if old["peak_kib"] else 0.0
+        flag = ""
+        # 极短的阶段噪声大，低于 min_seconds 的不计为回退
+        if ratio > threshold and t1 >= min_seconds:
+            flag = "  <-- 回退"
+            regressions.append(f"{key[0]} {key[1]}: {ratio:+.0%}")
+        print(
+            f"{key[0]:<28} {key[1]:<30} {t0 * 1000:10.1f} {t1 * 1000:10.1f}"
+            f" {ratio:+8.0%} {mem:+9.0%}{flag}"
+        )
+    for key in sorted(base.keys() - new.keys()):
+        print(f"{key[0]:<28} {key[1]:<30} （当前结果中缺失）")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="比较两次基准结果")
+    parser.add_argument("base", help="基准结果 JSON")
+    parser.add_argument("new", help="当前结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的变慢比例，默认 0.2")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="低于该耗时的阶段不判定回退")
+    args = parser.parse_args(argv)
+
+    regressions = compare(_load(args.base), _load(args.new), args.threshold, args.min_ms / 1000)
+    if regressions:
+        print(f"\n{len(regressions)} 个阶段变慢超过 {args.threshold:.0%}:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+生成用于基准测试的合成 hub 仓库：只依赖本地裸仓库，不访问网络。
+
+为了能在几秒内生成上万个子模块，已检出的子模块不逐个 clone，而是按
+git submodule update 的结果直接写出 .git/modules/<name>（HEAD、config、
+指向模板裸仓库的 alternates 与模板 index）和工作区文件；hub 的 gitlink 用一次
+git update-index --index-info 写入。生成结果与真实 clone 在 git 看来完全一致。
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_AUTHOR_DATE": "2024-01-01T00:00:00Z",
+    "GIT_COMMITTER_DATE": "2024-01-01T00:00:00Z",
+    "GIT_CONFIG_NOSYSTEM": "1",
+}
+_MARKER = "hubgen.json"
+
+
+@dataclass(frozen=True)
+class HubSpec:
+    """合成 hub 的参数。"""
+
+    count: int  # 顶层子模块数
+    depth: int = 1  # 嵌套层数：1 表示子模块内部不再有子模块
+    fanout: int = 2  # 每个子模块包含的下一层子模块数（depth > 1 时）
+    checked_out_ratio: float = 1.0  # 已检出的顶层子模块比例，其余保持未初始化
+    dirty_ratio: float = 0.0  # 已检出子模块中工作区有未提交修改的比例
+    seed: int = 0
+
+    def slug(self) -> str:
+        return (
+            f"n{self.count}-d{self.depth}-f{self.fanout}"
+            f"-c{self.checked_out_ratio:g}-w{self.dirty_ratio:g}-s{self.seed}"
+        )
+
+
+def _git(cwd: Path, *args: str, stdin: str | None = None) -> str:
+    proc = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        env=_ENV,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} 失败: {proc.stderr.strip()}")
+    return proc.stdout
+
+
+@dataclass
+class _Template:
+    """某一层子模块共用的模板仓库：裸仓库、唯一的 commit、对应 index 与工作区文件。"""
+
+    bare: Path
+    commit: str
+    index: Path
+    files: dict[str, str]  # 相对路径 -> 内容
+    gitlinks: list[str]  # 工作区中需要创建的空目录（未初始化的下一层子模块）
+
+
+def _make_template(root: Path, level: int, child: _Template | None, fanout: int) -> _Template:
+    """创建第 level 层的模板：README，以及 depth 未到底时指向下一层模板的 fanout 个子模块。"""
+    bare = root / f"level{level}.git"
+    work = root / f"level{level}-work"
+    _git(root, "init", "-q", "--bare", str(bare))
+    _git(root, "init", "-q", str(work))
+    files = {"README.md": f"level {level}\n"}
+    gitlinks: list[str] = []
+    if child is not None:
+        sections = []
+        for i in range(fanout):
+            path = f"sub{i}"
+            gitlinks.append(path)
+            sections.append(f'[submodule "{path}"]\n\tpath = {path}\n\turl = {child.bare.as_posix()}\n')
+        files[".gitmodules"] = "".join(sections)
+    for name, content in files.items():
+        (work / name).write_text(content, encoding="utf-8")
+    _git(work, "add", *files)
+    if gitlinks:
+        _git(
+            work,
+            "update-index",
+            "--index-info",
+            stdin="".join(f"160000 {child.commit} 0\t{p}\n" for p in gitlinks),
+        )
+    _git(work, "commit", "-q", "-m", f"level {level}")
+    _git(work, "push", "-q", str(bare), "HEAD:refs/heads/main")
+    _git(bare, "symbolic-ref", "HEAD", "refs/heads/main")
+    commit = _git(work, "rev-parse", "HEAD").strip()
+    index = root / f"level{level}.index"
+    shutil.copyfile(work / ".git" / "index", index)
+    shutil.rmtree(work)
+    return _Template(bare, commit, index, files, gitlinks)
+
+
+def _checkout(hub: Path, name: str, path: str, template: _Template, dirty: bool) -> None:
+    """写出与 git submodule update --init 相同的子模块 git 目录与工作区。"""
+    git_dir = hub / ".git" / "modules" / name
+    worktree = hub / path
+    for sub in ("objects/info", "objects/pack", "refs/heads", "refs/tags", "refs/remotes/origin"):
+        (git_dir / sub).mkdir(parents=True, exist_ok=True)
+    worktree.mkdir(parents=True, exist_ok=True)
+    (git_dir / "HEAD").write_text(template.commit + "\n", encoding="utf-8")
+    (git_dir / "refs" / "remotes" / "origin" / "main").write_text(
+        template.commit + "\n", encoding="utf-8"
+    )
+    (git_dir / "refs" / "remotes" / "origin" / "HEAD").write_text(
+        "ref: refs/remotes/origin/main\n", encoding="utf-8"
+    )
+    (git_dir / "objects" / "info" / "alternates").write_text(
+        str(template.bare.resolve() / "objects") + "\n", encoding="utf-8"
+    )
+    (git_dir / "config").write_text(
+        "[core]\n"
+        "\trepositoryformatversion = 0\n"
+        "\tfilemode = true\n"
+        "\tbare = false\n"
+        f"\tworktree = {os.path.relpath(worktree, git_dir).replace(os.sep, '/')}\n"
+        '[remote "origin"]\n'
+        f"\turl = {template.bare.as_posix()}\n"
+        "\tfetch = +refs/heads/*:refs/remotes/origin/*\n",
+        encoding="utf-8",
+    )
+    shutil.copyfile(template.index, git_dir / "index")
+    (worktree / ".git").write_text(
+        f"gitdir: {os.path.relpath(git_dir, worktree).replace(os.sep, '/')}\n",
+        encoding="utf-8",
+    )
+    for rel, content in template.files.items():
+        (worktree / rel).write_text(content + ("modified\n" if dirty and rel == "README.md" else ""), encoding="utf-8")
+    for rel in template.gitlinks:
+        (worktree / rel).mkdir(exist_ok=True)
+
+
+def generate_hub(dest: str | Path, spec: HubSpec) -> Path:
+    """
+    在 dest 下生成合成 hub，返回 hub 根目录。
+    dest 中已有相同参数生成的 hub 时直接复用。
+    """
+    dest = Path(dest)
+    marker = dest / _MARKER
+    hub = dest / "hub"
+    if marker.exists() and json.loads(marker.read_text(encoding="utf-8")) == asdict(spec):
+        return hub
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.mkdir(parents=True)
+
+    templates_root = dest / "remotes"
+    templates_root.mkdir()
+    template: _Template | None = None
+    for level in range(max(1, spec.depth), 0, -1):
+        template = _make_template(templates_root, level, template, spec.fanout)
+
+    rng = random.Random(spec.seed)
+    _git(dest, "init", "-q", "-b", "main", str(hub))
+    width = len(str(spec.count))
+    modules = [f"repos/m{i:0{width}d}" for i in range(spec.count)]
+    url = template.bare.as_posix()
+    (hub / ".gitmodules").write_text(
+        "".join(f'[submodule "{p}"]\n\tpath = {p}\n\turl = {url}\n' for p in modules),
+        encoding="utf-8",
+    )
+    _git(hub, "add", ".gitmodules")
+    _git(
+        hub,
+        "update-index",
+        "--index-info",
+        stdin="".join(f"160000 {template.commit} 0\t{p}\n" for p in modules),
+    )
+    _git(hub, "commit", "-q", "-m", "synthetic hub")
+
+    config_lines: list[str] = []
+    for path in modules:
+        if rng.random() >= spec.checked_out_ratio:
+            (hub / path).mkdir(parents=True, exist_ok=True)
+            continue
+        _checkout(hub, path, path, template, dirty=rng.random() < spec.dirty_ratio)
+        config_lines.append(f'[submodule "{path}"]\n\tactive = true\n\turl = {url}\n')
+    with open(hub / ".git" / "config", "a", encoding="utf-8") as f:
+        f.write("".join(config_lines))
+
+    marker.write_text(json.dumps(asdict(spec)), encoding="utf-8")
+    return hub
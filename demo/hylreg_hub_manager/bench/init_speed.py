@@ -0,0 +1,175 @@
+"""
+快速初始化基准：用本地裸仓库（file:// 协议，不访问网络）比较普通初始化与
+--jobs / --depth / --filter=blob:none 的耗时与 .git/modules 占用。
+
+    python -m bench.init_speed --repos 16 --commits 200 --jobs 8 --output init-speed.json
+
+每种模式都从 hub 的一个新 clone 开始执行 git submodule update --init --recursive，
+参数由 core.init_options.InitOptions.clone_args 生成，与界面和命令行一致。
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench.run import _metadata
+from core.init_options import INIT_BASE, InitOptions
+
+_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1",
+    # git 2.38 起子模块默认禁止 file:// 协议
+    "GIT_CONFIG_COUNT": "1",
+    "GIT_CONFIG_KEY_0": "protocol.file.allow",
+    "GIT_CONFIG_VALUE_0": "always",
+}
+
+
+def _git(cwd: Path, *args: str, stdin: bytes | None = None) -> str:
+    proc = subprocess.run(["git", *args], cwd=cwd, input=stdin, capture_output=True, env=_ENV)
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} 失败: {proc.stderr.decode(errors='replace').strip()}")
+    return proc.stdout.decode()
+
+
+def _make_upstream(path: Path, commits: int, files: int, blob_size: int, rng: random.Random) -> str:
+    """用 fast-import 生成有 commits 个提交的裸仓库（每个提交改写一个随机内容的文件），返回最新 commit。"""
+    _git(path.parent, "init", "-q", "--bare", str(path))
+    # 允许部分克隆与按 commit 抓取（浅克隆的记录 commit 不在分支顶端时需要）
+    _git(path, "config", "uploadpack.allowFilter", "true")
+    _git(path, "config", "uploadpack.allowAnySHA1InWant", "true")
+    stream = bytearray()
+    for i in range(commits):
+        message = f"commit {i}\n".encode()
+        content = rng.randbytes(blob_size)
+        stream += b"commit refs/heads/main\n"
+        stream += f"mark :{i + 1}\n".encode()
+        stream += f"committer bench <bench@example.com> {1_700_000_000 + i} +0000\n".encode()
+        stream += f"data {len(message)}\n".encode() + message
+        if i:
+            stream += f"from :{i}\n".encode()
+        stream += f"M 644 inline data/file{i % files}.bin\n".encode()
+        stream += f"data {len(content)}\n".encode() + content + b"\n"
+    _git(path, "fast-import", "--quiet", stdin=bytes(stream))
+    _git(path, "symbolic-ref", "HEAD", "refs/heads/main")
+    return _git(path, "rev-parse", "refs/heads/main").strip()
+
+
+def generate(workdir: Path, repos: int, commits: int, files: int, blob_size: int, shallow_ratio: float) -> Path:
+    """生成上游裸仓库与引用它们的 hub（已存在时复用），返回 hub 路径。"""
+    marker = workdir / "spec.json"
+    spec = {"repos": repos, "commits": commits, "files": files, "blob_size": blob_size, "shallow_ratio": shallow_ratio}
+    hub = workdir / "hub"
+    if marker.exists() and json.loads(marker.read_text()) == spec:
+        return hub
+    shutil.rmtree(workdir, ignore_errors=True)
+    (workdir / "upstream").mkdir(parents=True)
+    rng = random.Random(0)
+    _git(workdir, "init", "-q", str(hub))
+    gitmodules: list[str] = []
+    index_info: list[str] = []
+    for i in range(repos):
+        name = f"repos/m{i:04d}"
+        tip = _make_upstream(workdir / "upstream" / f"m{i:04d}.git", commits, files, blob_size, rng)
+        url = (workdir / "upstream" / f"m{i:04d}.git").as_uri()
+        gitmodules.append(f'[submodule "{name}"]\n\tpath = {name}\n\turl = {url}\n')
+        if rng.random() < shallow_ratio:
+            gitmodules.append("\tshallow = true\n")
+        index_info.append(f"160000 {tip}\t{name}")
+    (hub / ".gitmodules").write_text("".join(gitmodules), encoding="utf-8")
+    _git(hub, "update-index", "--index-info", stdin=("\n".join(index_info) + "\n").encode())
+    _git(hub, "add", ".gitmodules")
+    _git(hub, "commit", "-q", "-m", "hub")
+    marker.write_text(json.dumps(spec))
+    return hub
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file() and not p.is_symlink())
+
+
+def run_mode(hub: Path, workdir: Path, name: str, options: InitOptions, repeat: int) -> dict:
+    """从 hub 的新 clone 开始初始化全部子模块，计时 repeat 次。"""
+    times: list[float] = []
+    size = 0
+    for _ in range(repeat):
+        work = workdir / f"run-{name}"
+        shutil.rmtree(work, ignore_errors=True)
+        _git(workdir, "clone", "-q", str(hub), str(work))
+        args = [*INIT_BASE, *options.clone_args()]
+        args.remove("--progress")
+        start = time.perf_counter()
+        _git(work, *args)
+        times.append(time.perf_counter() - start)
+        size = _dir_size(work / ".git" / "modules")
+        shutil.rmtree(work, ignore_errors=True)
+    return {
+        "args": options.clone_args(),
+        "min_s": round(min(times), 3),
+        "median_s": round(statistics.median(times), 3),
+        "modules_kib": round(size / 1024, 1),
+        "repeat": repeat,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="快速初始化基准（本地裸仓库）")
+    parser.add_argument("--repos", type=int, default=16, help="子模块数")
+    parser.add_argument("--commits", type=int, default=200, help="每个上游仓库的提交数")
+    parser.add_argument("--files", type=int, default=20, help="每个仓库的文件数（提交轮流改写）")
+    parser.add_argument("--blob-size", type=int, default=16 * 1024, help="每次改写的文件大小（字节）")
+    parser.add_argument("--shallow-ratio", type=float, default=0.0, help=".gitmodules 中标记 shallow = true 的比例")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 4, help="并行模式的 --jobs")
+    parser.add_argument("--repeat", type=int, default=1, help="每种模式的计时次数")
+    parser.add_argument("--workdir", default=None, help="生成仓库的目录（可复用），默认系统临时目录")
+    parser.add_argument("--output", "-o", default=None, help="结果 JSON 文件；省略时输出到标准输出")
+    args = parser.parse_args(argv)
+
+    workdir = Path(args.workdir or Path(tempfile.gettempdir()) / "hylreg_hub_manager-init-bench")
+    start = time.perf_counter()
+    hub = generate(workdir, args.repos, args.commits, args.files, args.blob_size, args.shallow_ratio)
+    print(f"生成 {args.repos} 个上游仓库 {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    modes = {
+        "plain": InitOptions(),
+        "jobs": InitOptions(jobs=args.jobs),
+        "depth1": InitOptions(depth=1),
+        "blobless": InitOptions(blobless=True),
+        "jobs_depth1": InitOptions(jobs=args.jobs, depth=1),
+        "jobs_blobless": InitOptions(jobs=args.jobs, blobless=True),
+    }
+    results = {name: run_mode(hub, workdir, name, options, args.repeat) for name, options in modes.items()}
+    baseline = results["plain"]["median_s"]
+    for name, result in results.items():
+        result["speedup"] = round(baseline / result["median_s"], 2) if result["median_s"] else None
+        print(
+            f"  {name:<14} {result['median_s']:8.2f} s  x{result['speedup']:<5}  {result['modules_kib']:10.0f} KiB",
+            file=sys.stderr,
+        )
+
+    text = json.dumps(
+        {"meta": _metadata(), "spec": vars(args), "results": results},
+        ensure_ascii=False,
+        indent=2,
+    )
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
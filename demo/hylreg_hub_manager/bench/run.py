@@ -0,0 +1,213 @@
+"""
+基准测试入口：生成合成 hub，分阶段计时并记录峰值内存，结果写成 JSON 便于跨提交比较。
+
+    python -m bench.run --sizes 10,1000,10000 --output bench-results.json
+    python -m bench.compare 旧结果.json 新结果.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, replace
+from pathlib import Path
+
+from bench.hubgen import HubSpec, generate_hub
+from core.dirty_scan import DirtyScanCache, scan_dirty
+from core.git_runner import load_submodules, parse_submodule_status, run_git
+from core.gitmodules import GitmodulesParser, parse_gitmodules_text
+from core.status_reader import read_submodule_status
+
+SCHEMA_VERSION = 1
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _measure(fn: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> dict:
+    """执行 repeat 次计时，再单独执行一次 tracemalloc 统计峰值（避免拖慢计时）。"""
+    times: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "peak_kib": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+
+def _table_stages(items: list, repeat: int) -> dict[str, dict]:
+    """SubmoduleTable.set_submodules：首次填充、相同列表、只改一行。没有 PyQt6 时跳过。"""
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+
+        from app.submodule_table import SubmoduleTable
+    except ImportError as e:
+        return {"table_set_submodules": {"skipped": str(e)}}
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    table = SubmoduleTable()
+    changed = list(items)
+    if changed:
+        changed[len(changed) // 2] = replace(changed[len(changed) // 2], changed_files=99)
+
+    stages = {
+        "table_set_submodules": _measure(
+            lambda: table.set_submodules(items),
+            repeat,
+            setup=lambda: table.set_submodules([]),
+        ),
+        "table_set_submodules_same": _measure(lambda: table.set_submodules(items), repeat),
+        "table_set_submodules_one_row": _measure(
+            lambda: table.set_submodules(changed),
+            repeat,
+            setup=lambda: table.set_submodules(items),
+        ),
+    }
+    table.deleteLater()
+    app.processEvents()
+    return stages
+
+
+def bench_hub(hub: Path, repeat: int, skip: set[str] = frozenset()) -> dict:
+    """
+    对一个 hub 逐阶段计时；同时核对直接读取与 git submodule status 的结果是否一致。
+    skip 中的阶段不计时（如上万子模块时很慢的 git_submodule_status）。
+    """
+    root = str(hub)
+    # run_git_submodule_status 有 30 秒超时，上万子模块时会超时，这里直接调用 git 以便计时与核对
+    status_cmd = ["submodule", "status"]
+    status_output, status_error, status_code = run_git(root, status_cmd, timeout=3600)
+    items = load_submodules(root)
+    dirty_cache = DirtyScanCache()
+    warm_cache = DirtyScanCache()
+    scan_dirty(root, items, warm_cache)  # 热缓存阶段不依赖冷缓存阶段是否被跳过
+    # load_gitmodules 按 mtime 缓存，这里直接解析文本；增量阶段交替解析只差一个值的两份文本
+    gitmodules_text = (hub / ".gitmodules").read_text(encoding="utf-8")
+    edited_text = gitmodules_text.replace("url = ", "url =  ", 1)
+    gitmodules_parser = GitmodulesParser()
+    gitmodules_parser.parse(gitmodules_text)
+    texts = [gitmodules_text, edited_text]
+
+    plan: dict[str, tuple[Callable[[], object], Callable[[], None] | None]] = {
+        "parse_gitmodules": (lambda: parse_gitmodules_text(gitmodules_text), None),
+        "parse_gitmodules_incremental": (
+            lambda: gitmodules_parser.parse(texts[0]),
+            texts.reverse,
+        ),
+        "git_submodule_status": (lambda: run_git(root, status_cmd, timeout=3600), None),
+        "parse_submodule_status": (lambda: parse_submodule_status(status_output), None),
+        "read_submodule_status": (lambda: read_submodule_status(root), None),
+        "load_submodules": (lambda: load_submodules(root), None),
+        "load_submodules_git": (lambda: load_submodules(root, native=False), None),
+        "scan_dirty_cold": (lambda: scan_dirty(root, items, dirty_cache), dirty_cache.clear),
+        "scan_dirty_warm": (lambda: scan_dirty(root, items, warm_cache), None),
+    }
+    stages = {
+        name: _measure(fn, repeat, setup)
+        for name, (fn, setup) in plan.items()
+        if name not in skip
+    }
+    if "table" not in skip:
+        stages.update(_table_stages(items, repeat))
+    result = {"stages": stages, "native_matches_git": None}
+    if status_code == 0:
+        result["native_matches_git"] = (
+            read_submodule_status(root) == parse_submodule_status(status_output)
+        )
+    else:
+        result["git_error"] = status_error.strip()
+    return result
+
+
+def _metadata() -> dict:
+    def out(*args: str) -> str:
+        try:
+            return subprocess.run(
+                list(args), cwd=PROJECT_ROOT, capture_output=True, text=True
+            ).stdout.strip()
+        except OSError:
+            return ""
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": out("git", "rev-parse", "HEAD"),
+        "git": out("git", "--version"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="hylreg_hub_manager 性能基准")
+    parser.add_argument("--sizes", default="10,1000", help="逗号分隔的子模块数，如 10,1000,10000")
+    parser.add_argument("--depth", type=int, default=1, help="子模块嵌套层数")
+    parser.add_argument("--fanout", type=int, default=2, help="每层嵌套的子模块数")
+    parser.add_argument("--checked-out-ratio", type=float, default=1.0, help="已检出的子模块比例")
+    parser.add_argument("--dirty-ratio", type=float, default=0.1, help="有未提交修改的子模块比例")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段的计时次数")
+    parser.add_argument(
+        "--skip",
+        default="",
+        help="逗号分隔的跳过阶段名；table 表示跳过全部表格阶段",
+    )
+    parser.add_argument("--workdir", default=None, help="生成 hub 的目录（可复用），默认系统临时目录")
+    parser.add_argument("--output", "-o", default=None, help="结果 JSON 文件；省略时输出到标准输出")
+    args = parser.parse_args(argv)
+
+    workdir = Path(args.workdir or Path(tempfile.gettempdir()) / "hylreg_hub_manager-bench")
+    skip = {s.strip() for s in args.skip.split(",") if s.strip()}
+    results = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        spec = HubSpec(
+            count=size,
+            depth=args.depth,
+            fanout=args.fanout,
+            checked_out_ratio=args.checked_out_ratio,
+            dirty_ratio=args.dirty_ratio,
+        )
+        start = time.perf_counter()
+        hub = generate_hub(workdir / spec.slug(), spec)
+        print(f"[{spec.slug()}] 生成 {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        result = {"spec": asdict(spec), **bench_hub(hub, args.repeat, skip)}
+        for name, stage in result["stages"].items():
+            if "median_s" in stage:
+                print(
+                    f"  {name:<30} {stage['median_s'] * 1000:10.1f} ms  {stage['peak_kib']:10.1f} KiB",
+                    file=sys.stderr,
+                )
+        if result["native_matches_git"] is False:
+            print("  警告：直接读取的状态与 git submodule status 不一致", file=sys.stderr)
+        results.append(result)
+
+    text = json.dumps({"meta": _metadata(), "results": results}, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 1 if any(r["native_matches_git"] is False for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
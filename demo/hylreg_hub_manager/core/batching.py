@@ -0,0 +1,189 @@
+"""
+把按路径的 git 命令合并为带多个路径的一条命令：少启动进程、少争抢 hub 的 index / config 锁。
+路径按命令行长度上限分块；每个路径的结果从输出中归属回来，命令中途因某个路径失败而停止时，
+去掉失败的路径对其余路径重新执行，效果与逐个执行相同。
+"""
+
+import math
+import os
+import re
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.git_runner import operation_name
+
+# 可以合并的操作：除路径外参数相同的命令，合并后的行为与逐个执行一致
+BATCHABLE_OPS = {"submodule update", "submodule init", "submodule deinit", "rm"}
+# 按 index 顺序（即路径排序）逐个处理、遇到致命错误即停止的操作：失败路径之前的都已完成
+_ORDERED_OPS = {"submodule update"}
+_QUOTED_RE = re.compile(r"'([^']+)'")
+_FAILURE_PREFIXES = ("error:", "fatal:", "Failed to", "Unable to")
+_WINDOWS_BUDGET = 30_000  # CreateProcess 的命令行上限为 32767 个字符
+
+
+@dataclass(frozen=True)
+class PathResult:
+    """合并执行后单个路径的结果。ok 为 None 表示没有执行到（同批命令提前停止、超时或被取消）。"""
+
+    ok: bool | None
+    message: str = ""
+
+
+def argv_budget() -> int:
+    """一条命令的路径参数最多可占的字节数（扣除环境变量，留出余量）。"""
+    if sys.platform == "win32":
+        return _WINDOWS_BUDGET
+    try:
+        limit = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, OSError, ValueError):
+        limit = -1
+    if limit <= 0:
+        limit = 256 * 1024
+    environ = sum(len(k) + len(v) + 2 + 8 for k, v in os.environ.items())
+    return max(16 * 1024, min(limit // 2, 1024 * 1024) - environ)
+
+
+def _arg_cost(arg: str) -> int:
+    # 字符串本身、结尾的 \0 与 argv 中的指针
+    return len(arg.encode("utf-8", "surrogateescape")) + 1 + 8
+
+
+def chunk_paths(
+    paths: list[str],
+    prefix: list[str] | None = None,
+    groups: int = 1,
+    budget: int | None = None,
+) -> list[list[str]]:
+    """
+    把 paths 分成若干块，使 git <prefix> -- <块> 不超过命令行长度上限。
+    groups > 1 时至少均分为 groups 块（用于并行执行），否则尽量少分块。
+    """
+    if not paths:
+        return []
+    limit = (budget if budget is not None else argv_budget()) - sum(map(_arg_cost, ["git", *(prefix or []), "--"]))
+    count = max(1, min(groups, len(paths)))
+    size = math.ceil(len(paths) / count)
+    chunks: list[list[str]] = []
+    for start in range(0, len(paths), size):
+        chunk: list[str] = []
+        used = 0
+        for path in paths[start : start + size]:
+            cost = _arg_cost(path)
+            if chunk and used + cost > limit:
+                chunks.append(chunk)
+                chunk, used = [], 0
+            chunk.append(path)
+            used += cost
+        chunks.append(chunk)
+    return chunks
+
+
+def parallel_groups(paths: list[str], max_parallel: int, per_group: int = 16) -> int:
+    """
+    串行处理各路径的操作（如 submodule update --remote 逐个 fetch）合并后失去并行，
+    每块至少 per_group 个路径、最多 max_parallel 块，在少启动进程与保持并行之间折中。
+    """
+    return max(1, min(max_parallel, math.ceil(len(paths) / per_group)))
+
+
+def split_pathspec(args: list[str]) -> tuple[list[str], list[str]] | None:
+    """可合并的命令 [*前缀, "--", *路径]（至少两个路径）返回 (前缀, 路径)，其余返回 None。"""
+    if "--" not in args or operation_name(args) not in BATCHABLE_OPS:
+        return None
+    index = args.index("--")
+    paths = args[index + 1 :]
+    if len(paths) < 2:
+        return None
+    return args[:index], paths
+
+
+def attribute(
+    repo_root: str,
+    args: list[str],
+    paths: list[str],
+    stdout: str,
+    stderr: str,
+    returncode: int,
+) -> dict[str, PathResult]:
+    """
+    从一条多路径命令的输出中得出各路径的结果：
+    stderr 中以 error: / fatal: 等开头且引用了该路径的行记为失败；stdout 中引用了该路径的记为成功；
+    按顺序处理的操作中排在第一个失败路径之前的也记为成功；其余记为未执行。
+    命令失败却无法归属到任何路径时（如参数错误、超时），除 stdout 中报告成功的以外全部记为失败。
+    """
+    if returncode == 0:
+        return {path: PathResult(True) for path in paths}
+    wanted = set(paths)
+    root = Path(repo_root)
+
+    def mentioned(line: str) -> list[str]:
+        # 引用可能是绝对路径、子模块内的路径或其 git 目录（.git/modules/<路径>），都归到所属路径
+        found = []
+        for quoted in _QUOTED_RE.findall(line):
+            candidate = quoted.rstrip("/")
+            if os.path.isabs(candidate):
+                try:
+                    candidate = Path(candidate).relative_to(root).as_posix()
+                except ValueError:
+                    continue
+            candidate = candidate.removeprefix(".git/modules/")
+            while candidate and candidate not in wanted:
+                candidate = candidate.rpartition("/")[0]
+            if candidate:
+                found.append(candidate)
+        return found
+
+    failed: dict[str, str] = {}
+    for line in stderr.splitlines():
+        line = line.strip()
+        if line.startswith(_FAILURE_PREFIXES):
+            for path in mentioned(line):
+                failed.setdefault(path, line)
+    succeeded = {path for line in stdout.splitlines() for path in mentioned(line)}
+    if not failed:
+        errors = [line.strip() for line in stderr.splitlines() if line.strip()]
+        message = errors[-1] if errors else f"exit {returncode}"
+        return {path: PathResult(True) if path in succeeded else PathResult(False, message) for path in paths}
+    first_failed = min(failed) if operation_name(args) in _ORDERED_OPS else None
+    results: dict[str, PathResult] = {}
+    for path in paths:
+        if path in failed:
+            results[path] = PathResult(False, failed[path])
+        elif path in succeeded or (first_failed is not None and path < first_failed):
+            results[path] = PathResult(True)
+        else:
+            results[path] = PathResult(None)
+    return results
+
+
+def run_batched(
+    repo_root: str,
+    args: list[str],
+    run: Callable[[list[str]], tuple[str, str, int]],
+) -> tuple[str, str, int, dict[str, PathResult]]:
+    """
+    用 run(参数) 执行一条命令；可合并的多路径命令失败时归属各路径的结果，
+    并对没有执行到的路径去掉失败的路径后重新执行，直到全部有结果。超时或取消（返回码 -1）时不再重试。
+    返回 (合并的 stdout, 合并的 stderr, 第一个非 0 返回码或 0, 路径 -> 结果)；不可合并的命令结果为空字典。
+    """
+    split = split_pathspec(args)
+    if split is None:
+        return (*run(args), {})
+    prefix, remaining = split
+    outs: list[str] = []
+    errs: list[str] = []
+    code = 0
+    results: dict[str, PathResult] = {}
+    while remaining:
+        stdout, stderr, returncode = run([*prefix, "--", *remaining])
+        outs.append(stdout)
+        errs.append(stderr)
+        code = code or returncode
+        attributed = attribute(repo_root, prefix, remaining, stdout, stderr, returncode)
+        results.update(attributed)
+        remaining = [path for path in remaining if attributed[path].ok is None]
+        if returncode == -1:
+            break
+    return "".join(outs), "".join(errs), code, results
@@ -0,0 +1,334 @@
+"""
+常驻的 git cat-file --batch / --batch-check 进程池：同一仓库的对象查询复用一个进程，
+闲置的进程自动关闭。用于批量读取 commit 说明与日期等，无需每次查询都启动 git。
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from core.git_runner import parse_gitmodules_sections, resolve_git_dir
+from core.models import SubmoduleInfo
+from core.tracing import CATEGORY_GIT, get_tracer
+
+BATCH = "--batch"
+BATCH_CHECK = "--batch-check"
+
+
+class CatFileError(Exception):
+    """cat-file 进程无法启动或意外退出。"""
+
+
+class CatFile:
+    """
+    单个 git cat-file 进程。请求与应答严格一问一答，用锁串行化，可在多个线程间共享。
+    进程意外退出后下一次查询会自动重启一次；close() 之后不再重启，查询抛出 CatFileError。
+    """
+
+    def __init__(self, git_dir: str, mode: str = BATCH):
+        self.git_dir = git_dir
+        self.mode = mode
+        self.last_used = time.monotonic()
+        self.leases = 0  # 正在使用它的调用方个数，由 CatFilePool 在其锁内维护
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen | None = None
+        self._closed = False
+
+    def info(self, obj: str) -> tuple[str, str, int] | None:
+        """对象的 (sha, 类型, 大小)；对象不存在时返回 None。"""
+        with self._lock:
+            header = self._request(obj)
+            if header is None:
+                return None
+            sha, kind, size = header
+            if self.mode == BATCH:
+                self._read_body(size)
+            return sha, kind, size
+
+    def read(self, obj: str) -> tuple[str, bytes] | None:
+        """对象的 (类型, 内容)；对象不存在时返回 None。仅 --batch 模式可用。"""
+        if self.mode != BATCH:
+            raise CatFileError("--batch-check 进程不能读取对象内容")
+        with self._lock:
+            header = self._request(obj)
+            if header is None:
+                return None
+            _, kind, size = header
+            return kind, self._read_body(size)
+
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def close(self) -> None:
+        """关闭 stdin 让 git 自行退出，超时则强制结束。"""
+        with self._lock:
+            self._closed = True
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+            proc.wait()
+        finally:
+            proc.stdout.close()
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._closed:
+            raise CatFileError(f"git cat-file 进程已关闭（{self.git_dir}）")
+        if self._proc is None or self._proc.poll() is not None:
+            args = ["--git-dir", self.git_dir, "cat-file", self.mode]
+            # 常驻进程只记录启动耗时，单次查询不单独记录
+            with get_tracer().span(
+                "git cat-file (启动)", CATEGORY_GIT, command=" ".join(["git", *args])
+            ):
+                try:
+                    self._proc = subprocess.Popen(
+                        ["git", *args],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                    )
+                except OSError as e:
+                    raise CatFileError(f"无法启动 git cat-file: {e}") from e
+        return self._proc
+
+    def _request(self, obj: str) -> tuple[str, str, int] | None:
+        self.last_used = time.monotonic()
+        line = b""
+        for attempt in range(2):
+            proc = self._ensure_started()
+            try:
+                proc.stdin.write(obj.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = b""
+            if line:
+                break
+            # 进程已退出（如仓库被删除后重建），丢弃后重试一次
+            self._proc = None
+        if not line:
+            raise CatFileError(f"git cat-file 无应答（{self.git_dir}）")
+        parts = line.decode("utf-8", errors="replace").split()
+        # 不存在：<obj> missing；有歧义：<obj> ambiguous
+        if len(parts) != 3:
+            return None
+        return parts[0], parts[1], int(parts[2])
+
+    def _read_body(self, size: int) -> bytes:
+        data = self._proc.stdout.read(size + 1)  # 内容后跟一个换行
+        if len(data) != size + 1:
+            self._proc = None
+            raise CatFileError(f"git cat-file 输出被截断（{self.git_dir}）")
+        return data[:size]
+
+
+class CatFilePool:
+    """
+    以 (git 目录, 模式) 为键的 CatFile 进程池，经 get() 租用（with pool.get(git_dir) as cat: ...）。
+    - 最多保留 max_processes 个进程，超出时关闭最久未使用的；
+    - 闲置超过 idle_timeout 秒的进程由 close_idle() 关闭（每次取用时也会顺带检查）；
+    - 正被租用的进程不会被淘汰（多个 hub 的刷新线程共用一个池），归还后再按上限淘汰。
+    线程安全。
+    """
+
+    def __init__(self, max_processes: int = 32, idle_timeout: float = 60.0):
+        self.max_processes = max(1, max_processes)
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._procs: OrderedDict[tuple[str, str], CatFile] = OrderedDict()
+
+    @contextmanager
+    def get(self, git_dir: str | Path, mode: str = BATCH) -> Iterator[CatFile]:
+        """租用（必要时创建）该仓库的 cat-file 进程；with 块结束时归还。"""
+        key = (str(git_dir), mode)
+        with self._lock:
+            proc = self._procs.get(key)
+            if proc is None:
+                proc = self._procs[key] = CatFile(key[0], mode)
+            self._procs.move_to_end(key)
+            proc.last_used = time.monotonic()
+            proc.leases += 1
+            evicted = self._pop_excess() + self._pop_idle()
+        _close_all(evicted)
+        try:
+            yield proc
+        finally:
+            with self._lock:
+                proc.leases -= 1
+                proc.last_used = time.monotonic()
+                evicted = self._pop_excess()
+            _close_all(evicted)
+
+    def close_idle(self) -> int:
+        """
+        关闭闲置超时的进程，返回关闭的个数。
+        等待进程退出在后台线程中进行，可在界面线程中调用。
+        """
+        with self._lock:
+            idle = self._pop_idle()
+        if idle:
+            threading.Thread(target=_close_all, args=(idle,), name="cat-file-reaper", daemon=True).start()
+        return len(idle)
+
+    def size(self) -> int:
+        """当前保留的进程数。"""
+        with self._lock:
+            return len(self._procs)
+
+    def shutdown(self) -> None:
+        """关闭全部进程（包括正被租用的：之后的查询抛出 CatFileError，不会再启动进程）。"""
+        with self._lock:
+            procs = list(self._procs.values())
+            self._procs.clear()
+        for proc in procs:
+            proc.close()
+
+    def _pop_excess(self) -> list[CatFile]:
+        """超出上限时按最久未用的顺序取出未被租用的进程。"""
+        excess = len(self._procs) - self.max_processes
+        if excess <= 0:
+            return []
+        free = [key for key, proc in self._procs.items() if not proc.leases][:excess]
+        return [self._procs.pop(key) for key in free]
+
+    def _pop_idle(self) -> list[CatFile]:
+        deadline = time.monotonic() - self.idle_timeout
+        stale = [key for key, proc in self._procs.items() if not proc.leases and proc.last_used < deadline]
+        return [self._procs.pop(key) for key in stale]
+
+
+def _close_all(procs: list[CatFile]) -> None:
+    for proc in procs:
+        proc.close()
+
+
+@dataclass(frozen=True)
+class CommitSummary:
+    """commit 的首行说明与提交时间（Unix 时间戳）。"""
+
+    subject: str
+    date: int
+
+
+def parse_commit(body: bytes) -> CommitSummary:
+    """从 commit 对象内容中取出 committer 时间与说明首行。"""
+    header, _, message = body.partition(b"\n\n")
+    date = 0
+    for line in header.split(b"\n"):
+        if line.startswith(b"committer "):
+            # committer 名字 <邮箱> 时间戳 时区
+            fields = line.rsplit(b" ", 2)
+            if len(fields) == 3 and fields[1].isdigit():
+                date = int(fields[1])
+            break
+    subject = message.split(b"\n", 1)[0].strip()
+    return CommitSummary(subject.decode("utf-8", errors="replace"), date)
+
+
+class CommitSummaryCache:
+    """sha -> CommitSummary。commit 内容不可变，只按条数上限淘汰。线程安全。"""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CommitSummary] = OrderedDict()
+
+    def get(self, sha: str) -> CommitSummary | None:
+        with self._lock:
+            return self._entries.get(sha)
+
+    def put(self, sha: str, summary: CommitSummary) -> None:
+        with self._lock:
+            self._entries[sha] = summary
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _module_git_dirs(repo_root: str) -> dict[str, Path]:
+    """path -> 子模块 git 目录；未检出但 .git/modules 下仍有仓库的也包括在内。"""
+    root = Path(repo_root)
+    hub_git_dir = resolve_git_dir(root)
+    result: dict[str, Path] = {}
+    for name, path, _ in parse_gitmodules_sections(repo_root):
+        git_dir = resolve_git_dir(root / path)
+        if git_dir is None and hub_git_dir is not None:
+            candidate = hub_git_dir / "modules" / name
+            if candidate.is_dir():
+                git_dir = candidate
+        if git_dir is not None:
+            result[path] = git_dir
+    return result
+
+
+def describe_commits(
+    repo_root: str,
+    items: list[SubmoduleInfo],
+    pool: CatFilePool,
+    cache: CommitSummaryCache,
+    cached_only: bool = False,
+    max_workers: int | None = None,
+) -> list[SubmoduleInfo]:
+    """
+    为每个子模块的 commit 填充 commit_subject / commit_date。
+    每个子模块仓库复用池中的一个 cat-file 进程；已查询过的 sha 直接取缓存。
+    未命中缓存的按仓库分组，由有界线程池并行查询（首次刷新时每个仓库都要启动一个进程）。
+    cached_only 为 True 时只使用缓存，不查询 git。
+    """
+    result = list(items)
+    todo: dict[Path, list[int]] = {}  # 子模块 git 目录 -> 需查询的条目下标
+    git_dirs: dict[str, Path] | None = None
+    for i, info in enumerate(items):
+        sha = info.commit
+        if not sha:
+            continue
+        summary = cache.get(sha)
+        if summary is not None:
+            result[i] = replace(info, commit_subject=summary.subject, commit_date=summary.date)
+            continue
+        if cached_only:
+            continue
+        if git_dirs is None:
+            git_dirs = _module_git_dirs(repo_root)
+        git_dir = git_dirs.get(info.path)
+        if git_dir is not None:
+            todo.setdefault(git_dir, []).append(i)
+    if not todo:
+        return result
+
+    def read_group(git_dir: Path, indices: list[int]) -> None:
+        with pool.get(git_dir) as cat:
+            for i in indices:
+                sha = items[i].commit
+                summary = cache.get(sha)
+                if summary is None:
+                    try:
+                        obj = cat.read(sha)
+                    except CatFileError:
+                        obj = None
+                    if obj is None or obj[0] != "commit":
+                        continue
+                    summary = parse_commit(obj[1])
+                    cache.put(sha, summary)
+                result[i] = replace(items[i], commit_subject=summary.subject, commit_date=summary.date)
+
+    # 同时租用的进程数不超过池的上限，池不会因本次查询而超出上限
+    workers = max(1, min(len(todo), pool.max_processes, max_workers or (os.cpu_count() or 1) * 2))
+    if workers == 1:
+        for git_dir, indices in todo.items():
+            read_group(git_dir, indices)
+        return result
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(read_group, git_dir, indices) for git_dir, indices in todo.items()]:
+            future.result()
+    return result
@@ -0,0 +1,368 @@
+"""
+无界面命令行入口 hylreg_hub_manager-cli：在 CI、定时任务或无显示器的服务器上查看与操作子模块。
+只依赖 core，不导入 PyQt6。输出为 JSON Lines（每行一个 JSON 对象），边执行边输出。
+
+    hylreg_hub_manager-cli status [--scan] [--remote] [--describe] [路径 ...]
+    hylreg_hub_manager-cli init [--jobs N] [--depth N] [--blobless] [--progress] [路径 ...]
+    hylreg_hub_manager-cli update [--remote] [--jobs N] [--progress] [路径 ...]
+    hylreg_hub_manager-cli remove 路径 [路径 ...]
+
+按路径的操作合并为少数几条多路径 git 命令（core.batching），每个路径的结果输出为 result 事件。
+超时默认按操作类型（core.git_runner.DEFAULT_TIMEOUTS），可用 --timeout 统一设置，
+或用 --op-timeout "submodule update=600" 单独设置某类操作。超时或 Ctrl+C 时终止 git 的整个进程组。
+
+退出码：0 全部成功；1 有命令失败；2 参数或仓库错误；130 被中断。
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from core.git_runner import CancelToken, load_submodules, stream_git, timeout_for
+from core.gitmodules import load_gitmodules
+from core.models import SubmoduleInfo, SubmoduleStatus
+
+# status 是最常用的冷启动路径：只有 init / update / remove 用到的模块在各自的函数中导入
+if TYPE_CHECKING:
+    from core.batching import PathResult
+
+PROGRESS_INTERVAL = 0.25  # 每条命令的 progress 事件最短间隔（秒）
+
+
+class _Emitter:
+    """线程安全地逐行写出 JSON 对象并立即 flush，便于下游按行消费。"""
+
+    def __init__(self, stream=None, lines: bool = True):
+        self._stream = stream or sys.stdout
+        self._lock = threading.Lock()
+        self.lines = lines
+
+    def emit(self, event: str, **fields) -> None:
+        text = json.dumps({"event": event, **fields}, ensure_ascii=False)
+        with self._lock:
+            self._stream.write(text + "\n")
+            self._stream.flush()
+
+
+def _submodule_record(info: SubmoduleInfo) -> dict:
+    record = asdict(info)
+    record["status"] = info.status.value
+    return record
+
+
+def _select(items: list[SubmoduleInfo], paths: list[str]) -> tuple[list[SubmoduleInfo], list[str]]:
+    """按命令行给出的路径筛选子模块，返回 (选中的, 不存在的路径)。"""
+    if not paths:
+        return items, []
+    wanted = [p.rstrip("/") for p in paths]
+    by_path = {info.path: info for info in items}
+    return [by_path[p] for p in wanted if p in by_path], [p for p in wanted if p not in by_path]
+
+
+def _timeout(opts: argparse.Namespace, args: list[str]) -> int:
+    """一条命令的超时：--timeout 优先，其次 --op-timeout 与默认值。"""
+    return opts.timeout or timeout_for(args, opts.op_timeouts)
+
+
+def _run_one(
+    repo: str,
+    args: list[str],
+    path: str | None,
+    out: _Emitter,
+    timeout: int,
+    cancel: CancelToken | None = None,
+) -> tuple[bool, dict[str, "PathResult"]]:
+    """执行一条命令；多路径命令另为每个路径输出 result 事件。返回 (是否成功, 路径 -> 结果)。"""
+    from core.batching import run_batched
+
+    command = "git " + " ".join(args)
+    out.emit("start", path=path, command=command)
+
+    def on_line(line: str, is_stderr: bool) -> None:
+        if out.lines and line:
+            out.emit("line", path=path, stream="stderr" if is_stderr else "stdout", text=line)
+
+    start = time.perf_counter()
+    on_progress, flush_progress = _progress_reporter(repo, args, path, out) if "--progress" in args else (None, None)
+    _, stderr, code, results = run_batched(
+        repo,
+        args,
+        lambda a: stream_git(repo, a, on_line, timeout=timeout, cancel=cancel, on_progress=on_progress),
+    )
+    if flush_progress is not None:
+        flush_progress()
+    fields = {"path": path, "command": command, "exit_code": code, "elapsed": round(time.perf_counter() - start, 3)}
+    if code != 0 and not out.lines:
+        fields["stderr"] = stderr.strip()
+    out.emit("end", **fields)
+    for submodule, result in results.items():
+        out.emit("result", path=submodule, ok=result.ok, message=result.message)
+    return code == 0, results
+
+
+def _progress_reporter(repo: str, args: list[str], path: str | None, out: _Emitter):
+    """
+    解析 --progress 输出，每条命令最多每 PROGRESS_INTERVAL 秒输出一次变化了的子模块进度。
+    返回 (on_progress, flush)；命令结束后调用 flush 输出最后的状态。
+    """
+    from core.progress import ProgressTracker, expected_paths
+
+    tracker = ProgressTracker(repo, expected_paths(args))
+    last = {"at": 0.0, "version": 0}
+    reported: dict[str, tuple[str, int, bool]] = {}
+
+    def on_progress(segment: str) -> None:
+        tracker.feed(segment)
+        if time.monotonic() - last["at"] >= PROGRESS_INTERVAL:
+            flush()
+
+    def flush() -> None:
+        if tracker.version == last["version"]:
+            return
+        last["at"], last["version"] = time.monotonic(), tracker.version
+        overall, items = tracker.snapshot()
+        for item in items:
+            state = (item.phase, item.percent, item.done)
+            if reported.get(item.path) == state:
+                continue
+            reported[item.path] = state
+            out.emit(
+                "progress",
+                path=path,
+                submodule=item.path,
+                phase=item.phase,
+                percent=item.percent,
+                done=item.done,
+                overall=round(overall, 3),
+            )
+
+    return on_progress, flush
+
+
+def _run_parallel(
+    repo: str,
+    commands: list[tuple[str | None, list[str]]],
+    out: _Emitter,
+    jobs: int,
+    timeout: int,
+) -> int:
+    """并行执行 (路径, git 参数) 列表，输出 summary，返回失败数（多路径命令按路径计）。"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    total = failed = 0
+    cancel = CancelToken()
+    if commands:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(commands)))) as pool:
+            futures = [
+                pool.submit(_run_one, repo, args, path, out, timeout, cancel)
+                for path, args in commands
+            ]
+            try:
+                for future in futures:
+                    ok, results = future.result()
+                    total += len(results) or 1
+                    failed += sum(1 for r in results.values() if not r.ok) if results else int(not ok)
+            except KeyboardInterrupt:
+                # 终止进行中的进程组，尚未开始的命令直接返回，线程池才能尽快退出
+                cancel.cancel()
+                raise
+    out.emit("summary", total=total, ok=total - failed, failed=failed)
+    return failed
+
+
+def _batched_commands(prefix: list[str], paths: list[str], jobs: int) -> list[tuple[str | None, list[str]]]:
+    """把按路径的同一操作合并为少数几条多路径命令（只有一个路径时仍按路径标注）。"""
+    from core.batching import chunk_paths, parallel_groups
+
+    chunks = chunk_paths(paths, prefix, parallel_groups(paths, jobs))
+    return [(chunk[0] if len(chunk) == 1 else None, [*prefix, "--", *chunk]) for chunk in chunks]
+
+
+def _cmd_status(repo: str, opts: argparse.Namespace, out: _Emitter) -> int:
+    for error in load_gitmodules(repo).errors:
+        out.emit("warning", file=".gitmodules", line=error.line, message=error.message)
+    items = load_submodules(repo)
+    items, missing = _select(items, opts.paths)
+    for path in missing:
+        out.emit("error", path=path, message="不是已登记的子模块")
+    if opts.scan:
+        from core.dirty_scan import scan_dirty
+
+        items = scan_dirty(repo, items, max_workers=opts.jobs)
+    if opts.describe:
+        from core.cat_file import CatFilePool, CommitSummaryCache, describe_commits
+
+        pool = CatFilePool()
+        try:
+            items = describe_commits(repo, items, pool, CommitSummaryCache(), max_workers=opts.jobs)
+        finally:
+            pool.shutdown()
+    errors: dict[str, str] = {}
+    if opts.remote:
+        from core.remote_check import RemoteCheckCache, check_remotes
+
+        items, errors = check_remotes(repo, items, RemoteCheckCache(), max_workers=opts.jobs)
+    for info in items:
+        record = _submodule_record(info)
+        if info.path in errors:
+            record["remote_error"] = errors[info.path]
+        out.emit("submodule", **record)
+    out.emit("summary", total=len(items))
+    return 1 if missing else 0
+
+
+def _cmd_init(repo: str, opts: argparse.Namespace, out: _Emitter) -> int:
+    from core.init_options import InitOptions
+
+    items, missing = _select(load_submodules(repo), opts.paths)
+    for path in missing:
+        out.emit("error", path=path, message="不是已登记的子模块")
+    if not opts.paths:
+        items = [i for i in items if i.status == SubmoduleStatus.UNINITIALIZED]
+    paths = [info.path for info in items]
+    if not paths:
+        out.emit("summary", total=0, ok=0, failed=0)
+        return 1 if missing else 0
+    # submodule init 写 hub 的 .git/config，先串行执行一次；clone 与检出再按路径并行
+    init = ["submodule", "init", "--", *paths]
+    if not _run_one(repo, init, None, out, _timeout(opts, init))[0]:
+        out.emit("summary", total=len(paths), ok=0, failed=len(paths))
+        return 1
+    update = ["submodule", "update", "--recursive", *(["--progress"] if opts.progress else [])]
+    # 并行由线程池完成；浅克隆与部分克隆只用于尚未初始化的子模块
+    fast = InitOptions(depth=opts.depth, blobless=opts.blobless, recommend_shallow=not opts.no_recommend_shallow)
+    fresh = {info.path for info in items if info.status == SubmoduleStatus.UNINITIALIZED}
+    commands = [
+        *_batched_commands([*update, *fast.clone_args()], [p for p in paths if p in fresh], opts.jobs),
+        *_batched_commands(update, [p for p in paths if p not in fresh], opts.jobs),
+    ]
+    failed = _run_parallel(repo, commands, out, opts.jobs, _timeout(opts, ["submodule", "update"]))
+    return 1 if failed or missing else 0
+
+
+def _cmd_update(repo: str, opts: argparse.Namespace, out: _Emitter) -> int:
+    items, missing = _select(load_submodules(repo), opts.paths)
+    for path in missing:
+        out.emit("error", path=path, message="不是已登记的子模块")
+    items = [i for i in items if i.status != SubmoduleStatus.UNINITIALIZED]
+    base = ["submodule", "update", "--remote"] if opts.remote else ["submodule", "update", "--recursive"]
+    if opts.progress:
+        base.append("--progress")
+    commands = _batched_commands(base, [info.path for info in items], opts.jobs)
+    failed = _run_parallel(repo, commands, out, opts.jobs, _timeout(opts, base))
+    return 1 if failed or missing else 0
+
+
+def _cmd_remove(repo: str, opts: argparse.Namespace, out: _Emitter) -> int:
+    from core.batching import PathResult, chunk_paths
+
+    items, missing = _select(load_submodules(repo), opts.paths)
+    for path in missing:
+        out.emit("error", path=path, message="不是已登记的子模块")
+    paths = [info.path for info in items]
+    if not paths:
+        out.emit("summary", total=0, ok=0, failed=0)
+        return 1 if missing else 0
+    # deinit 与 rm 都要写 hub 的 config / index，每块路径一条命令、依次执行，避免锁冲突；
+    # rm 只作用于 deinit 成功的路径
+    removed = 0
+    for chunk in chunk_paths(paths, ["submodule", "deinit", "-f"]):
+        deinit = ["submodule", "deinit", "-f", "--", *chunk]
+        ok, results = _run_one(repo, deinit, None, out, _timeout(opts, deinit))
+        done = chunk if ok else [p for p in chunk if results.get(p, PathResult(False)).ok]
+        if not done:
+            continue
+        rm = ["rm", "-f", "--", *done]
+        ok, results = _run_one(repo, rm, None, out, _timeout(opts, rm))
+        removed += len(done) if ok else sum(1 for p in done if results.get(p, PathResult(False)).ok)
+    out.emit("summary", total=len(paths), ok=removed, failed=len(paths) - removed)
+    return 0 if removed == len(paths) and not missing else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="hylreg_hub_manager-cli",
+        description="hylreg hub 子模块命令行工具（JSON Lines 输出）",
+    )
+    parser.add_argument("--repo", "-C", default=".", help="hub 仓库根目录，默认当前目录")
+    # 各子命令共用的选项，写在子命令之后
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 4, help="并行执行的 git 进程数")
+    common.add_argument("--timeout", type=int, default=None, help="所有 git 命令的超时秒数（默认按操作类型）")
+    common.add_argument(
+        "--op-timeout",
+        action="append",
+        default=[],
+        metavar="操作=秒数",
+        help='某类操作的超时，如 "submodule update=600"、"fetch=120"，可重复',
+    )
+    common.add_argument("--no-lines", action="store_true", help="不输出 git 的逐行输出，只输出开始/结束事件")
+    common.add_argument(
+        "--progress",
+        action="store_true",
+        help="clone/fetch 时输出 progress 事件（每条命令每秒最多约 4 次）",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    status = sub.add_parser("status", parents=[common], help="列出子模块状态")
+    status.add_argument("--scan", action="store_true", help="同时扫描工作区的未提交修改")
+    status.add_argument("--remote", action="store_true", help="抓取远端并统计领先/落后提交数")
+    status.add_argument("--describe", action="store_true", help="读取 commit 的说明与日期")
+    status.add_argument("paths", nargs="*")
+
+    init = sub.add_parser("init", parents=[common], help="初始化子模块（默认全部未初始化的）")
+    init.add_argument("--depth", type=int, default=0, help="浅克隆：只取最近 N 个提交")
+    init.add_argument("--blobless", action="store_true", help="部分克隆（--filter=blob:none）")
+    init.add_argument(
+        "--no-recommend-shallow",
+        action="store_true",
+        help="忽略 .gitmodules 中的 shallow = true",
+    )
+    init.add_argument("paths", nargs="*")
+
+    update = sub.add_parser("update", parents=[common], help="更新子模块到记录版本，或 --remote 更新到远端最新")
+    update.add_argument("--remote", action="store_true")
+    update.add_argument("paths", nargs="*")
+
+    remove = sub.add_parser("remove", parents=[common], help="删除子模块（deinit + git rm）")
+    remove.add_argument("paths", nargs="+")
+    return parser
+
+
+_COMMANDS = {
+    "status": _cmd_status,
+    "init": _cmd_init,
+    "update": _cmd_update,
+    "remove": _cmd_remove,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    opts = parser.parse_args(argv)
+    opts.op_timeouts = {}
+    for item in opts.op_timeout:
+        op, sep, seconds = item.rpartition("=")
+        if not sep or not op.strip() or not seconds.strip().isdigit():
+            parser.error(f"无效的 --op-timeout: {item}")
+        opts.op_timeouts[" ".join(op.split())] = int(seconds)
+    out = _Emitter(lines=not opts.no_lines)
+    repo = str(Path(opts.repo).resolve())
+    if not (Path(repo) / ".git").exists():
+        out.emit("error", message=f"不是 git 仓库: {repo}")
+        return 2
+    try:
+        return _COMMANDS[opts.command](repo, opts, out)
+    except KeyboardInterrupt:
+        out.emit("error", message="已中断")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
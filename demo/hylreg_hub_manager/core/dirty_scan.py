@@ -0,0 +1,154 @@
+"""并行扫描已检出子模块的工作区状态（未提交修改、是否偏离记录的 commit）。"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from core.git_runner import resolve_git_dir, run_git
+from core.models import SubmoduleInfo, SubmoduleStatus
+from core.status_reader import StatusReaderError, read_gitlinks
+
+# 只读扫描：不为刷新 index 的 stat 信息而加锁写 index，避免与用户自己的 git 命令争用
+_SCAN_ENV = {"GIT_OPTIONAL_LOCKS": "0"}
+
+_SCANNABLE = {
+    SubmoduleStatus.INITIALIZED,
+    SubmoduleStatus.MODIFIED,
+    SubmoduleStatus.AHEAD,
+    SubmoduleStatus.DETACHED,
+}
+
+
+@dataclass(frozen=True)
+class DirtyResult:
+    """单个子模块的扫描结果。"""
+
+    changed_files: int
+    diverged: bool  # HEAD 与记录的 commit 不同且不是其后代
+
+
+class DirtyScanCache:
+    """
+    扫描结果缓存，以子模块工作区的绝对路径区分条目；键为子模块 index 的 (mtime_ns, size)、
+    工作区顶层目录的 mtime、当前 HEAD 与记录的 commit，都不变时直接复用上次结果。线程安全。
+    顶层目录的 mtime 能发现顶层文件的增删与以“写临时文件再重命名”方式保存的编辑，
+    子目录内的原地修改仍需 F5 手动刷新。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple, DirtyResult]] = {}
+
+    def get(self, worktree: str, key: tuple) -> DirtyResult | None:
+        with self._lock:
+            entry = self._entries.get(worktree)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def put(self, worktree: str, key: tuple, result: DirtyResult) -> None:
+        with self._lock:
+            self._entries[worktree] = (key, result)
+
+    def clear(self, repo_root: str | None = None) -> None:
+        """清空缓存；给出 repo_root 时只清除该仓库下的子模块。"""
+        with self._lock:
+            if repo_root is None:
+                self._entries.clear()
+                return
+            prefix = os.path.join(repo_root, "")
+            for worktree in [w for w in self._entries if w.startswith(prefix)]:
+                del self._entries[worktree]
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _scan_key(worktree: Path, git_dir: Path, head: str, recorded: str) -> tuple:
+    return _stamp(git_dir / "index"), _stamp(worktree), head, recorded
+
+
+def _scan_one(worktree: Path, info: SubmoduleInfo, recorded: str) -> DirtyResult:
+    stdout, _, code = run_git(str(worktree), ["status", "--porcelain"], timeout=60, env=_SCAN_ENV)
+    changed = len([line for line in stdout.splitlines() if line.strip()]) if code == 0 else 0
+    diverged = False
+    if info.raw_prefix == "+" and recorded:
+        _, _, code = run_git(
+            str(worktree),
+            ["merge-base", "--is-ancestor", recorded, "HEAD"],
+            timeout=60,
+            env=_SCAN_ENV,
+        )
+        # 1 表示不是祖先；其他非 0（如记录的 commit 尚未抓取）同样视为偏离
+        diverged = code != 0
+    return DirtyResult(changed, diverged)
+
+
+def _apply(info: SubmoduleInfo, result: DirtyResult) -> SubmoduleInfo:
+    status = info.status
+    if info.raw_prefix == "+":
+        status = SubmoduleStatus.DETACHED if result.diverged else SubmoduleStatus.AHEAD
+    elif status in (SubmoduleStatus.INITIALIZED, SubmoduleStatus.MODIFIED):
+        status = SubmoduleStatus.MODIFIED if result.changed_files else SubmoduleStatus.INITIALIZED
+    return replace(info, status=status, changed_files=result.changed_files)
+
+
+def scan_dirty(
+    repo_root: str,
+    items: list[SubmoduleInfo],
+    cache: DirtyScanCache | None = None,
+    max_workers: int | None = None,
+    cached_only: bool = False,
+) -> list[SubmoduleInfo]:
+    """
+    对已检出的子模块执行 git status --porcelain（有界线程池并行，每个线程一个 git 进程），
+    返回填充了 changed_files 与 MODIFIED / AHEAD / DETACHED 状态的新列表。
+    - cache: 子模块 index、工作区顶层目录、HEAD 与记录 commit 都未变化时复用结果；
+    - cached_only: 只应用缓存中已有的结果，不启动任何进程（用于先行显示）。
+    未初始化或无法扫描的子模块原样返回。
+    """
+    root = Path(repo_root)
+    try:
+        git_dir = resolve_git_dir(root)
+        recorded_map = read_gitlinks(git_dir / "index") if git_dir else {}
+    except StatusReaderError:
+        recorded_map = {}
+
+    result = list(items)
+    todo: list[tuple[int, Path, str, tuple]] = []  # (下标, 工作区, 记录的 commit, 缓存键)
+    for i, info in enumerate(items):
+        if info.status not in _SCANNABLE:
+            continue
+        worktree = root / info.path
+        sub_git_dir = resolve_git_dir(worktree)
+        if sub_git_dir is None:
+            continue
+        recorded = recorded_map.get(info.path, ("", 0))[0]
+        key = _scan_key(worktree, sub_git_dir, info.commit, recorded)
+        hit = cache.get(str(worktree), key) if cache else None
+        if hit is not None:
+            result[i] = _apply(info, hit)
+        elif not cached_only:
+            todo.append((i, worktree, recorded, key))
+
+    if not todo:
+        return result
+    workers = max(1, min(len(todo), max_workers or (os.cpu_count() or 1) * 2))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (i, worktree, key, pool.submit(_scan_one, worktree, items[i], recorded))
+            for i, worktree, recorded, key in todo
+        ]
+        for i, worktree, key, future in futures:
+            scanned = future.result()
+            if cache is not None:
+                cache.put(str(worktree), key, scanned)
+            result[i] = _apply(items[i], scanned)
+    return result
@@ -1,12 +1,152 @@
 """封装 subprocess 调用 git，解析 .gitmodules 与 git submodule status。"""
 
-import configparser
 import os
 import re
+import signal
 import subprocess
+import threading
+import time
+from collections.abc import Callable
 from pathlib import Path
 
+from core.gitmodules import load_gitmodules
 from core.models import SubmoduleInfo, SubmoduleStatus
+from core.tracing import CATEGORY_GIT, get_tracer, git_span_name
+
+# 各类操作的默认超时（秒），键为 operation_name() 的结果；未列出的操作用 DEFAULT_TIMEOUT
+DEFAULT_TIMEOUTS: dict[str, int] = {
+    "submodule update": 1800,
+    "submodule add": 1800,
+    "clone": 1800,
+    "fetch": 300,
+    "submodule init": 60,
+    "submodule deinit": 120,
+    "submodule status": 60,
+    "rm": 120,
+}
+DEFAULT_TIMEOUT = 120
+CANCELLED_MESSAGE = "已取消"
+KILL_GRACE_SECONDS = 2.0  # SIGTERM 之后等待多久再 SIGKILL
+# 终止后最多等多久读完输出：组中残留的子进程可能仍持有管道，SIGKILL 之后应已关闭
+DRAIN_SECONDS = KILL_GRACE_SECONDS + 1.0
+
+
+def operation_name(args: list[str]) -> str:
+    """操作类型：子命令（submodule 再加一级），如 "submodule update"、"fetch"。"""
+    return git_span_name(args)[len("git "):]
+
+
+def timeout_for(args: list[str], overrides: dict[str, int] | None = None) -> int:
+    """按操作类型取超时秒数：overrides 优先，其次 DEFAULT_TIMEOUTS。"""
+    op = operation_name(args)
+    if overrides and op in overrides:
+        return overrides[op]
+    return DEFAULT_TIMEOUTS.get(op, DEFAULT_TIMEOUT)
+
+
+class CancelToken:
+    """
+    取消一个或一组 git 调用：cancel() 终止已登记的进程所在的整个进程组
+    （含 --recursive 等派生的子进程），之后再用它启动的调用直接返回失败。线程安全。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._procs: set[subprocess.Popen] = set()
+        self._timers: dict[subprocess.Popen, threading.Timer] = {}
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            procs = list(self._procs)
+        for proc in procs:
+            timer = kill_process_tree(proc)
+            if timer is not None:
+                with self._lock:
+                    if proc in self._procs:
+                        self._timers[proc] = timer
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def _attach(self, proc: subprocess.Popen) -> bool:
+        """登记进程；已取消时返回 False（调用方应立即终止它）。"""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._procs.add(proc)
+            return True
+
+    def _detach(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+            timer = self._timers.pop(proc, None)
+        if timer is not None and proc.poll() is not None:
+            _cancel_timer(timer, proc)
+
+
+def _group_kwargs() -> dict:
+    """让 git 成为新进程组的组长，以便连同其子进程一起终止。"""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _signal_group(proc: subprocess.Popen, sig: int) -> None:
+    # 组长往往最先退出，组内的 clone / fetch 等子进程仍需收到信号；
+    # 组内还有进程时该进程组号不会被复用，组已空时 killpg 报 ProcessLookupError
+    try:
+        os.killpg(proc.pid, sig)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _group_alive(proc: subprocess.Popen) -> bool:
+    """proc 的进程组中是否还有进程（组长退出后仍在运行的子进程也算）。"""
+    try:
+        os.killpg(proc.pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def kill_process_tree(proc: subprocess.Popen, grace: float = KILL_GRACE_SECONDS) -> threading.Timer | None:
+    """
+    终止 proc（由 _group_kwargs 启动）及其全部子进程：先 SIGTERM，让 git 清理锁文件，
+    grace 秒后对仍存活的进程组发 SIGKILL。不等待进程退出，可在界面线程中调用。
+    返回补发 SIGKILL 的定时器（Windows 上为 None），调用方等到 proc 退出后交给 _cancel_timer。
+    """
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+        return None
+    _signal_group(proc, signal.SIGTERM)
+    timer = threading.Timer(grace, _signal_group, (proc, signal.SIGKILL))
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def _cancel_timer(timer: threading.Timer | None, proc: subprocess.Popen) -> None:
+    """组长已退出后调用：整个进程组都已退出时才取消 SIGKILL，否则让它照常终止残留的子进程。"""
+    if timer is not None and not _group_alive(proc):
+        timer.cancel()
+
+
+def _drain(proc: subprocess.Popen) -> tuple[str, str]:
+    """终止后收集剩余输出，最多等 DRAIN_SECONDS（残留的子进程可能仍持有管道）。"""
+    try:
+        return proc.communicate(timeout=DRAIN_SECONDS)
+    except subprocess.TimeoutExpired:
+        return "", ""
+
+
+def _join_readers(readers: list[threading.Thread], killed: bool) -> None:
+    deadline = time.monotonic() + DRAIN_SECONDS if killed else None
+    for reader in readers:
+        reader.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
 
 
 def _parse_status_prefix(prefix: str) -> SubmoduleStatus:
@@ -27,50 +167,54 @@ def parse_gitmodules(repo_root: str) -> list[tuple[str, str]]:
     解析 .gitmodules，返回 [(path, url), ...]。
     repo_root: hub 仓库根目录。
     """
-    path = Path(repo_root) / ".gitmodules"
-    if not path.exists():
-        return []
+    return [(path, url) for _, path, url in parse_gitmodules_sections(repo_root)]
 
-    parser = configparser.ConfigParser()
-    try:
-        parser.read(path, encoding="utf-8")
-    except Exception:
-        return []
 
-    result: list[tuple[str, str]] = []
-    for section in parser.sections():
-        if not section.startswith('submodule "'):
-            continue
-        # section 形如: submodule "repos/xxx"
-        path_key = "path"
-        url_key = "url"
-        if parser.has_option(section, path_key) and parser.has_option(section, url_key):
-            sub_path = parser.get(section, path_key).strip()
-            url = parser.get(section, url_key).strip()
-            result.append((sub_path, url))
-    return result
+def parse_gitmodules_sections(repo_root: str) -> list[tuple[str, str, str]]:
+    """
+    解析 .gitmodules，返回 [(name, path, url), ...]。
+    name 为 [submodule "<name>"] 中的名称，对应 .git/modules/<name>。
+    """
+    return [(e.name, e.path, e.url) for e in load_gitmodules(repo_root).entries]
+
+
+def gitmodules_branches(repo_root: str) -> dict[str, str]:
+    """返回 .gitmodules 中设置了 branch 的子模块：path -> branch。"""
+    return {e.path: e.branch for e in load_gitmodules(repo_root).entries if e.branch}
 
 
-def run_git_submodule_status(repo_root: str) -> tuple[str, str, int]:
+def resolve_git_dir(worktree: str | Path) -> Path | None:
     """
-    在 repo_root 下执行 git submodule status。
-    返回 (stdout, stderr, returncode)。
+    返回工作区对应的 git 目录：.git 为目录时即其本身；
+    为文件（子模块、worktree）时解析其中的 "gitdir: <路径>"。找不到时返回 None。
     """
+    dot_git = Path(worktree) / ".git"
+    if dot_git.is_dir():
+        return dot_git
     try:
-        proc = subprocess.run(
-            ["git", "submodule", "status"],
-            cwd=repo_root,
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        return (
-            proc.stdout or "",
-            proc.stderr or "",
-            proc.returncode or 0,
-        )
-    except (FileNotFoundError, subprocess.TimeoutExpired, Exception) as e:
-        return "", str(e), -1
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:"):].strip())
+    if not git_dir.is_absolute():
+        git_dir = dot_git.parent / git_dir
+    return git_dir if git_dir.is_dir() else None
+
+
+def run_git_submodule_status(
+    repo_root: str,
+    paths: list[str] | None = None,
+) -> tuple[str, str, int]:
+    """
+    在 repo_root 下执行 git submodule status；给定 paths 时只查询这些子模块。
+    返回 (stdout, stderr, returncode)。
+    """
+    args = ["submodule", "status"]
+    if paths:
+        args += ["--", *paths]
+    return run_git(repo_root, args, timeout=timeout_for(args))
 
 
 def parse_submodule_status(stdout: str) -> dict[str, tuple[str, str]]:
@@ -99,17 +243,39 @@ def parse_submodule_status(stdout: str) -> dict[str, tuple[str, str]]:
     return result
 
 
-def load_submodules(repo_root: str) -> list[SubmoduleInfo]:
+def load_submodules(
+    repo_root: str,
+    paths: list[str] | None = None,
+    native: bool = True,
+) -> list[SubmoduleInfo]:
     """
-    加载子模块列表：合并 .gitmodules 与 git submodule status。
+    加载子模块列表：合并 .gitmodules 与子模块状态。
     repo_root: hub 仓库根目录。
+    paths: 只重新计算这些子模块（增量刷新）；None 表示全部。
+    native: 优先用 core.status_reader 直接读取 index 与 HEAD（不启动进程），
+        读取不了的仓库布局回退到 git submodule status；False 时总是调用 git。
     """
+    from core.status_reader import StatusReaderError, read_submodule_status
+
     if not repo_root or not (Path(repo_root) / ".git").exists():
         return []
 
     modules = parse_gitmodules(repo_root)
-    stdout, _, code = run_git_submodule_status(repo_root)
-    status_map = parse_submodule_status(stdout) if code == 0 else {}
+    if paths is not None:
+        wanted = set(paths)
+        modules = [(path, url) for path, url in modules if path in wanted]
+        if not modules:
+            return []
+    query = [path for path, _ in modules] if paths is not None else None
+    status_map: dict[str, tuple[str, str]] | None = None
+    if native:
+        try:
+            status_map = read_submodule_status(repo_root, query)
+        except StatusReaderError:
+            status_map = None
+    if status_map is None:
+        stdout, _, code = run_git_submodule_status(repo_root, query)
+        status_map = parse_submodule_status(stdout) if code == 0 else {}
 
     result: list[SubmoduleInfo] = []
     for path, url in modules:
@@ -134,24 +300,213 @@ def load_submodules(repo_root: str) -> list[SubmoduleInfo]:
 def run_git(
     repo_root: str,
     args: list[str],
-    timeout: int = 120,
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    cancel: CancelToken | None = None,
 ) -> tuple[str, str, int]:
     """
-    在 repo_root 下执行 git <args>。
+    在 repo_root 下执行 git <args>；env 中的变量会覆盖当前环境。
+    超时或经 cancel 取消时终止整个进程组，返回码为 -1。
     返回 (stdout, stderr, returncode)。
     """
+    with _git_span(repo_root, args) as span:
+        result = _run_git(repo_root, args, timeout, env, cancel)
+        _finish_span(span, result)
+        return result
+
+
+def _run_git(
+    repo_root: str,
+    args: list[str],
+    timeout: int,
+    env: dict[str, str] | None,
+    cancel: CancelToken | None,
+) -> tuple[str, str, int]:
+    if cancel is not None and cancel.is_cancelled():
+        return "", CANCELLED_MESSAGE, -1
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             ["git", *args],
             cwd=repo_root,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=timeout,
+            env={**os.environ, **env} if env else None,
+            **_group_kwargs(),
         )
-        return (
-            proc.stdout or "",
-            proc.stderr or "",
-            proc.returncode or 0,
+    except (FileNotFoundError, Exception) as e:
+        return "", str(e), -1
+    if cancel is not None and not cancel._attach(proc):
+        timer = kill_process_tree(proc)
+        _drain(proc)
+        _cancel_timer(timer, proc)
+        return "", CANCELLED_MESSAGE, -1
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        timer = kill_process_tree(proc)
+        stdout, stderr = _drain(proc)
+        _cancel_timer(timer, proc)
+        return stdout or "", (stderr or "") + str(e), -1
+    except BaseException:
+        kill_process_tree(proc)
+        raise
+    finally:
+        if cancel is not None:
+            cancel._detach(proc)
+    if cancel is not None and cancel.is_cancelled():
+        return stdout or "", (stderr or "") + CANCELLED_MESSAGE, -1
+    return stdout or "", stderr or "", proc.returncode or 0
+
+
+def _git_span(repo_root: str, args: list[str]):
+    """一次 git 调用的追踪 span：汇总名为子命令，args 中记录完整命令与工作目录。"""
+    return get_tracer().span(
+        git_span_name(args),
+        CATEGORY_GIT,
+        command=" ".join(["git", *args]),
+        cwd=repo_root,
+    )
+
+
+def _finish_span(span, result: tuple[str, str, int]) -> None:
+    stdout, stderr, code = result
+    span.args["exit_code"] = code
+    span.args["out_bytes"] = len(stdout) + len(stderr)
+
+
+def _pump_lines(
+    pipe,
+    is_stderr: bool,
+    sink: list[str],
+    on_line: Callable[[str, bool], None],
+) -> None:
+    """逐行读取管道，收集到 sink 并回调 on_line(行, 是否 stderr)。"""
+    for raw in iter(pipe.readline, b""):
+        line = raw.decode("utf-8", errors="replace")
+        sink.append(line)
+        on_line(line.rstrip("\r\n"), is_stderr)
+    pipe.close()
+
+
+_EOL_RE = re.compile(rb"(\r\n|\r|\n)")
+
+
+def _pump_progress(
+    pipe,
+    sink: list[str],
+    on_line: Callable[[str, bool], None],
+    on_progress: Callable[[str], None],
+) -> None:
+    """
+    读取 git --progress 的 stderr：以 \r 结尾的进度刷新只交给 on_progress，
+    不进入 sink 与 on_line；完整的行同时交给三者（进度解析需要 "Cloning into" 等上下文）。
+    """
+    pending = b""
+    for chunk in iter(lambda: pipe.read1(65536), b""):
+        pending += chunk
+        parts = _EOL_RE.split(pending)
+        pending = parts.pop()
+        if parts and parts[-1] == b"\r" and not pending:
+            # \r\n 可能被分在两次读取中
+            pending = parts.pop(-2) + parts.pop()
+        for i in range(0, len(parts), 2):
+            line = parts[i].decode("utf-8", errors="replace")
+            if parts[i + 1] == b"\r":
+                on_progress(line)
+                continue
+            sink.append(line + "\n")
+            on_line(line, True)
+            on_progress(line)
+    if pending:
+        line = pending.decode("utf-8", errors="replace").rstrip("\r")
+        sink.append(line)
+        on_line(line, True)
+        on_progress(line)
+    pipe.close()
+
+
+def stream_git(
+    repo_root: str,
+    args: list[str],
+    on_line: Callable[[str, bool], None],
+    timeout: int = DEFAULT_TIMEOUT,
+    cancel: CancelToken | None = None,
+    on_progress: Callable[[str], None] | None = None,
+) -> tuple[str, str, int]:
+    """
+    在 repo_root 下执行 git <args>，stdout/stderr 每读到一行即回调 on_line(行, 是否 stderr)。
+    给定 on_progress 时（配合 --progress），stderr 中以 \r 刷新的进度只回调 on_progress，
+    不逐次进入 on_line 与返回的 stderr；完整的行也会交给 on_progress。
+    回调在读取线程中调用，需自行保证线程安全。
+    超时或经 cancel 取消时终止整个进程组，返回码为 -1。
+    返回完整的 (stdout, stderr, returncode)，与 run_git 一致。
+    """
+    with _git_span(repo_root, args) as span:
+        result = _stream_git(repo_root, args, on_line, timeout, cancel, on_progress)
+        _finish_span(span, result)
+        return result
+
+
+def _stream_git(
+    repo_root: str,
+    args: list[str],
+    on_line: Callable[[str, bool], None],
+    timeout: int,
+    cancel: CancelToken | None,
+    on_progress: Callable[[str], None] | None = None,
+) -> tuple[str, str, int]:
+    if cancel is not None and cancel.is_cancelled():
+        return "", CANCELLED_MESSAGE, -1
+    try:
+        proc = subprocess.Popen(
+            ["git", *args],
+            cwd=repo_root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **_group_kwargs(),
         )
-    except (FileNotFoundError, subprocess.TimeoutExpired, Exception) as e:
+    except (FileNotFoundError, Exception) as e:
         return "", str(e), -1
+
+    out: list[str] = []
+    err: list[str] = []
+    on_stdout = on_line
+    if on_progress is not None:
+        # "Submodule path '...': checked out" 等完成信息写在 stdout，进度解析同样需要
+
+        def on_stdout(line: str, is_stderr: bool) -> None:
+            on_line(line, is_stderr)
+            on_progress(line)
+
+    readers = [
+        threading.Thread(target=_pump_lines, args=(proc.stdout, False, out, on_stdout), daemon=True),
+        threading.Thread(target=_pump_lines, args=(proc.stderr, True, err, on_line), daemon=True)
+        if on_progress is None
+        else threading.Thread(target=_pump_progress, args=(proc.stderr, err, on_line, on_progress), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    timer = None
+    if cancel is not None and not cancel._attach(proc):
+        timer = kill_process_tree(proc)
+    try:
+        code = proc.wait(timeout=timeout)
+        _cancel_timer(timer, proc)
+    except subprocess.TimeoutExpired as e:
+        timer = kill_process_tree(proc)
+        proc.wait()
+        _cancel_timer(timer, proc)
+        _join_readers(readers, killed=True)
+        return "".join(out), "".join(err) + str(e), -1
+    except BaseException:
+        kill_process_tree(proc)
+        raise
+    finally:
+        if cancel is not None:
+            cancel._detach(proc)
+    # 被终止时组内残留的子进程可能仍持有管道，读取线程不无限等待
+    _join_readers(readers, killed=timer is not None or (cancel is not None and cancel.is_cancelled()))
+    if cancel is not None and cancel.is_cancelled():
+        return "".join(out), "".join(err) + CANCELLED_MESSAGE, -1
+    return "".join(out), "".join(err), code or 0
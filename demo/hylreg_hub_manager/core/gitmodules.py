@@ -0,0 +1,309 @@
+"""
+.gitmodules 解析：按 git config 语法单遍扫描，保留子模块的全部属性，逐行报告语法错误。
+文件变化时只重新解析内容有变化的节，上万个子模块的 .gitmodules 也可在每次文件变化时重新读取。
+
+支持的语法与 git 一致：# / ; 注释、[section "subsection"] 及转义、旧式 [section.subsection]、
+引号与 \\n \\t \\b \\\\ \\" 转义、行尾反斜杠续行、没有 "=" 的布尔键。
+git 读取 .gitmodules 时不处理 [include]，这里同样忽略 submodule 以外的节。
+"""
+
+import os
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+
+GITMODULES = ".gitmodules"
+
+_HEADER_RE = re.compile(r'\s*\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\\n]|\\.)*)")?\s*\](.*)$')
+_SECTION_START_RE = re.compile(r"^[ \t]*\[", re.MULTILINE)
+_KEY_RE = re.compile(r"\s*([A-Za-z][A-Za-z0-9-]*)\s*(?:(=)\s*(.*))?$")
+_ESCAPE_RE = re.compile(r"\\(.)")
+_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", "\\": "\\", '"': '"'}
+_TRUE = {"true", "yes", "on", "1"}
+
+
+@dataclass(frozen=True)
+class LineError:
+    """.gitmodules 中的一处错误，line 从 1 开始。"""
+
+    line: int
+    message: str
+
+
+@dataclass(frozen=True)
+class GitmodulesEntry:
+    """
+    一个 [submodule "<name>"] 节。常用属性单独成字段，options 保存全部键（小写）及其最后一次出现的值（只读）。
+    line 为该子模块第一次出现的节头所在行。
+    """
+
+    name: str
+    path: str
+    url: str
+    branch: str = ""
+    update: str = ""
+    ignore: str = ""
+    shallow: bool = False
+    line: int = 0
+    options: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+
+@dataclass(frozen=True)
+class Gitmodules:
+    """
+    一次解析的结果：缺少 path 或 url 的子模块不在 entries 中，而是记为错误。
+    结果会被缓存并在多处共用，因此整体只读。
+    """
+
+    entries: tuple[GitmodulesEntry, ...] = ()
+    errors: tuple[LineError, ...] = ()
+
+    def by_path(self) -> dict[str, GitmodulesEntry]:
+        return {entry.path: entry for entry in self.entries}
+
+
+@dataclass(frozen=True)
+class _Section:
+    """一段文本（节头及其后的键值行）的解析结果；行号相对于段首。"""
+
+    section: str  # 小写的节名，段首没有节头时为空串
+    subsection: str | None
+    values: tuple[tuple[str, str], ...]
+    errors: tuple[tuple[int, str], ...]
+    lines: int
+
+
+def _unquote(raw: str) -> tuple[str, str | None]:
+    """按 git 规则解析值：去掉注释与首尾空白、处理引号和转义。返回 (值, 错误)。"""
+    if '"' not in raw and "\\" not in raw and "#" not in raw and ";" not in raw:
+        return raw.strip(), None
+    out: list[str] = []
+    quoted = False
+    pending_space = ""  # 引号外的空白先暂存，后面还有内容时才写入（去掉行尾空白）
+    i = 0
+    n = len(raw)
+    while i < n:
+        c = raw[i]
+        if c == "\\":
+            if i + 1 >= n:
+                return "".join(out), "值末尾的反斜杠无效"
+            esc = _ESCAPES.get(raw[i + 1])
+            if esc is None:
+                return "".join(out), f"无效的转义 \\{raw[i + 1]}"
+            out.append(pending_space + esc)
+            pending_space = ""
+            i += 2
+            continue
+        if c == '"':
+            quoted = not quoted
+        elif not quoted and c in "#;":
+            break
+        elif not quoted and c in " \t":
+            if out:
+                pending_space += c
+        else:
+            out.append(pending_space + c)
+            pending_space = ""
+        i += 1
+    if quoted:
+        return "".join(out), "引号未闭合"
+    return "".join(out), None
+
+
+def _parse_section(text: str) -> _Section:
+    """解析一段文本：第一行可能是节头，其余为键值行（已合并续行）。"""
+    section = ""
+    subsection: str | None = None
+    values: list[tuple[str, str]] = []
+    errors: list[tuple[int, str]] = []
+    lines = text.split("\n")
+    index = 0
+    count = len(lines)
+    while index < count:
+        number = index
+        line = lines[index]
+        index += 1
+        # 行尾奇数个反斜杠表示续行
+        while line.endswith("\\") and (len(line) - len(line.rstrip("\\"))) % 2 == 1 and index < count:
+            line = line[:-1] + lines[index]
+            index += 1
+        stripped = line.lstrip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if stripped[0] == "[":
+            if number != 0:
+                # 分段时节头总在段首，到这里说明节头写错了
+                errors.append((number, "无法解析的节头"))
+                continue
+            match = _HEADER_RE.match(line)
+            if match is None:
+                errors.append((number, "无法解析的节头"))
+                section = "\0"  # 节头无效：其后的键不属于任何子模块
+                continue
+            name, sub, rest = match.groups()
+            if sub is not None:
+                section, subsection = name.lower(), _ESCAPE_RE.sub(r"\1", sub)
+            elif "." in name:
+                # 旧式写法 [submodule.name]，git 会把子节名转成小写
+                head, _, tail = name.partition(".")
+                section, subsection = head.lower(), tail.lower()
+            else:
+                section = name.lower()
+            rest = rest.strip()
+            if not rest or rest[0] in "#;":
+                continue
+            line = rest  # 节头后同一行还可以写一个键
+        match = _KEY_RE.match(line)
+        if match is None:
+            errors.append((number, "无法解析的行"))
+            continue
+        key, eq, raw = match.groups()
+        if eq is None:
+            value = "true"  # 只有键名表示布尔值 true；"key =" 则是空串（false）
+        else:
+            value, error = _unquote(raw)
+            if error:
+                errors.append((number, error))
+                continue
+        if not section:
+            errors.append((number, f"键 {key} 不在任何节中"))
+            continue
+        values.append((key.lower(), value))
+    return _Section(section, subsection, tuple(values), tuple(errors), count)
+
+
+def _split_sections(text: str) -> list[str]:
+    """按节头把文本切成若干段（段首为节头行，第一段可能没有节头），续行中的 "[" 不切分。"""
+    chunks: list[str] = []
+    start = 0
+    for match in _SECTION_START_RE.finditer(text):
+        pos = match.start()
+        if pos == 0:
+            continue
+        previous = text[start:pos - 1]
+        # 上一行以奇数个反斜杠结尾时本行是续行
+        if previous.endswith("\\") and (len(previous) - len(previous.rstrip("\\"))) % 2 == 1:
+            continue
+        chunks.append(previous)
+        start = pos
+    chunks.append(text[start:])
+    return chunks
+
+
+class GitmodulesParser:
+    """
+    增量解析器：按节缓存解析结果，再次解析时内容未变的节直接复用，只解析新增或修改过的节。
+    只出现在一个节中、且节的内容与起始行都没变的子模块，连 GitmodulesEntry 也直接复用。
+    reparsed 为最近一次 parse() 实际解析的节数。
+    """
+
+    def __init__(self):
+        self._sections: dict[str, _Section] = {}
+        self._built: dict[tuple[str, int], GitmodulesEntry | LineError] = {}
+        self.reparsed = 0
+
+    def parse(self, text: str) -> Gitmodules:
+        text = text.replace("\r\n", "\n")
+        previous = self._sections
+        current: dict[str, _Section] = {}
+        self.reparsed = 0
+        entries: list[GitmodulesEntry] = []
+        errors: list[LineError] = []
+        # 名称 -> [起始行, 键值, 单节时的 (段文本, 起始行)]；同名子模块出现在多个节中时键值合并
+        modules: dict[str, list] = {}
+        line = 1
+        for chunk in _split_sections(text):
+            section = current.get(chunk) or previous.get(chunk)
+            if section is None:
+                section = _parse_section(chunk)
+                self.reparsed += 1
+            current[chunk] = section
+            for offset, message in section.errors:
+                errors.append(LineError(line + offset, message))
+            if section.section == "submodule" and section.subsection is not None:
+                module = modules.get(section.subsection)
+                if module is None:
+                    modules[section.subsection] = [line, section.values, (chunk, line)]
+                else:
+                    module[1] = module[1] + section.values
+                    module[2] = None
+            line += section.lines
+        self._sections = current
+
+        built: dict[tuple[str, int], GitmodulesEntry | LineError] = {}
+        for name, (start, values, key) in modules.items():
+            item = self._built.get(key) if key is not None else None
+            if item is None:
+                item = _build_entry(name, start, dict(values))
+            if key is not None:
+                built[key] = item
+            if isinstance(item, LineError):
+                errors.append(item)
+            else:
+                entries.append(item)
+        self._built = built
+        errors.sort(key=lambda e: e.line)
+        return Gitmodules(tuple(entries), tuple(errors))
+
+
+def _build_entry(name: str, line: int, options: dict[str, str]) -> GitmodulesEntry | LineError:
+    """由合并后的键值构造 GitmodulesEntry；缺少 path 或 url 时返回错误。"""
+    path = options.get("path", "").strip()
+    url = options.get("url", "").strip()
+    if not path or not url:
+        return LineError(line, f'子模块 "{name}" 缺少 {"path" if not path else "url"}')
+    return GitmodulesEntry(
+        name=name,
+        path=path,
+        url=url,
+        branch=options.get("branch", "").strip(),
+        update=options.get("update", "").strip(),
+        ignore=options.get("ignore", "").strip(),
+        shallow=options.get("shallow", "false").strip().lower() in _TRUE,
+        line=line,
+        options=MappingProxyType(options),
+    )
+
+
+def parse_gitmodules_text(text: str) -> Gitmodules:
+    """一次性解析 .gitmodules 文本（不使用缓存）。"""
+    return GitmodulesParser().parse(text)
+
+
+class _FileState:
+    def __init__(self):
+        self.stamp: tuple[int, int, int] | None = None
+        self.parser = GitmodulesParser()
+        self.result = Gitmodules()
+
+
+_files: dict[str, _FileState] = {}
+_files_lock = threading.Lock()
+
+
+def load_gitmodules(repo_root: str) -> Gitmodules:
+    """
+    读取并解析 repo_root/.gitmodules。文件未变化（mtime、大小、inode 相同）时直接返回上次的结果；
+    变化时只重新解析改动过的节。文件不存在时返回空结果，无法读取时记为第 0 行的错误。
+    """
+    path = str(Path(repo_root) / GITMODULES)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return Gitmodules()
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _files_lock:
+        state = _files.setdefault(path, _FileState())
+        if state.stamp == stamp:
+            return state.result
+        try:
+            with open(path, encoding="utf-8", errors="replace", newline="") as f:
+                text = f.read()
+        except OSError as e:
+            return Gitmodules(errors=(LineError(0, f"无法读取 {GITMODULES}: {e}"),))
+        state.result = state.parser.parse(text)
+        state.stamp = stamp
+        return state.result
@@ -0,0 +1,140 @@
+"""
+快速初始化：并行 clone、浅克隆与部分克隆（--filter=blob:none）。
+
+这些选项只用于 clone 尚未初始化的子模块；已初始化的子模块仍按普通方式更新到记录版本，
+避免 --depth 让已有的完整历史变成浅仓库。clone 还可借用本地对象缓存（见 core/reference_store.py）。
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from core.models import SubmoduleInfo, SubmoduleStatus
+
+INIT_BASE = ["submodule", "update", "--init", "--recursive", "--progress"]
+
+
+@dataclass(frozen=True)
+class InitOptions:
+    """初始化子模块的加速选项。默认值等同于普通的 git submodule update --init。"""
+
+    jobs: int = 1  # 同时 clone 的子模块数（--jobs）
+    depth: int = 0  # 只取最近 depth 个提交（--depth）；0 表示完整历史
+    blobless: bool = False  # 部分克隆：文件内容在检出时按需下载（--filter=blob:none）
+    recommend_shallow: bool = True  # .gitmodules 中 shallow = true 的子模块只取 1 个提交
+
+    def is_plain(self) -> bool:
+        return self == InitOptions()
+
+    def clone_args(self) -> list[str]:
+        """追加在 git submodule update 之后的参数。"""
+        args: list[str] = []
+        if self.jobs > 1:
+            args += ["--jobs", str(self.jobs)]
+        if self.depth > 0:
+            args += ["--depth", str(self.depth)]
+        if self.blobless:
+            args.append("--filter=blob:none")
+        # git 默认就遵循 shallow = true；关闭时才需要显式传入
+        if not self.recommend_shallow:
+            args.append("--no-recommend-shallow")
+        return args
+
+
+def _split(
+    items: list[SubmoduleInfo], paths: list[str] | None
+) -> tuple[list[SubmoduleInfo], list[str] | None]:
+    """(要 clone 的未初始化子模块, 其余要更新的路径)；其余为 None 表示不需要，[] 表示全部。"""
+    wanted = set(paths) if paths is not None else None
+    fresh = [
+        info
+        for info in items
+        if info.status == SubmoduleStatus.UNINITIALIZED and (wanted is None or info.path in wanted)
+    ]
+    if paths is None:
+        return fresh, ([] if len(fresh) < len(items) else None)
+    cloned = {info.path for info in fresh}
+    rest = [path for path in paths if path not in cloned]
+    return fresh, (rest or None)
+
+
+def init_commands(
+    items: list[SubmoduleInfo],
+    paths: list[str] | None,
+    options: InitOptions,
+    base: list[str] = INIT_BASE,
+) -> list[list[str]]:
+    """
+    初始化 paths（None 表示全部）所需的命令，需依次执行（都会写 hub 的 .git/config）。
+    普通模式只有一条命令；快速模式先用 options clone 未初始化的子模块，再普通地更新其余的。
+    """
+    if options.is_plain():
+        return [[*base, *(paths or [])]]
+    fresh, rest = _split(items, paths)
+    commands: list[list[str]] = []
+    if fresh:
+        commands.append([*base, *options.clone_args(), "--", *(info.path for info in fresh)])
+    if rest is not None:
+        commands.append([*base, "--", *rest] if rest else list(base))
+    return commands
+
+
+# (urls, 可否建立新缓存) -> url -> (缓存仓库路径, 建立缓存的 git 参数 | None)，见 ReferenceStore.prepare
+References = Callable[[list[str], bool], dict[str, tuple[str, list[str] | None]]]
+
+
+@dataclass(frozen=True)
+class InitStep:
+    """初始化流水线的一步，字段与 GitPipeline.add 的参数对应。"""
+
+    args: list[str]
+    after: list[int]  # 必须先成功的步骤
+    fallback: list[str] | None = None  # 前置步骤失败时改为执行的命令
+    wait: list[int] = field(default_factory=list)  # 只需先结束的步骤（都写 hub 的 .git/config 与 index）
+
+
+def init_steps(
+    items: list[SubmoduleInfo],
+    paths: list[str] | None,
+    options: InitOptions,
+    references: References | None = None,
+    base: list[str] = INIT_BASE,
+) -> list[InitStep]:
+    """
+    与 init_commands 相同，但返回带依赖的步骤。
+    给出 references（如 ReferenceStore.prepare）时，未初始化的子模块先统一 submodule init，
+    再按借用的缓存分组各以 --reference clone（各组并行，只写各自子模块的配置），其余子模块最后按普通方式更新
+    （只排在 clone 之后，clone 失败不会取消它）。
+    尚不存在的缓存在 clone 之前建立；建立失败时该组改为不借用缓存的普通 clone。
+    浅克隆或部分克隆时不建立新缓存（完整的 clone --bare 会抵消其加速），只借用已有的缓存。
+    """
+    commands = init_commands(items, paths, options, base)
+    fresh, rest = _split(items, paths)
+    seed = options.depth == 0 and not options.blobless
+    refs = references([info.url for info in fresh], seed) if references is not None and fresh else {}
+    if not refs:
+        return [InitStep(args, [], wait=[i - 1] if i else []) for i, args in enumerate(commands)]
+    steps: list[InitStep] = [InitStep(["submodule", "init", "--", *(info.path for info in fresh)], [])]
+    groups: dict[str | None, list[str]] = {}
+    seeds: dict[str, list[str]] = {}
+    for info in fresh:
+        store, seed_args = refs.get(info.url, (None, None))
+        groups.setdefault(store, []).append(info.path)
+        if store is not None and seed_args is not None:
+            seeds.setdefault(store, seed_args)
+    clones: list[int] = []
+    for store, group in groups.items():
+        deps = [0]
+        plain = [*base, *options.clone_args(), "--", *group]
+        fallback = None
+        if store in seeds:
+            steps.append(InitStep(seeds[store], []))
+            deps.append(len(steps) - 1)
+            fallback = plain
+        # 顶层子模块已由第一步 init，这里的 --init 只作用于嵌套子模块（写在各子模块自己的配置中）
+        args = [*base, *options.clone_args(), "--reference", store, "--", *group] if store is not None else plain
+        steps.append(InitStep(args, deps, fallback))
+        clones.append(len(steps) - 1)
+    if rest is not None:
+        # 已初始化的子模块与 clone 无关：只排在其后，某组 clone 失败不影响它们的更新
+        steps.append(InitStep([*base, "--", *rest] if rest else list(base), [], wait=clones))
+    return steps
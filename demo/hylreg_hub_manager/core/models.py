@@ -24,6 +24,11 @@ class SubmoduleInfo:
     commit: str  # 短 hash 或空
     status: SubmoduleStatus
     raw_prefix: str = ""  # 行首符号：- + U 等，便于显示
+    changed_files: int | None = None  # 工作区未提交的文件数；None 表示尚未扫描
+    remote_ahead: int | None = None  # HEAD 领先跟踪分支的提交数；None 表示尚未检查
+    remote_behind: int | None = None  # HEAD 落后跟踪分支的提交数
+    commit_subject: str = ""  # commit 说明首行；空表示尚未读取
+    commit_date: int | None = None  # commit 的提交时间（Unix 时间戳）
 
     def status_display(self) -> str:
         """用于界面显示的状态文本。"""
@@ -33,5 +38,5 @@ class SubmoduleInfo:
             SubmoduleStatus.MODIFIED: "有修改",
             SubmoduleStatus.MERGE_CONFLICT: "合并冲突",
             SubmoduleStatus.AHEAD: "领先",
-            SubmoduleStatus.DETACHED: "已检出",
+            SubmoduleStatus.DETACHED: "与记录不同",
         }.get(self.status, self.status.value)
@@ -0,0 +1,28 @@
+"""应用数据目录（不依赖 Qt，供界面与命令行共用）。"""
+
+import os
+import sys
+from pathlib import Path
+
+APP_ORG = "hylreg"
+APP_NAME = "hylreg_hub_manager"
+
+
+def app_data_dir() -> Path:
+    """
+    返回应用数据目录（日志、缓存等），不存在时创建。
+    可用环境变量 HYLREG_HUB_MANAGER_DATA 覆盖。
+    """
+    override = os.environ.get("HYLREG_HUB_MANAGER_DATA")
+    if override:
+        base = Path(override)
+    elif sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA") or str(Path.home())
+        base = Path(root) / APP_ORG / APP_NAME
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support" / APP_ORG / APP_NAME
+    else:
+        root = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+        base = Path(root) / APP_ORG / APP_NAME
+    base.mkdir(parents=True, exist_ok=True)
+    return base
@@ -0,0 +1,129 @@
+"""
+解析 git --progress 写到 stderr 的进度（以 \\r 结尾的刷新行），按子模块汇总。
+解析在读取线程中增量进行，界面或命令行按固定间隔读取快照，进度再频繁也不会增加更新次数。
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+# 各阶段在单个子模块总进度中的 (起点, 跨度)；未列出的阶段只显示文字
+_PHASES: dict[str, tuple[float, float]] = {
+    "Counting objects": (0.0, 0.05),
+    "Compressing objects": (0.05, 0.05),
+    "Receiving objects": (0.10, 0.70),
+    "Resolving deltas": (0.80, 0.10),
+    "Updating files": (0.90, 0.10),
+}
+_PROGRESS_RE = re.compile(r"^(?:remote: )?(?P<phase>[A-Z][A-Za-z ]*?):\s+(?P<pct>\d{1,3})%")
+_CLONING_RE = re.compile(r"^Cloning into '(?P<path>.+)'\.\.\.")
+_SUBMODULE_DONE_RE = re.compile(r"^Submodule path '(?P<path>.+)': ")
+
+
+@dataclass
+class SubmoduleProgress:
+    """一个子模块的进度快照；path 为空表示无法归属到具体子模块的进度。"""
+
+    path: str
+    phase: str = ""
+    percent: int = 0  # 当前阶段的百分比
+    fraction: float = 0.0  # 按阶段加权后的总进度 0..1
+    done: bool = False
+
+
+class ProgressTracker:
+    """
+    一条 git 命令的进度。feed() 在读取线程中逐段调用（每段是一行或一次 \\r 刷新），
+    snapshot() 可在任意线程调用；version 只在进度变化时递增，读取方据此跳过未变化的任务。
+    expected 为预计会处理的子模块路径，用于计算总进度；只有一个时，无法归属的进度都记到它名下。
+    """
+
+    def __init__(self, repo_root: str, expected: list[str] | None = None):
+        self._root = Path(repo_root)
+        self._expected = list(expected or [])
+        self._lock = threading.Lock()
+        self._items: dict[str, SubmoduleProgress] = {p: SubmoduleProgress(p) for p in self._expected}
+        self._current: str | None = None
+        self.version = 0
+
+    def feed(self, segment: str) -> None:
+        segment = segment.strip()
+        if not segment:
+            return
+        match = _PROGRESS_RE.match(segment)
+        if match:
+            self._update_phase(match.group("phase"), int(match.group("pct")))
+            return
+        match = _CLONING_RE.match(segment)
+        if match:
+            with self._lock:
+                self._current = self._relative(match.group("path"))
+                self._item(self._current).phase = "Cloning"
+                self.version += 1
+            return
+        match = _SUBMODULE_DONE_RE.match(segment)
+        if match:
+            with self._lock:
+                item = self._item(match.group("path"))
+                item.done, item.fraction, item.percent = True, 1.0, 100
+                self._current = None
+                self.version += 1
+
+    def snapshot(self) -> tuple[float, list[SubmoduleProgress]]:
+        """返回 (总进度 0..1, 各子模块进度)。"""
+        with self._lock:
+            items = [SubmoduleProgress(**vars(item)) for item in self._items.values()]
+        counted = [item for item in items if item.path in self._expected] if self._expected else items
+        overall = sum(item.fraction for item in counted) / len(counted) if counted else 0.0
+        return overall, items
+
+    def _update_phase(self, phase: str, percent: int) -> None:
+        with self._lock:
+            key = self._current
+            if key is None:
+                key = self._expected[0] if len(self._expected) == 1 else ""
+            item = self._item(key)
+            start, span = _PHASES.get(phase, (None, 0.0))
+            if start is not None:
+                item.fraction = max(item.fraction, start + span * min(percent, 100) / 100)
+            if item.phase == phase and item.percent == percent:
+                return
+            item.phase, item.percent = phase, percent
+            self.version += 1
+
+    def _item(self, path: str) -> SubmoduleProgress:
+        item = self._items.get(path)
+        if item is None:
+            item = self._items[path] = SubmoduleProgress(path)
+        return item
+
+    def _relative(self, path: str) -> str:
+        """git 输出的是子模块工作区的绝对路径，转为相对于 hub 根目录。"""
+        try:
+            return Path(path).relative_to(self._root).as_posix()
+        except ValueError:
+            return path
+
+
+def expected_paths(args: list[str]) -> list[str]:
+    """
+    命令行中给出的子模块路径：submodule update/init 的位置参数，submodule add 的最后一个位置参数。
+    未给出路径（如全部初始化）时返回空列表，总进度按已出现的子模块计算。
+    """
+    words = args[2:] if args[:1] == ["submodule"] else []
+    paths: list[str] = []
+    after_dashdash = False
+    skip_value = False
+    for word in words:
+        if skip_value:
+            skip_value = False
+        elif after_dashdash or not word.startswith("-"):
+            paths.append(word.rstrip("/"))
+        elif word == "--":
+            after_dashdash = True
+        elif word in ("-b", "--branch", "--name", "--reference", "--depth", "--jobs", "-j"):
+            skip_value = True
+    if args[1:2] == ["add"]:
+        return paths[-1:] if len(paths) >= 2 else []
+    return paths
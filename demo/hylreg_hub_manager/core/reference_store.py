@@ -0,0 +1,352 @@
+"""
+本地对象缓存（reference 仓库）：每个上游（按规范化后的完整 URL 区分）在应用数据目录下有一个裸仓库，
+clone 子模块时以 --reference 借用其中的对象，只下载缓存中没有的部分，新仓库几乎不占额外空间。
+
+缓存在后台定期抓取新提交，总大小超过上限时按最久未用淘汰整个仓库；
+淘汰前先让借用它的子模块把对象复制到自己的仓库（相当于 clone --dissociate），不会留下缺对象的仓库。
+缓存仓库从不 gc（gc.auto=0），抓取只会增加对象，已借用的对象不会消失。
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from core.git_runner import CancelToken, resolve_git_dir, run_git, timeout_for
+from core.paths import app_data_dir
+
+STORE_DIR = "reference"
+DEFAULT_MAX_BYTES = 5 * 1024**3
+# 最近这么久内用过的缓存不淘汰：借用它的 clone 可能还在进行
+IN_USE_SECONDS = 3600
+_INDEX_FILE = "index.json"
+# 正在建立缓存（clone --bare 进行中）的标记文件；超过 clone 的超时仍未完成视为失效
+_SEED_LOCK = ".seeding"
+SEED_LOCK_SECONDS = timeout_for(["clone"])
+_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+# 后台抓取绝不弹出凭据输入，失败即跳过
+_FETCH_ENV = {"GIT_TERMINAL_PROMPT": "0"}
+
+
+def normalize_url(url: str) -> str | None:
+    """
+    同一仓库的不同写法归一为 主机/路径：忽略协议、用户名、大小写的主机名、结尾的 / 与 .git，
+    scp 形式（git@host:org/repo）与 ssh:// 等价；本地路径取其绝对路径。相对 URL 返回 None。
+    """
+    url = url.strip().rstrip("/")
+    if not url or url.startswith(("./", "../")):
+        return None
+    if "://" in url:
+        split = urlsplit(url)
+        host = (split.hostname or "").lower()
+        if split.port:
+            host += f":{split.port}"
+        path = unquote(split.path)
+    elif re.match(r"^[^/\\]+:", url) and not re.match(r"^[A-Za-z]:[/\\]", url):
+        # scp 形式 [user@]host:path（排除 Windows 盘符）
+        host, path = url.split(":", 1)
+        host = host.rpartition("@")[2].lower()
+    else:
+        host, path = "", os.path.abspath(url)
+    path = path.replace("\\", "/").rstrip("/")
+    if path.endswith(".git"):
+        path = path[: -len(".git")]
+    return f"{host}/{path.strip('/')}"
+
+
+def store_key(url: str) -> str | None:
+    """缓存名：仓库名加规范化 URL 的哈希，同名而不同源的仓库不会共用缓存。相对 URL 返回 None。"""
+    normalized = normalize_url(url)
+    if normalized is None:
+        return None
+    name = _NAME_RE.sub("_", normalized.rpartition("/")[2]).strip("._").lower() or "repo"
+    return f"{name}-{hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:10]}"
+
+
+def remote_name(url: str) -> str:
+    """缓存仓库中对应 url 的远端名。"""
+    return "r" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+@dataclass(frozen=True)
+class StoreInfo:
+    """一个缓存仓库的概况。"""
+
+    key: str
+    path: str
+    size: int
+    urls: list[str]
+    last_used: float
+
+
+class ReferenceStore:
+    """
+    缓存仓库位于 root/<缓存名>.git（见 store_key），root/index.json 记录各缓存的 URL、最近使用时间与用过它的 hub
+    （淘汰时据此找到借用者）。索引在内存中维护并整体写回（先写临时文件再替换）。线程安全。
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root is not None else app_data_dir() / STORE_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._index: dict[str, dict] | None = None
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.git"
+
+    # ---- 为 clone 准备 ----
+
+    def prepare(self, urls: list[str], hub: str, seed: bool = True) -> dict[str, tuple[str, list[str] | None]]:
+        """
+        登记 hub 将要 clone 的 urls，返回 url -> (缓存仓库路径, 建立缓存的 git 参数 | None)。
+        缓存仓库尚不存在时给出 clone --bare 的参数，应先执行它再以 --reference clone（失败时改为普通 clone）；
+        已存在时为 None：新 fork 直接借用已有对象，只下载差异，其提交在下次后台刷新时并入缓存。
+        seed 为 False 时（如浅克隆）不建立新缓存，缓存尚不存在的 URL 不在结果中，也不登记。
+        相对 URL 不在结果中，调用方按普通方式 clone。只读写索引，不启动进程。
+        """
+        result: dict[str, tuple[str, list[str] | None]] = {}
+        seeding: dict[str, list[str]] = {}  # 本次调用中建立的缓存 -> 建立它的参数
+        now = time.time()
+        with self._lock:
+            index = self._load()
+            for url in urls:
+                key = store_key(url)
+                if key is None:
+                    continue
+                path = self.path_for(key)
+                if key in seeding:
+                    setup = seeding[key]
+                elif self.is_ready(key):
+                    self._release_seed(key)
+                    setup = None
+                elif not seed or not self._claim_seed(key):
+                    # 不建立新缓存，或另一次 clone --bare（可能在别的 hub 或进程中）正在建立：这次按普通方式 clone
+                    continue
+                else:
+                    setup = seeding[key] = self.seed_args(url, path)
+                entry = index.setdefault(key, {"urls": [], "hubs": [], "last_used": now})
+                if url not in entry["urls"]:
+                    entry["urls"].append(url)
+                if hub not in entry["hubs"]:
+                    entry["hubs"].append(hub)
+                entry["last_used"] = now
+                result[url] = (str(path), setup)
+            self._save()
+        return result
+
+    def is_ready(self, key: str) -> bool:
+        """缓存已建立完毕：clone --bare 在抓取结束后才写入引用（packed-refs），之前只有 HEAD。"""
+        path = self.path_for(key)
+        return (path / "HEAD").exists() and (
+            (path / "packed-refs").exists() or any((path / "refs" / "remotes").glob("*"))
+        )
+
+    def _seed_lock(self, key: str) -> Path:
+        return self.root / f"{key}.git{_SEED_LOCK}"
+
+    def _claim_seed(self, key: str) -> bool:
+        """
+        以独占创建标记文件的方式认领建立缓存的任务；已有未失效的标记（建立中）时返回 False。
+        标记失效（上次 clone --bare 被中断或失败）时先清掉残留的目录。
+        """
+        lock = self._seed_lock(key)
+        try:
+            if time.time() - lock.stat().st_mtime < SEED_LOCK_SECONDS:
+                return False
+            lock.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        shutil.rmtree(self.path_for(key), ignore_errors=True)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except OSError:
+            return False
+        return True
+
+    def _release_seed(self, key: str) -> None:
+        try:
+            self._seed_lock(key).unlink()
+        except OSError:
+            pass
+
+    @staticmethod
+    def seed_args(url: str, path: Path) -> list[str]:
+        """建立缓存仓库：只取分支（不取 tag），远端名与后台刷新时添加的一致，关闭自动 gc。"""
+        remote = remote_name(url)
+        return [
+            "clone", "--bare", "--no-tags", "--progress",
+            "--origin", remote,
+            "-c", "gc.auto=0",
+            "-c", f"remote.{remote}.fetch=+refs/heads/*:refs/remotes/{remote}/*",
+            url, str(path),
+        ]
+
+    # ---- 后台刷新与淘汰 ----
+
+    def refresh(self, cancel: CancelToken | None = None) -> dict[str, str]:
+        """为各缓存补齐登记过的远端并抓取一遍，返回 缓存名 -> 错误信息。"""
+        with self._lock:
+            entries = {key: list(entry["urls"]) for key, entry in self._load().items()}
+        errors: dict[str, str] = {}
+        for key, urls in entries.items():
+            if cancel is not None and cancel.is_cancelled():
+                break
+            path = self.path_for(key)
+            if not self.is_ready(key):
+                continue
+            error = self._ensure_remotes(path, urls, cancel)
+            if not error:
+                args = ["fetch", "--all", "--no-tags", "--quiet"]
+                _, err, code = run_git(str(path), args, timeout_for(args), env=_FETCH_ENV, cancel=cancel)
+                error = err.strip() if code != 0 else ""
+            if error:
+                errors[key] = error
+        return errors
+
+    def _ensure_remotes(self, path: Path, urls: list[str], cancel: CancelToken | None) -> str:
+        out, _, _ = run_git(str(path), ["config", "--get-regexp", r"^remote\..*\.url$"], cancel=cancel)
+        present = {line.split(" ", 1)[1] for line in out.splitlines() if " " in line}
+        for url in urls:
+            if url in present:
+                continue
+            _, err, code = run_git(
+                str(path), ["remote", "add", "--no-tags", remote_name(url), url], cancel=cancel
+            )
+            if code != 0:
+                return err.strip()
+        return ""
+
+    def usage(self) -> list[StoreInfo]:
+        """各缓存仓库的大小等信息（遍历目录，应在后台线程调用）。"""
+        with self._lock:
+            entries = {key: dict(entry) for key, entry in self._load().items()}
+        infos = []
+        for key, entry in entries.items():
+            path = self.path_for(key)
+            if path.is_dir():
+                infos.append(StoreInfo(key, str(path), _dir_size(path), list(entry["urls"]), entry["last_used"]))
+        return infos
+
+    def prune(self, max_bytes: int | None = None, cancel: CancelToken | None = None) -> list[str]:
+        """
+        总大小超过 max_bytes（默认 self.max_bytes）时按最久未用淘汰缓存仓库，返回淘汰的缓存名。
+        最近 IN_USE_SECONDS 内用过的不淘汰；有借用者无法脱离（复制对象失败）的也保留。
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            index = self._load()
+            # 目录已不存在（如被手动删除）且不在建立中的登记直接丢弃
+            for key in [k for k in index if not self.path_for(k).is_dir() and not self._seed_lock(k).exists()]:
+                del index[key]
+            self._save()
+        infos = sorted(self.usage(), key=lambda info: info.last_used)
+        total = sum(info.size for info in infos)
+        evicted: list[str] = []
+        for info in infos:
+            if total <= limit or (cancel is not None and cancel.is_cancelled()):
+                break
+            if time.time() - info.last_used < IN_USE_SECONDS:
+                continue
+            if self._evict(info.key, cancel):
+                evicted.append(info.key)
+                total -= info.size
+        return evicted
+
+    def borrowers(self, key: str) -> list[Path]:
+        """登记过的 hub 中借用该缓存的子模块 git 目录（objects/info/alternates 指向它）。"""
+        with self._lock:
+            hubs = list(self._load().get(key, {}).get("hubs", []))
+        objects = (self.path_for(key) / "objects").resolve()
+        found: list[Path] = []
+        for hub in hubs:
+            git_dir = resolve_git_dir(hub)
+            if git_dir is None or not (git_dir / "modules").is_dir():
+                continue
+            for alternates in (git_dir / "modules").rglob("objects/info/alternates"):
+                if objects in _read_alternates(alternates):
+                    found.append(alternates.parent.parent.parent)
+        return found
+
+    def _evict(self, key: str, cancel: CancelToken | None) -> bool:
+        objects = (self.path_for(key) / "objects").resolve()
+        for git_dir in self.borrowers(key):
+            if not _dissociate(git_dir, objects, cancel):
+                return False
+        with self._lock:
+            entry = self._load().get(key)
+            # 脱离期间又被使用了（新的 clone 可能正在借用），保留
+            if entry is not None and time.time() - entry["last_used"] < IN_USE_SECONDS:
+                return False
+            shutil.rmtree(self.path_for(key), ignore_errors=True)
+            self._load().pop(key, None)
+            self._save()
+        return True
+
+    # ---- 索引 ----
+
+    def _load(self) -> dict[str, dict]:
+        if self._index is None:
+            try:
+                data = json.loads((self.root / _INDEX_FILE).read_text(encoding="utf-8"))
+                self._index = dict(data.get("stores", {}))
+            except (OSError, ValueError, AttributeError):
+                self._index = {}
+        return self._index
+
+    def _save(self) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / f"{_INDEX_FILE}.{os.getpid()}.tmp"
+            tmp.write_text(json.dumps({"version": 1, "stores": self._index}, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.root / _INDEX_FILE)
+        except OSError:
+            pass
+
+
+def _read_alternates(path: Path) -> list[Path]:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    base = path.parent.parent  # 相对路径相对于 objects 目录
+    return [(base / line.strip()).resolve() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def _dissociate(git_dir: Path, objects: Path, cancel: CancelToken | None) -> bool:
+    """把借用的对象复制到 git_dir 自己的对象库（git repack -a -d），再从 alternates 中去掉缓存。"""
+    args = [f"--git-dir={git_dir}", "repack", "-a", "-d", "-q"]
+    _, _, code = run_git(str(git_dir), args, timeout_for(["clone"]), cancel=cancel)
+    if code != 0:
+        return False
+    alternates = git_dir / "objects" / "info" / "alternates"
+    base = alternates.parent.parent
+    try:
+        lines = alternates.read_text(encoding="utf-8").splitlines()
+        kept = [line for line in lines if line.strip() and (base / line.strip()).resolve() != objects]
+        if kept:
+            alternates.write_text("\n".join(kept) + "\n", encoding="utf-8")
+        else:
+            alternates.unlink()
+    except OSError:
+        return False
+    return True
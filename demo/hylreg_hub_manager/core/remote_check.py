@@ -0,0 +1,274 @@
+"""检查子模块相对远端跟踪分支的领先/落后提交数：有界并发抓取，结果按 TTL 缓存。"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from urllib.parse import urlparse
+
+from core.git_runner import CancelToken, gitmodules_branches, resolve_git_dir, run_git, timeout_for
+from core.models import SubmoduleInfo, SubmoduleStatus
+from core.status_reader import StatusReaderError, read_ref, read_symbolic_ref
+
+REMOTE = "origin"
+# 抓取时绝不弹出凭据输入，失败即返回
+_FETCH_ENV = {"GIT_TERMINAL_PROMPT": "0", "GIT_OPTIONAL_LOCKS": "0"}
+_SCP_LIKE = re.compile(r"^(?:[^@/]+@)?([^:/]+):(?!//)")
+
+
+@dataclass(frozen=True)
+class RemoteStatus:
+    """单个子模块相对远端跟踪分支的状态。"""
+
+    ahead: int | None
+    behind: int | None
+    ref: str = ""  # 参与比较的远端引用，如 refs/remotes/origin/main
+    error: str = ""
+
+
+class RemoteCheckCache:
+    """
+    - 抓取时间：同一子模块在 ttl 秒内不重复 git fetch；
+    - 领先/落后计数：以 (HEAD, 远端引用) 的 commit 为键，二者不变时不再计算。
+    线程安全。
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._fetched: dict[str, float] = {}
+        self._counts: dict[str, tuple[tuple[str, str], RemoteStatus]] = {}
+
+    def fetched_recently(self, git_dir: str) -> bool:
+        with self._lock:
+            at = self._fetched.get(git_dir)
+        return at is not None and time.monotonic() - at < self.ttl
+
+    def mark_fetched(self, git_dir: str) -> None:
+        with self._lock:
+            self._fetched[git_dir] = time.monotonic()
+
+    def get(self, git_dir: str, key: tuple[str, str]) -> RemoteStatus | None:
+        with self._lock:
+            entry = self._counts.get(git_dir)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def put(self, git_dir: str, key: tuple[str, str], status: RemoteStatus) -> None:
+        with self._lock:
+            self._counts[git_dir] = (key, status)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fetched.clear()
+            self._counts.clear()
+
+
+class _HostLimiter:
+    """按主机限制同时进行的抓取数，避免对同一服务器建立过多连接。"""
+
+    def __init__(self, per_host: int):
+        self._per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._sems: dict[str, threading.Semaphore] = {}
+
+    def for_host(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.Semaphore(self._per_host)
+            return sem
+
+
+def url_host(url: str) -> str:
+    """远端 URL 的主机名；本地路径与相对路径返回空字符串。"""
+    if "://" in url:
+        return (urlparse(url).hostname or "").lower()
+    m = _SCP_LIKE.match(url)
+    if m and not os.path.exists(url):
+        return m.group(1).lower()
+    return ""
+
+
+def _tracking_ref(git_dir: Path, branch: str | None, hub_branch: str | None) -> str | None:
+    """
+    与 git submodule update --remote 的规则一致：
+    .gitmodules 中的 branch（"." 表示与 hub 当前分支同名），未设置时使用远端 HEAD。
+    """
+    if branch == ".":
+        branch = hub_branch
+    if branch:
+        return f"refs/remotes/{REMOTE}/{branch}"
+    target = read_symbolic_ref(git_dir, f"refs/remotes/{REMOTE}/HEAD")
+    if target:
+        return target
+    for name in ("main", "master"):
+        ref = f"refs/remotes/{REMOTE}/{name}"
+        try:
+            read_ref(git_dir, ref)
+            return ref
+        except StatusReaderError:
+            continue
+    return None
+
+
+def _count_key(git_dir: Path, ref: str) -> tuple[str, str] | None:
+    try:
+        return read_ref(git_dir, "HEAD"), read_ref(git_dir, ref)
+    except StatusReaderError:
+        return None
+
+
+def _cached_status(
+    git_dir: Path,
+    branch: str | None,
+    hub_branch: str | None,
+    cache: RemoteCheckCache,
+) -> RemoteStatus | None:
+    ref = _tracking_ref(git_dir, branch, hub_branch)
+    if ref is None:
+        return None
+    key = _count_key(git_dir, ref)
+    return cache.get(str(git_dir), key) if key else None
+
+
+def _check_one(
+    worktree: Path,
+    git_dir: Path,
+    url: str,
+    branch: str | None,
+    hub_branch: str | None,
+    cache: RemoteCheckCache,
+    limiter: _HostLimiter,
+    cancel: CancelToken | None = None,
+) -> RemoteStatus:
+    if not cache.fetched_recently(str(git_dir)):
+        fetch = ["fetch", "--quiet", "--no-tags", "--no-recurse-submodules", REMOTE]
+        with limiter.for_host(url_host(url)):
+            _, stderr, code = run_git(
+                str(worktree),
+                fetch,
+                timeout=timeout_for(fetch),
+                env=_FETCH_ENV,
+                cancel=cancel,
+            )
+        if code != 0:
+            return RemoteStatus(None, None, error=stderr.strip() or f"git fetch 退出码 {code}")
+        cache.mark_fetched(str(git_dir))
+
+    ref = _tracking_ref(git_dir, branch, hub_branch)
+    if ref is None:
+        return RemoteStatus(None, None, error="找不到远端跟踪分支")
+    key = _count_key(git_dir, ref)
+    if key is not None:
+        hit = cache.get(str(git_dir), key)
+        if hit is not None:
+            return hit
+    stdout, stderr, code = run_git(
+        str(worktree),
+        ["rev-list", "--left-right", "--count", f"HEAD...{ref}"],
+        timeout=60,
+        cancel=cancel,
+    )
+    parts = stdout.split()
+    if code != 0 or len(parts) != 2:
+        return RemoteStatus(None, None, ref, stderr.strip() or "无法计算领先/落后")
+    status = RemoteStatus(int(parts[0]), int(parts[1]), ref)
+    if key is not None:
+        cache.put(str(git_dir), key, status)
+    return status
+
+
+def _hub_branch(repo_root: str) -> str | None:
+    git_dir = resolve_git_dir(repo_root)
+    target = read_symbolic_ref(git_dir, "HEAD") if git_dir else None
+    if target and target.startswith("refs/heads/"):
+        return target[len("refs/heads/"):]
+    return None
+
+
+def _apply(info: SubmoduleInfo, status: RemoteStatus | None) -> SubmoduleInfo:
+    if status is None:
+        return info
+    return replace(info, remote_ahead=status.ahead, remote_behind=status.behind)
+
+
+def _candidates(repo_root: str, items: list[SubmoduleInfo]):
+    root = Path(repo_root)
+    for i, info in enumerate(items):
+        if info.status in (SubmoduleStatus.UNINITIALIZED, SubmoduleStatus.MERGE_CONFLICT):
+            continue
+        git_dir = resolve_git_dir(root / info.path)
+        if git_dir is not None:
+            yield i, root / info.path, git_dir
+
+
+def apply_cached_remote_status(
+    repo_root: str,
+    items: list[SubmoduleInfo],
+    cache: RemoteCheckCache,
+) -> list[SubmoduleInfo]:
+    """只用缓存填充 remote_ahead / remote_behind，不启动任何进程（供每次刷新使用）。"""
+    branches = gitmodules_branches(repo_root)
+    hub_branch = _hub_branch(repo_root)
+    result = list(items)
+    for i, _, git_dir in _candidates(repo_root, items):
+        status = _cached_status(git_dir, branches.get(items[i].path), hub_branch, cache)
+        result[i] = _apply(items[i], status)
+    return result
+
+
+def check_remotes(
+    repo_root: str,
+    items: list[SubmoduleInfo],
+    cache: RemoteCheckCache,
+    max_workers: int = 8,
+    per_host: int = 4,
+    on_progress=None,
+    cancel: CancelToken | None = None,
+) -> tuple[list[SubmoduleInfo], dict[str, str]]:
+    """
+    抓取已检出的子模块（ttl 内抓取过的跳过），计算相对跟踪分支的领先/落后数。
+    并发受 max_workers 与每主机 per_host 双重限制。
+    on_progress(done, total) 在工作线程中调用。
+    cancel 被取消时终止进行中的 git 进程组，尚未开始的子模块直接记为失败。
+    返回 (填充后的列表, path -> 错误信息)。
+    """
+    branches = gitmodules_branches(repo_root)
+    hub_branch = _hub_branch(repo_root)
+    limiter = _HostLimiter(per_host)
+    todo = list(_candidates(repo_root, items))
+    result = list(items)
+    errors: dict[str, str] = {}
+    if not todo:
+        return result, errors
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as pool:
+        futures = [
+            (i, pool.submit(
+                _check_one,
+                worktree,
+                git_dir,
+                items[i].url,
+                branches.get(items[i].path),
+                hub_branch,
+                cache,
+                limiter,
+                cancel,
+            ))
+            for i, worktree, git_dir in todo
+        ]
+        for i, future in futures:
+            status = future.result()
+            if status.error:
+                errors[items[i].path] = status.error
+            result[i] = _apply(items[i], status)
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(todo))
+    return result, errors
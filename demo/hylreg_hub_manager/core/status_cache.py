@@ -0,0 +1,116 @@
+"""子模块列表的磁盘缓存：启动或切换仓库时先显示上次结果，再在后台校验。"""
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict, fields
+from pathlib import Path
+
+from core.git_runner import parse_gitmodules_sections, resolve_git_dir
+from core.models import SubmoduleInfo, SubmoduleStatus
+from core.paths import app_data_dir
+from core.status_reader import head_files
+
+# SubmoduleInfo 结构变化时递增，旧缓存自动失效
+SCHEMA_VERSION = 1
+
+
+def fingerprint(repo_root: str) -> str:
+    """
+    计算仓库状态指纹：.gitmodules、.git/index、.git/HEAD、.git/config
+    以及各子模块 HEAD（含其指向的引用）的 (mtime_ns, size)。
+    只做 stat，不读取 index，开销与子模块数量线性相关且很小。
+    """
+    root = Path(repo_root)
+    git_dir = resolve_git_dir(root)
+    files: list[Path] = [root / ".gitmodules"]
+    if git_dir is not None:
+        files += [git_dir / "index", git_dir / "HEAD", git_dir / "config"]
+        for name, path, _ in parse_gitmodules_sections(repo_root):
+            module_dir = resolve_git_dir(root / path)
+            if module_dir is None:
+                files.append(git_dir / "modules" / name / "HEAD")
+            else:
+                files += head_files(module_dir)
+    parts: list[str] = [str(SCHEMA_VERSION)]
+    for file in files:
+        try:
+            st = os.stat(file)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def _to_row(info: SubmoduleInfo) -> dict:
+    row = asdict(info)
+    row["status"] = info.status.value
+    return row
+
+
+def _from_row(row: dict) -> SubmoduleInfo:
+    known = {f.name for f in fields(SubmoduleInfo)}
+    data = {k: v for k, v in row.items() if k in known}
+    data["status"] = SubmoduleStatus(data["status"])
+    return SubmoduleInfo(**data)
+
+
+class StatusCache:
+    """
+    以 hub 路径为键，把最近一次加载的 SubmoduleInfo 列表与指纹存入 SQLite。
+    每次操作单独打开连接，可在任意线程中使用。
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or app_data_dir() / "status_cache.sqlite3"
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hubs ("
+            " repo TEXT PRIMARY KEY, fingerprint TEXT NOT NULL,"
+            " items TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        return conn
+
+    def load(self, repo_root: str) -> tuple[list[SubmoduleInfo], str] | None:
+        """
+        读取缓存，返回 (items, 保存时的指纹)；调用方与当前的 fingerprint() 比较，
+        一致时可直接使用 items 而无需重新加载。没有缓存或缓存损坏时返回 None。
+        """
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT fingerprint, items FROM hubs WHERE repo = ?",
+                    (repo_root,),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        try:
+            items = [_from_row(r) for r in json.loads(row[1])]
+        except (ValueError, TypeError, KeyError):
+            return None
+        return items, row[0]
+
+    def store(self, repo_root: str, items: list[SubmoduleInfo], stamp: str) -> None:
+        """保存一次全量加载的结果；stamp 应为加载开始前计算的 fingerprint()。"""
+        payload = json.dumps([_to_row(info) for info in items], ensure_ascii=False)
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO hubs (repo, fingerprint, items, updated)"
+                        " VALUES (?, ?, ?, ?)",
+                        (repo_root, stamp, payload, time.time()),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass  # 缓存只是加速手段，写入失败不影响功能
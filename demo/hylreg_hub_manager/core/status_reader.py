@@ -0,0 +1,256 @@
+"""
+不启动 git 进程，直接读取 hub 的 .git/index 与各子模块的 HEAD，
+得到与 git submodule status 相同的 path -> (commit, prefix) 结果。
+遇到无法处理的仓库布局时抛出 StatusReaderError，由调用方回退到 git 命令。
+"""
+
+import configparser
+import struct
+from pathlib import Path
+
+from core.git_runner import parse_gitmodules_sections, resolve_git_dir
+
+GITLINK_MODE = 0o160000
+NULL_SHA = "0" * 40
+
+_HEADER = struct.Struct(">4sII")
+# ctime(8) mtime(8) dev ino mode uid gid size，随后 20 字节 sha 与 2 字节 flags
+_ENTRY = struct.Struct(">8x8x4x4xI4x4x4x20sH")
+_EXTENDED_FLAG = 0x4000
+_UNSUPPORTED_EXTENSIONS = {
+    b"link": "split index",
+    b"sdir": "sparse index",
+}
+
+
+class StatusReaderError(Exception):
+    """当前仓库布局无法由纯 Python 读取（如 split index、SHA-256、reftable）。"""
+
+
+def read_gitlinks(index_path: str | Path) -> dict[str, tuple[str, int]]:
+    """
+    解析 git index（版本 2/3/4），返回所有 gitlink 条目：path -> (sha, stage)。
+    同一路径存在多个 stage（合并冲突）时保留非 0 的 stage。
+    """
+    try:
+        data = Path(index_path).read_bytes()
+    except OSError as e:
+        raise StatusReaderError(f"无法读取 index: {e}") from e
+    if len(data) < _HEADER.size + 20:
+        raise StatusReaderError("index 文件过短")
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise StatusReaderError(f"不支持的 index 格式: {signature!r} v{version}")
+
+    result: dict[str, tuple[str, int]] = {}
+    pos = _HEADER.size
+    prev_path = b""
+    end_of_entries = len(data) - 20  # 末尾 20 字节为校验和
+    for _ in range(count):
+        start = pos
+        if pos + _ENTRY.size > end_of_entries:
+            raise StatusReaderError("index 条目被截断")
+        mode, sha, flags = _ENTRY.unpack_from(data, pos)
+        pos += _ENTRY.size
+        if flags & _EXTENDED_FLAG:
+            if version < 3:
+                raise StatusReaderError("v2 index 中出现扩展标志")
+            pos += 2
+        if version == 4:
+            # 路径前缀压缩：先去掉上一条路径末尾 strip 个字节，再拼接本条的 NUL 结尾后缀
+            strip, pos = _read_offset_varint(data, pos)
+            nul = data.index(b"\0", pos)
+            path = prev_path[: len(prev_path) - strip] + data[pos:nul]
+            pos = nul + 1
+        else:
+            nul = data.index(b"\0", pos)
+            path = data[pos:nul]
+            # 条目按 8 字节对齐，补 1~8 个 NUL
+            pos = start + ((nul - start + 8) & ~7)
+        prev_path = path
+        if mode & 0o170000 == GITLINK_MODE:
+            stage = (flags >> 12) & 0x3
+            key = path.decode("utf-8", errors="surrogateescape")
+            if stage or key not in result:
+                result[key] = (sha.hex(), stage)
+
+    # 扩展：遇到会改变条目含义的扩展时放弃
+    while pos + 8 <= end_of_entries:
+        signature, size = struct.unpack_from(">4sI", data, pos)
+        if signature in _UNSUPPORTED_EXTENSIONS:
+            raise StatusReaderError(f"不支持 {_UNSUPPORTED_EXTENSIONS[signature]}")
+        pos += 8 + size
+    return result
+
+
+def _read_offset_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """读取 git 的 offset varint（index v4 使用），返回 (值, 新位置)。"""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def read_head(git_dir: str | Path) -> str:
+    """解析仓库 HEAD 指向的 commit（支持分离 HEAD、松散引用与 packed-refs）。"""
+    return read_ref(git_dir, "HEAD")
+
+
+def read_ref(git_dir: str | Path, ref: str) -> str:
+    """解析引用（如 HEAD、refs/remotes/origin/main）指向的 commit，跟随符号引用。"""
+    git_dir = Path(git_dir)
+    common_dir = _common_dir(git_dir)
+    if (common_dir / "reftable").exists():
+        raise StatusReaderError("不支持 reftable 引用格式")
+    for _ in range(5):  # 符号引用最多跟随几层
+        value = _read_loose_ref(git_dir, common_dir, ref)
+        if value is None:
+            value = _read_packed_ref(common_dir, ref)
+        if value is None:
+            raise StatusReaderError(f"无法解析引用 {ref}（{git_dir}）")
+        if value.startswith("ref:"):
+            ref = value[4:].strip()
+            continue
+        if len(value) != 40:
+            raise StatusReaderError(f"不支持的对象 id: {value!r}")
+        return value
+    raise StatusReaderError(f"符号引用层级过深（{git_dir}）")
+
+
+def read_symbolic_ref(git_dir: str | Path, ref: str) -> str | None:
+    """若 ref 是松散的符号引用（如 refs/remotes/origin/HEAD），返回其指向的引用名。"""
+    git_dir = Path(git_dir)
+    value = _read_loose_ref(git_dir, _common_dir(git_dir), ref)
+    if value is not None and value.startswith("ref:"):
+        return value[4:].strip()
+    return None
+
+
+def head_files(git_dir: str | Path) -> list[Path]:
+    """
+    决定 HEAD 指向哪个 commit 的文件：HEAD 本身，HEAD 为符号引用时再加上
+    对应的松散引用与 packed-refs。用于监视变化或计算缓存指纹。
+    """
+    git_dir = Path(git_dir)
+    files = [git_dir / "HEAD"]
+    try:
+        value = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return files
+    if value.startswith("ref:"):
+        common_dir = _common_dir(git_dir)
+        files.append(common_dir / value[4:].strip())
+        files.append(common_dir / "packed-refs")
+    return files
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """worktree 的 git 目录通过 commondir 指向共享的 refs 与 packed-refs。"""
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    path = Path(common)
+    return path if path.is_absolute() else git_dir / path
+
+
+def _read_loose_ref(git_dir: Path, common_dir: Path, ref: str) -> str | None:
+    base = git_dir if ref == "HEAD" else common_dir
+    try:
+        return (base / ref).read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _read_packed_ref(common_dir: Path, ref: str) -> str | None:
+    try:
+        text = (common_dir / "packed-refs").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    for line in text.splitlines():
+        if not line or line[0] in "#^":
+            continue
+        sha, _, name = line.partition(" ")
+        if name == ref:
+            return sha
+    return None
+
+
+def _read_active_modules(git_dir: Path) -> set[str]:
+    """
+    从 hub 的 .git/config 读出已激活（submodule.<name>.active 或已登记 url）的子模块名。
+    使用 submodule.active 路径规则或 include 的配置无法静态判断，直接放弃。
+    """
+    config_path = _common_dir(git_dir) / "config"
+    try:
+        text = config_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        raise StatusReaderError(f"无法读取 {config_path}: {e}") from e
+    parser = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        parser.read_string(text)
+    except configparser.Error as e:
+        raise StatusReaderError(f"无法解析 {config_path}: {e}") from e
+
+    active: set[str] = set()
+    for section in parser.sections():
+        lowered = section.lower()
+        if lowered.startswith("include"):
+            raise StatusReaderError("配置中使用了 include")
+        if lowered == "submodule" and parser.has_option(section, "active"):
+            raise StatusReaderError("配置中使用了 submodule.active")
+        if lowered == "extensions" and parser.has_option(section, "objectformat"):
+            if parser.get(section, "objectformat").strip().lower() != "sha1":
+                raise StatusReaderError("不支持 SHA-1 以外的对象格式")
+        if not section.startswith('submodule "'):
+            continue
+        name = section[len('submodule "'):].rstrip('"')
+        if parser.has_option(section, "active"):
+            value = parser.get(section, "active").strip().lower()
+            if value in ("true", "yes", "on", "1", ""):
+                active.add(name)
+        elif parser.has_option(section, "url"):
+            active.add(name)
+    return active
+
+
+def read_submodule_status(
+    repo_root: str,
+    paths: list[str] | None = None,
+) -> dict[str, tuple[str, str]]:
+    """
+    与 parse_submodule_status(git submodule status 的输出) 返回相同结构：
+    path -> (commit_hash, prefix)，prefix 为 ""、"-"、"+" 或 "U"。
+    paths 非空时只计算这些路径。
+    """
+    root = Path(repo_root)
+    git_dir = resolve_git_dir(root)
+    if git_dir is None:
+        raise StatusReaderError(f"不是 git 仓库: {repo_root}")
+    gitlinks = read_gitlinks(git_dir / "index")
+    active = _read_active_modules(git_dir)
+    names = {path: name for name, path, _ in parse_gitmodules_sections(repo_root)}
+
+    wanted = set(paths) if paths is not None else None
+    result: dict[str, tuple[str, str]] = {}
+    for path, (sha, stage) in gitlinks.items():
+        if wanted is not None and path not in wanted:
+            continue
+        name = names.get(path)
+        if name is None:
+            # git 会报 “no submodule mapping found” 并中止，交给 git 处理
+            raise StatusReaderError(f".gitmodules 中没有 {path} 的记录")
+        if stage:
+            result[path] = (NULL_SHA, "U")
+            continue
+        sub_git_dir = resolve_git_dir(root / path)
+        if name not in active or sub_git_dir is None:
+            result[path] = (sha, "-")
+            continue
+        head = read_head(sub_git_dir)
+        result[path] = (head, "") if head == sha else (head, "+")
+    return result
@@ -0,0 +1,205 @@
+"""
+子模块列表的筛选索引：路径与 URL 的三元组（trigram）倒排表、按 commit 排序的前缀表与按状态分组，
+按路径增量更新（只重新索引新增或变化了的子模块）。
+查询时取词中最少见的三元组的倒排表作为候选再校验子串，上万个子模块时每次按键也只需几毫秒。
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+
+from core.models import SubmoduleInfo, SubmoduleStatus
+
+_HEX = frozenset("0123456789abcdef")
+_FIELDS = ("path", "url", "commit", "status")
+_EMPTY: list[int] = []
+
+
+@dataclass(frozen=True)
+class _Entry:
+    path: str  # 均为小写
+    url: str
+    commit: str
+    status: SubmoduleStatus
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def status_matches(term: str) -> set[SubmoduleStatus]:
+    """状态词匹配的状态：取值（如 modified）或界面文字（如 有修改）以 term 开头。"""
+    term = term.lower()
+    return {
+        status
+        for status in SubmoduleStatus
+        if status.value.startswith(term) or SubmoduleInfo("", "", "", status).status_display().startswith(term)
+    }
+
+
+class SubmoduleIndex:
+    """
+    查询语法：空白分隔的多个词，须同时满足。
+    - 普通词：路径或 URL 包含该词（不区分大小写），或 commit 以该词开头（至少 4 位十六进制）；
+    - path:词 / url:词：只匹配路径 / URL；commit:前缀：只匹配 commit；status:词：见 status_matches。
+    search() 返回匹配的路径集合；查询为空且不限状态时返回 None，表示不筛选。非线程安全，在界面线程使用。
+
+    倒排表只追加：删除或改动的子模块留下的旧编号在查询时由子串校验排除，
+    失效编号多于有效条目时整体重建一次。
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}  # 路径 -> 内部编号
+        self._entries: list[_Entry | None] = []  # 编号 -> 条目；删除后为 None
+        self._paths: list[str] = []  # 编号 -> 原始路径
+        self._texts: list[str] = []  # 编号 -> "路径\nURL"（小写）；删除后为空串，不匹配任何词
+        self._grams: dict[str, list[int]] = defaultdict(list)  # 三元组 -> 编号
+        self._stale = 0
+        self._by_status: dict[SubmoduleStatus, set[int]] = defaultdict(set)
+        self._commits: list[tuple[str, int]] | None = None  # (commit, 编号) 有序表；None 表示需重建
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def update(self, items: list[SubmoduleInfo]) -> None:
+        """与 items 同步：删除不在其中的路径，只重新索引新增或变化了的子模块。"""
+        keep = {info.path for info in items}
+        for path in [p for p in self._ids if p not in keep]:
+            self._remove(path)
+        self.apply(items)
+
+    def apply(self, items: list[SubmoduleInfo]) -> None:
+        """增量更新给定的子模块（不删除其他路径）。"""
+        for info in items:
+            entry = _Entry(info.path.lower(), info.url.lower(), info.commit.lower(), info.status)
+            ident = self._ids.get(info.path)
+            if ident is not None:
+                old = self._entries[ident]
+                if old == entry:
+                    continue
+                if old.path == entry.path and old.url == entry.url:
+                    # 只有 commit 或状态变了（刷新时最常见），倒排表不动
+                    self._replace(ident, old, entry)
+                    continue
+                self._remove(info.path)
+            self._add(info.path, entry)
+        if self._stale > max(1024, len(self._ids)):
+            self._rebuild()
+
+    def search(self, query: str, status: SubmoduleStatus | None = None) -> set[str] | None:
+        terms = query.split()
+        if not terms and status is None:
+            return None
+        result: set[int] | None = set(self._by_status.get(status, ())) if status is not None else None
+        # 先算选择性高（长）的词，候选随之缩小，结果为空时提前结束
+        for term in sorted(terms, key=len, reverse=True):
+            field, _, value = term.partition(":")
+            if field.lower() in _FIELDS and value:
+                result = self._match_field(field.lower(), value.lower(), result)
+            else:
+                result = self._match_any(term.lower(), result)
+            if not result:
+                return set()
+        return {self._paths[ident] for ident in result}
+
+    # ---- 查询 ----
+
+    def _match_any(self, term: str, within: set[int] | None) -> set[int]:
+        matched = self._match_text(term, within, None)
+        if len(term) >= 4 and _HEX.issuperset(term):
+            matched |= self._match_commit(term, within)
+        return matched
+
+    def _match_field(self, field: str, value: str, within: set[int] | None) -> set[int]:
+        if field == "commit":
+            return self._match_commit(value, within)
+        if field == "status":
+            ids: set[int] = set()
+            for status in status_matches(value):
+                ids |= self._by_status.get(status, set())
+            return ids if within is None else ids & within
+        return self._match_text(value, within, field)
+
+    def _match_text(self, term: str, within: set[int] | None, field: str | None) -> set[int]:
+        """
+        以最少见的三元组的倒排表（或已有结果中更少的一方）为候选，逐个校验子串；
+        field 为 None 时校验路径与 URL。不足三个字符的词没有三元组，在已有结果或全部条目中校验。
+        """
+        candidates = None
+        if len(term) >= 3:
+            candidates = min((self._grams.get(gram, _EMPTY) for gram in _trigrams(term)), key=len)
+            if within is not None and len(within) < len(candidates):
+                candidates = within
+        elif within is not None:
+            candidates = within
+        if field is None:
+            texts = self._texts
+            if candidates is None:
+                return {ident for ident, text in enumerate(texts) if term in text}
+            matched = {ident for ident in candidates if term in texts[ident]}
+        else:
+            entries = self._entries
+            if candidates is None:
+                candidates = self._ids.values()
+            matched = {
+                ident
+                for ident in candidates
+                if entries[ident] is not None and term in getattr(entries[ident], field)
+            }
+        return matched if within is None or candidates is within else matched & within
+
+    def _match_commit(self, prefix: str, within: set[int] | None) -> set[int]:
+        if self._commits is None:
+            self._commits = sorted(
+                (entry.commit, ident) for ident, entry in enumerate(self._entries) if entry is not None and entry.commit
+            )
+        commits = self._commits
+        ids = set()
+        for pos in range(bisect_left(commits, (prefix, -1)), len(commits)):
+            commit, ident = commits[pos]
+            if not commit.startswith(prefix):
+                break
+            ids.add(ident)
+        return ids if within is None else ids & within
+
+    # ---- 维护 ----
+
+    def _add(self, path: str, entry: _Entry) -> None:
+        # 编号不复用：倒排表中的旧编号只会指向空串，不会误配到别的子模块上
+        ident = len(self._entries)
+        text = f"{entry.path}\n{entry.url}"
+        self._entries.append(entry)
+        self._paths.append(path)
+        self._texts.append(text)
+        self._ids[path] = ident
+        grams = self._grams
+        for gram in _trigrams(text):
+            grams[gram].append(ident)
+        self._by_status[entry.status].add(ident)
+        if entry.commit:
+            self._commits = None
+
+    def _replace(self, ident: int, old: _Entry, entry: _Entry) -> None:
+        self._entries[ident] = entry
+        if old.status != entry.status:
+            self._by_status[old.status].discard(ident)
+            self._by_status[entry.status].add(ident)
+        if old.commit != entry.commit:
+            self._commits = None
+
+    def _remove(self, path: str) -> None:
+        ident = self._ids.pop(path)
+        entry = self._entries[ident]
+        self._by_status[entry.status].discard(ident)
+        if entry.commit:
+            self._commits = None
+        self._entries[ident] = None
+        self._paths[ident] = ""
+        self._texts[ident] = ""
+        self._stale += 1
+
+    def _rebuild(self) -> None:
+        live = [(path, self._entries[ident]) for path, ident in self._ids.items()]
+        self.__init__()
+        for path, entry in live:
+            self._add(path, entry)
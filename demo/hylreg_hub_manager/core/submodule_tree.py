@@ -0,0 +1,63 @@
+"""
+嵌套子模块按层读取：展开某个子模块时才读取它的下一层，不对整棵树执行 git submodule status --recursive。
+每层结果按该层的指纹（status_cache.fingerprint：.gitmodules、index、HEAD、config 与各子模块 HEAD 的 mtime/大小）缓存。
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from core.git_runner import load_submodules
+from core.models import SubmoduleInfo, SubmoduleStatus
+from core.status_cache import fingerprint
+
+
+class SubmoduleLevelCache:
+    """工作区绝对路径 -> (指纹, 该层子模块列表)。最多保留 max_entries 层，线程安全。"""
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[str, list[SubmoduleInfo]]] = OrderedDict()
+
+    def get(self, worktree: str, stamp: str) -> list[SubmoduleInfo] | None:
+        with self._lock:
+            entry = self._entries.get(worktree)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(worktree)
+            return list(entry[1])
+
+    def put(self, worktree: str, stamp: str, items: list[SubmoduleInfo]) -> None:
+        with self._lock:
+            self._entries[worktree] = (stamp, list(items))
+            self._entries.move_to_end(worktree)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def may_have_nested(worktree: str | Path, info: SubmoduleInfo) -> bool:
+    """子模块已检出且工作区中有 .gitmodules 时才可能有下一层（只做一次 stat）。"""
+    if info.status == SubmoduleStatus.UNINITIALIZED:
+        return False
+    return (Path(worktree) / ".gitmodules").is_file()
+
+
+def load_level(worktree: str, cache: SubmoduleLevelCache | None = None) -> list[SubmoduleInfo]:
+    """
+    读取 worktree（已检出的子模块工作区）的下一层子模块，路径相对于 worktree。
+    指纹与缓存一致时不读取 index。
+    """
+    stamp = fingerprint(worktree)
+    if cache is not None:
+        hit = cache.get(worktree, stamp)
+        if hit is not None:
+            return hit
+    items = load_submodules(worktree)
+    if cache is not None:
+        cache.put(worktree, stamp, items)
+    return items
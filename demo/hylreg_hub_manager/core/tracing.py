@@ -0,0 +1,161 @@
+"""
+轻量耗时追踪：记录每次 git 调用与刷新各阶段的 span，保存在内存环形缓冲区中，
+可按命令汇总 p50/p95，并导出为 Chrome trace（chrome://tracing、Perfetto 可直接打开）。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+CATEGORY_GIT = "git"
+CATEGORY_STAGE = "stage"
+
+
+@dataclass
+class Span:
+    """一次耗时记录。start 为 time.perf_counter() 秒数，duration 单位为秒。"""
+
+    name: str
+    category: str
+    start: float
+    duration: float = 0.0
+    thread_id: int = 0
+    args: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SpanStats:
+    """同名 span 的汇总。"""
+
+    name: str
+    category: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    max: float
+
+
+def git_span_name(args: list[str]) -> str:
+    """git 调用的汇总名：git 加子命令（submodule 再加一级），不含路径等参数。"""
+    words = [a for a in args if not a.startswith("-")]
+    head = words[:2] if words[:1] == ["submodule"] else words[:1]
+    return " ".join(["git", *head])
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Tracer:
+    """
+    线程安全的 span 环形缓冲区：最多保留 capacity 条，超出时丢弃最早的。
+    version 在每次记录后递增，界面可据此判断是否需要重新汇总。
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        self._version = 0
+
+    @contextmanager
+    def span(self, name: str, category: str = CATEGORY_STAGE, **args) -> Iterator[Span]:
+        """
+        记录 with 块的耗时。块内可向 span.args 补充字段（如 exit_code、out_bytes）。
+        块内抛出异常时同样记录，并在 args 中标记 error。
+        """
+        item = Span(name, category, time.perf_counter(), thread_id=threading.get_ident(), args=args)
+        try:
+            yield item
+        except BaseException as e:
+            item.args["error"] = type(e).__name__
+            raise
+        finally:
+            item.duration = time.perf_counter() - item.start
+            self.record(item)
+
+    def record(self, span: Span) -> None:
+        """加入一条已完成的 span。"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._spans.append(span)
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def spans(self) -> list[Span]:
+        """当前缓冲区内全部 span（按记录顺序）。"""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._version += 1
+
+    def stats(self) -> list[SpanStats]:
+        """按 (类别, 名称) 汇总，按总耗时从大到小排序。"""
+        groups: dict[tuple[str, str], list[float]] = {}
+        for span in self.spans():
+            groups.setdefault((span.category, span.name), []).append(span.duration)
+        result = []
+        for (category, name), durations in groups.items():
+            durations.sort()
+            result.append(
+                SpanStats(
+                    name=name,
+                    category=category,
+                    count=len(durations),
+                    total=sum(durations),
+                    p50=_percentile(durations, 0.50),
+                    p95=_percentile(durations, 0.95),
+                    max=durations[-1],
+                )
+            )
+        result.sort(key=lambda s: s.total, reverse=True)
+        return result
+
+    def to_chrome_trace(self) -> dict:
+        """Chrome trace 事件格式（完整事件 ph=X，时间单位微秒）。"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1_000_000, 3),
+                "dur": round(span.duration * 1_000_000, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in span.args.items()},
+            }
+            for span in self.spans()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str | Path) -> int:
+        """写出 Chrome trace JSON，返回事件数。"""
+        trace = self.to_chrome_trace()
+        Path(path).write_text(json.dumps(trace, ensure_ascii=False), encoding="utf-8")
+        return len(trace["traceEvents"])
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """进程内共享的 Tracer。"""
+    return _tracer
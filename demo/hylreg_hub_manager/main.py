@@ -1,16 +1,40 @@
 """hylreg hub 管理入口：启动 QApplication 与主窗口。"""
 
+import time
+
+_T0 = time.perf_counter()  # 启动计时起点，供 --measure-startup 使用
+
 import sys
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
+
 from app.main_window import MainWindow
 
+MEASURE_FLAG = "--measure-startup"
+
 
 def main() -> None:
-    app = QApplication(sys.argv)
+    argv = [a for a in sys.argv if a != MEASURE_FLAG]
+    measure = len(argv) != len(sys.argv)
+    app = QApplication(argv)
     app.setApplicationName("hylreg_hub_manager")
     app.setOrganizationName("hylreg")
     win = MainWindow()
+    metrics = None
+    if measure:
+        from app.startup_metrics import StartupMetrics
+
+        metrics = StartupMetrics(_T0, win)
     win.show()
+
+    # 先让窗口画出来，再在事件循环中恢复上次的仓库（加载在后台线程进行）
+    def restore() -> None:
+        repo = win.restore_last_repo()
+        if repo and metrics is not None:
+            metrics.expect_data(repo)
+
+    QTimer.singleShot(0, restore)
     sys.exit(app.exec())
 
 
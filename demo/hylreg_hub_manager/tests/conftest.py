@@ -0,0 +1,54 @@
+"""测试共用的夹具：在临时目录中用真实的 git 命令构造仓库，不访问网络。"""
+
+import subprocess
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+Git = Callable[..., str]
+
+
+@pytest.fixture(autouse=True)
+def git_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """隔离用户与系统的 git 配置；允许本地路径的子模块 clone（git 2.38.1 起默认禁止）。"""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(home / ".config"))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "test@example.com")
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "2")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.file.allow")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "always")
+    monkeypatch.setenv("GIT_CONFIG_KEY_1", "init.defaultBranch")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_1", "main")
+
+
+@pytest.fixture
+def git() -> Git:
+    """git(目录, *参数)：执行 git 并返回 stdout；check 为 False 时不检查返回码。"""
+
+    def run(cwd: str | Path, *args: str, check: bool = True) -> str:
+        proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+        if check and proc.returncode != 0:
+            raise AssertionError(f"git {' '.join(args)} 失败（{proc.returncode}）：{proc.stderr}")
+        return proc.stdout
+
+    return run
+
+
+@pytest.fixture
+def make_upstream(tmp_path: Path, git: Git) -> Callable[[str, int], Path]:
+    """make_upstream(名称, 提交数)：创建一个带若干空提交的上游仓库，返回其路径。"""
+
+    def make(name: str, commits: int = 1) -> Path:
+        repo = tmp_path / "upstream" / name
+        git(tmp_path, "init", "-q", str(repo))
+        for n in range(commits):
+            git(repo, "commit", "-q", "--allow-empty", "-m", f"{name} {n}")
+        return repo
+
+    return make
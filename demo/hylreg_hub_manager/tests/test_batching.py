@@ -0,0 +1,98 @@
+"""core.batching：合并执行的子模块命令中，失败的路径单独报告，其余路径的效果与逐个执行相同。"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from core.batching import _arg_cost, argv_budget, chunk_paths, run_batched
+from core.git_runner import run_git
+
+PATHS = ["libs/a", "libs/b", "libs/c", "libs/d"]
+UPDATE = ["submodule", "update", "--init"]
+
+
+@pytest.fixture
+def hub(tmp_path: Path, git, make_upstream) -> Path:
+    root = tmp_path / "hub"
+    git(tmp_path, "init", "-q", str(root))
+    for path in PATHS:
+        git(root, "submodule", "add", "-q", str(make_upstream(Path(path).name, 1)), path)
+    git(root, "commit", "-q", "-m", "add submodules")
+    return root
+
+
+def _uninit_all(git, hub: Path) -> None:
+    """deinit 并删除本地克隆，之后的 update 需要重新 clone。"""
+    git(hub, "submodule", "deinit", "-q", "-f", "--all")
+    shutil.rmtree(hub / ".git" / "modules")
+
+
+def _runner(hub: Path, calls: list[list[str]]):
+    def run(args: list[str]) -> tuple[str, str, int]:
+        calls.append(args)
+        return run_git(str(hub), args)
+
+    return run
+
+
+def _status(git, hub: Path) -> dict[str, str]:
+    """路径 -> git submodule status 的行首符号（空格表示已检出记录的 commit）。"""
+    return {line.split()[1]: line[0] for line in git(hub, "submodule", "status").splitlines()}
+
+
+def test_update_failure_is_isolated(tmp_path: Path, git, hub: Path) -> None:
+    _uninit_all(git, hub)
+    # libs/b 的上游不存在，clone 失败；git 随即放弃整条命令，其余路径尚未检出
+    (tmp_path / "upstream" / "b").rename(tmp_path / "upstream" / "b-gone")
+    calls: list[list[str]] = []
+    _, _, code, results = run_batched(str(hub), [*UPDATE, "--", *PATHS], _runner(hub, calls))
+    assert code != 0
+    assert results["libs/b"].ok is False and "libs/b" in results["libs/b"].message
+    assert all(results[path].ok for path in PATHS if path != "libs/b")
+    assert all("libs/b" not in args for args in calls[1:])
+    status = _status(git, hub)
+    assert status["libs/b"] == "-"
+    assert [status[path] for path in ("libs/a", "libs/c", "libs/d")] == [" "] * 3
+
+
+def test_deinit_failure_is_isolated(git, hub: Path) -> None:
+    # 有本地修改的子模块不能 deinit，git 在该路径处停止
+    (hub / "libs/c/local.txt").write_text("x\n")
+    git(hub / "libs/c", "add", "local.txt")
+    calls: list[list[str]] = []
+    _, _, code, results = run_batched(str(hub), ["submodule", "deinit", "--", *PATHS], _runner(hub, calls))
+    assert code != 0
+    assert results["libs/c"].ok is False and "libs/c" in results["libs/c"].message
+    assert all(results[path].ok for path in PATHS if path != "libs/c")
+    assert all("libs/c" not in args for args in calls[1:])
+    status = _status(git, hub)
+    assert status.pop("libs/c") != "-"
+    assert set(status.values()) == {"-"}
+
+
+def test_chunks_fit_budget() -> None:
+    paths = [f"libs/{'模块' if n % 3 == 0 else 'module'}-{n:03d}" * (1 + n % 4) for n in range(200)]
+    budget = 2000
+    chunks = chunk_paths(paths, UPDATE, budget=budget)
+    assert len(chunks) > 1
+    assert [path for chunk in chunks for path in chunk] == paths
+    for chunk in chunks:
+        assert sum(map(_arg_cost, ["git", *UPDATE, "--", *chunk])) <= budget
+    assert len(chunk_paths(paths, UPDATE, groups=8, budget=budget)) >= 8
+    if hasattr(os, "sysconf"):
+        assert argv_budget() <= os.sysconf("SC_ARG_MAX")
+
+
+def test_chunked_update_runs_each_chunk(git, hub: Path) -> None:
+    _uninit_all(git, hub)
+    # 预算只够放下一两个路径：每块单独执行，结果与一次执行全部路径相同
+    budget = sum(map(_arg_cost, ["git", *UPDATE, "--", *PATHS[:2]]))
+    chunks = chunk_paths(PATHS, UPDATE, budget=budget)
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    calls: list[list[str]] = []
+    for chunk in chunks:
+        _, _, code, results = run_batched(str(hub), [*UPDATE, "--", *chunk], _runner(hub, calls))
+        assert code == 0 and all(result.ok for result in results.values())
+    assert set(_status(git, hub).values()) == {" "}
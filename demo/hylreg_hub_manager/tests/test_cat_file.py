@@ -0,0 +1,77 @@
+"""core.cat_file.CatFilePool：被租用的进程不被淘汰，关闭后不会在池外重启。"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from core.cat_file import CatFileError, CatFilePool
+
+
+@pytest.fixture
+def repos(git, make_upstream) -> list[tuple[Path, str]]:
+    """三个仓库：(git 目录, HEAD 的 sha)。"""
+    result = []
+    for name in ("a", "b", "c"):
+        repo = make_upstream(name, 1)
+        result.append((repo / ".git", git(repo, "rev-parse", "HEAD").strip()))
+    return result
+
+
+def _wait_exit(cat, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while cat.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return not cat.is_alive()
+
+
+def test_leased_process_survives_eviction(repos) -> None:
+    pool = CatFilePool(max_processes=1)
+    (dir_a, sha_a), (dir_b, sha_b), (dir_c, _) = repos
+    try:
+        with pool.get(dir_a) as a:
+            assert a.read(sha_a)[0] == "commit"
+            with pool.get(dir_b) as b:
+                assert b.read(sha_b)[0] == "commit"
+                # 超出上限，但两个进程都正被租用
+                assert pool.size() == 2
+                assert a.is_alive()
+            # b 归还后，按最久未用淘汰未被租用的：a 仍被租用，淘汰 b
+            assert pool.size() == 1
+            assert _wait_exit(b)
+            assert a.read(sha_a)[0] == "commit"
+        with pool.get(dir_c):
+            pass
+        assert pool.size() == 1
+        assert _wait_exit(a)
+    finally:
+        pool.shutdown()
+
+
+def test_close_idle_skips_leased_process(repos) -> None:
+    pool = CatFilePool(idle_timeout=0.1)
+    (dir_a, sha_a), _, _ = repos
+    try:
+        with pool.get(dir_a) as a:
+            a.read(sha_a)
+            time.sleep(0.2)
+            assert pool.close_idle() == 0
+            assert a.is_alive()
+        time.sleep(0.2)
+        assert pool.close_idle() == 1
+        assert pool.size() == 0
+        assert _wait_exit(a)
+    finally:
+        pool.shutdown()
+
+
+def test_closed_process_is_not_restarted(repos) -> None:
+    pool = CatFilePool()
+    (dir_a, sha_a), _, _ = repos
+    with pool.get(dir_a) as a:
+        a.read(sha_a)
+        pool.shutdown()
+        assert not a.is_alive()
+        with pytest.raises(CatFileError):
+            a.read(sha_a)
+        assert not a.is_alive()
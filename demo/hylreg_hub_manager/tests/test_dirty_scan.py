@@ -0,0 +1,45 @@
+"""core.dirty_scan：工作区的改动使缓存失效，按仓库清空缓存不影响其他 hub。"""
+
+from pathlib import Path
+
+import pytest
+
+from core.dirty_scan import DirtyScanCache, scan_dirty
+from core.git_runner import load_submodules
+
+
+def _make_hub(tmp_path: Path, git, make_upstream, name: str) -> Path:
+    root = tmp_path / name
+    git(tmp_path, "init", "-q", str(root))
+    git(root, "submodule", "add", "-q", str(make_upstream(f"{name}-lib")), "lib")
+    git(root, "commit", "-q", "-m", "add submodule")
+    return root
+
+
+@pytest.fixture
+def hub(tmp_path: Path, git, make_upstream) -> Path:
+    return _make_hub(tmp_path, git, make_upstream, "hub")
+
+
+def _changed(hub: Path, cache: DirtyScanCache, cached_only: bool = False) -> int | None:
+    (info,) = scan_dirty(str(hub), load_submodules(str(hub)), cache, cached_only=cached_only)
+    return info.changed_files
+
+
+def test_new_file_in_worktree_invalidates_cache(hub: Path) -> None:
+    cache = DirtyScanCache()
+    assert _changed(hub, cache) == 0
+    (hub / "lib" / "untracked.txt").write_text("x\n")
+    assert _changed(hub, cache) == 1
+
+
+def test_clear_is_limited_to_repo(tmp_path: Path, git, make_upstream, hub: Path) -> None:
+    other = _make_hub(tmp_path, git, make_upstream, "other")
+    cache = DirtyScanCache()
+    for root in (hub, other):
+        (root / "lib" / "new.txt").write_text("x\n")
+        assert _changed(root, cache) == 1
+    cache.clear(str(hub))
+    # 只应用缓存时：被清除的仓库尚未扫描，另一个仓库仍命中
+    assert _changed(hub, cache, cached_only=True) is None
+    assert _changed(other, cache, cached_only=True) == 1
@@ -0,0 +1,76 @@
+"""core.git_runner：超时或取消时终止整个进程组，包括组长退出后仍存活的子进程。"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from core.git_runner import DRAIN_SECONDS, CancelToken, run_git, stream_git
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="进程组信号仅适用于 POSIX")
+
+
+def _stubborn_alias(pid_file: Path) -> list[str]:
+    """
+    git 别名：后台派生一个忽略 SIGTERM、持有输出管道的孙进程。
+    收到 SIGTERM 时中间的 sh 与 git 本身（组长）随即退出，只剩孙进程，需由随后的 SIGKILL 终止。
+    """
+    script = f"!(trap '' TERM; exec sh -c 'echo $$ > {pid_file}; exec sleep 30') & wait"
+    return ["-c", f"alias.stubborn={script}", "stubborn"]
+
+
+def _alive(pid: int) -> bool:
+    """进程是否仍在运行（已被杀死、等待回收的僵尸进程不算）。"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except (OSError, IndexError):
+        return True
+    return state != "Z"
+
+
+def _wait_for_pid(pid_file: Path) -> int:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if pid_file.exists() and pid_file.read_text().strip():
+            return int(pid_file.read_text())
+        time.sleep(0.02)
+    raise AssertionError("子进程未启动")
+
+
+@pytest.mark.parametrize("runner", ["run_git", "stream_git"])
+def test_timeout_kills_children_that_outlive_leader(tmp_path: Path, runner: str) -> None:
+    pid_file = tmp_path / "child.pid"
+    args = _stubborn_alias(pid_file)
+    start = time.monotonic()
+    if runner == "run_git":
+        _, _, code = run_git(str(tmp_path), args, timeout=1)
+    else:
+        _, _, code = stream_git(str(tmp_path), args, lambda line, is_stderr: None, timeout=1)
+    assert code == -1
+    assert time.monotonic() - start < 1 + DRAIN_SECONDS + 2
+    child = _wait_for_pid(pid_file)
+    deadline = time.monotonic() + 2
+    while _alive(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
+
+
+def test_cancel_kills_children_that_outlive_leader(tmp_path: Path) -> None:
+    pid_file = tmp_path / "child.pid"
+    token = CancelToken()
+    threading.Thread(target=lambda: (_wait_for_pid(pid_file), token.cancel()), daemon=True).start()
+    start = time.monotonic()
+    _, _, code = stream_git(str(tmp_path), _stubborn_alias(pid_file), lambda line, is_stderr: None, cancel=token)
+    assert code == -1
+    assert time.monotonic() - start < 5 + DRAIN_SECONDS
+    child = int(pid_file.read_text())
+    deadline = time.monotonic() + 2
+    while _alive(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
@@ -0,0 +1,106 @@
+"""core.gitmodules 与 git config -f .gitmodules 的解析结果一致，按节增量解析，缓存的结果只读。"""
+
+import dataclasses
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from core.gitmodules import GitmodulesParser, load_gitmodules, parse_gitmodules_text
+
+TEXT = r"""# 注释
+; 另一种注释
+[submodule "quoted \"name\""]
+	path = libs/quoted
+	url = "https://example.com/q.git"  # 行尾注释
+	label = "tab\there"
+[submodule "a.b"]
+	path = libs/a.b
+	url = https://example.com/a\
+b.git
+	branch = dev ; 行尾注释
+	shallow
+[submodule.Legacy]
+	path = libs/legacy
+	url = https://example.com/legacy.git
+[submodule "dup"]
+	path = libs/old
+	url = https://example.com/dup.git
+	path = libs/dup
+[core]
+	bare = false
+[submodule "dup"]
+	branch = main
+	update = "rebase"
+"""
+
+
+def _git_config(git, root: Path) -> dict[str, dict[str, str]]:
+    """git config -f .gitmodules --list 的结果：子模块名 -> {键: 最后一次出现的值}。"""
+    modules: dict[str, dict[str, str]] = {}
+    for item in git(root, "config", "-f", ".gitmodules", "--list", "-z").split("\0"):
+        if not item:
+            continue
+        key, _, value = item.partition("\n")
+        section, _, rest = key.partition(".")
+        name, _, option = rest.rpartition(".")
+        if section == "submodule":
+            # 没有 "=" 的布尔键在 -z 输出中没有值部分
+            modules.setdefault(name, {})[option] = value if "\n" in item else "true"
+    return modules
+
+
+def test_matches_git_config(tmp_path: Path, git) -> None:
+    (tmp_path / ".gitmodules").write_text(TEXT)
+    result = parse_gitmodules_text(TEXT)
+    assert result.errors == ()
+    assert {entry.name: dict(entry.options) for entry in result.entries} == _git_config(git, tmp_path)
+    entries = {entry.name: entry for entry in result.entries}
+    assert entries["a.b"].url == "https://example.com/ab.git"
+    assert entries["a.b"].shallow and entries["a.b"].branch == "dev"
+    assert entries["dup"].path == "libs/dup" and entries["dup"].update == "rebase"
+    assert entries["legacy"].line == 13
+
+
+def test_malformed_line_reported_like_git(tmp_path: Path) -> None:
+    text = TEXT.replace("\tbare = false\n", "\tbare = false\n\tthis is not a key\n")
+    (tmp_path / ".gitmodules").write_text(text)
+    proc = subprocess.run(
+        ["git", "config", "-f", ".gitmodules", "--list"], cwd=tmp_path, capture_output=True, text=True
+    )
+    assert proc.returncode != 0
+    git_line = int(re.search(r"line (\d+)", proc.stderr).group(1))
+    result = parse_gitmodules_text(text)
+    assert [error.line for error in result.errors] == [git_line]
+    # git 在出错处停止，这里只跳过出错的行，其余子模块照常解析
+    assert {entry.path for entry in result.entries} == {"libs/quoted", "libs/a.b", "libs/legacy", "libs/dup"}
+
+
+def test_edit_reparses_only_changed_section() -> None:
+    parser = GitmodulesParser()
+    first = parser.parse(TEXT)
+    assert parser.reparsed == 7
+    edited = TEXT.replace("https://example.com/legacy.git", "https://example.com/moved.git")
+    second = parser.parse(edited)
+    assert parser.reparsed == 1
+    old, new = ({entry.name: entry for entry in result.entries} for result in (first, second))
+    assert new["legacy"].url == "https://example.com/moved.git"
+    # 内容与起始行都未变的子模块直接复用
+    assert new["a.b"] is old["a.b"]
+    assert new["quoted \"name\""] is old["quoted \"name\""]
+    assert parser.parse(edited) == second and parser.reparsed == 0
+
+
+def test_cached_result_is_read_only(tmp_path: Path) -> None:
+    (tmp_path / ".gitmodules").write_text(TEXT)
+    result = load_gitmodules(str(tmp_path))
+    entry = result.entries[0]
+    with pytest.raises(AttributeError):
+        result.entries.append(entry)  # type: ignore[attr-defined]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.errors = ()  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        entry.options["path"] = "elsewhere"  # type: ignore[index]
+    again = load_gitmodules(str(tmp_path))
+    assert again is result and again.entries[0].options["path"] == "libs/quoted"
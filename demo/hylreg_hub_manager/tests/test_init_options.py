@@ -0,0 +1,34 @@
+"""core.init_options.init_steps：已初始化子模块的更新只排在 clone 之后，不依赖其成功。"""
+
+from core.init_options import INIT_BASE, InitOptions, init_steps
+from core.models import SubmoduleInfo, SubmoduleStatus
+
+ITEMS = [
+    SubmoduleInfo("libs/new", "https://example.com/new.git", "", SubmoduleStatus.UNINITIALIZED),
+    SubmoduleInfo("libs/old", "https://example.com/old.git", "a" * 40, SubmoduleStatus.INITIALIZED),
+]
+
+
+def test_plain_options_is_one_step() -> None:
+    steps = init_steps(ITEMS, None, InitOptions())
+    assert [(step.args, step.after, step.wait) for step in steps] == [(INIT_BASE, [], [])]
+
+
+def test_update_waits_for_fast_clone() -> None:
+    clone, update = init_steps(ITEMS, None, InitOptions(depth=1))
+    assert clone.args[-2:] == ["--", "libs/new"] and "--depth" in clone.args
+    assert (update.args, update.after, update.wait) == (INIT_BASE, [], [0])
+
+
+def test_update_waits_for_reference_clones() -> None:
+    def references(urls: list[str], seed: bool):
+        assert urls == ["https://example.com/new.git"] and seed
+        return {urls[0]: ("/store/new.git", ["clone", "--bare", urls[0], "/store/new.git"])}
+
+    steps = init_steps(ITEMS, None, InitOptions(), references)
+    init, seed, clone, update = steps
+    assert init.args == ["submodule", "init", "--", "libs/new"]
+    assert seed.args[:2] == ["clone", "--bare"]
+    assert clone.after == [0, 1] and "--reference" in clone.args
+    assert clone.fallback == [*INIT_BASE, "--", "libs/new"]
+    assert (update.after, update.wait) == ([], [2])
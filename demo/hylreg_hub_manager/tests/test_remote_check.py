@@ -0,0 +1,105 @@
+"""core.remote_check：领先/落后计数、TTL 内不重复抓取、远端失败时记入 errors。"""
+
+from pathlib import Path
+
+import pytest
+
+from core import remote_check
+from core.git_runner import load_submodules
+from core.remote_check import RemoteCheckCache, apply_cached_remote_status, check_remotes
+
+GOOD = "libs/good"
+BROKEN = "libs/broken"
+
+
+@pytest.fixture
+def origin(tmp_path: Path, git) -> tuple[Path, Path]:
+    """(裸仓库 origin, 用于向 origin 推送的工作副本)。"""
+    bare = tmp_path / "origin.git"
+    work = tmp_path / "pusher"
+    git(tmp_path, "init", "-q", "--bare", str(bare))
+    git(tmp_path, "clone", "-q", str(bare), str(work))
+    git(work, "commit", "-q", "--allow-empty", "-m", "base")
+    git(work, "push", "-q", "origin", "main")
+    return bare, work
+
+
+def _push(git, work: Path, count: int) -> None:
+    for n in range(count):
+        git(work, "commit", "-q", "--allow-empty", "-m", f"upstream {n}")
+    git(work, "push", "-q", "origin", "main")
+
+
+@pytest.fixture
+def hub(tmp_path: Path, git, origin, make_upstream) -> Path:
+    """libs/good 领先 origin 2 个提交、落后 3 个；libs/broken 的 origin 已不存在。"""
+    bare, work = origin
+    root = tmp_path / "hub"
+    git(tmp_path, "init", "-q", str(root))
+    git(root, "submodule", "add", "-q", str(bare), GOOD)
+    git(root, "submodule", "add", "-q", str(make_upstream("broken")), BROKEN)
+    git(root, "commit", "-q", "-m", "add submodules")
+    for n in range(2):
+        git(root / GOOD, "commit", "-q", "--allow-empty", "-m", f"local {n}")
+    _push(git, work, 3)
+    git(root / BROKEN, "remote", "set-url", "origin", str(tmp_path / "missing.git"))
+    return root
+
+
+@pytest.fixture
+def fetches(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """记录 check_remotes 执行 git fetch 的工作目录。"""
+    calls: list[str] = []
+    run_git = remote_check.run_git
+
+    def recording(repo_root: str, args: list[str], **kwargs):
+        if args[0] == "fetch":
+            calls.append(Path(repo_root).name)
+        return run_git(repo_root, args, **kwargs)
+
+    monkeypatch.setattr(remote_check, "run_git", recording)
+    return calls
+
+
+def _counts(items) -> dict[str, tuple[int | None, int | None]]:
+    return {info.path: (info.remote_ahead, info.remote_behind) for info in items}
+
+
+def test_counts_ahead_and_behind(hub: Path) -> None:
+    items, errors = check_remotes(str(hub), load_submodules(str(hub)), RemoteCheckCache())
+    counts = _counts(items)
+    assert counts[GOOD] == (2, 3)
+    assert counts[BROKEN] == (None, None)
+    assert list(errors) == [BROKEN]
+    assert errors[BROKEN]
+
+
+def test_no_refetch_within_ttl(hub: Path, git, origin, fetches: list[str]) -> None:
+    cache = RemoteCheckCache(ttl=300)
+    items = load_submodules(str(hub))
+    check_remotes(str(hub), items, cache)
+    assert sorted(fetches) == ["broken", "good"]
+
+    # TTL 内再次检查：不抓取，origin 上的新提交不可见；抓取失败的子模块不计入 TTL，仍会重试
+    _push(git, origin[1], 1)
+    fetches.clear()
+    again, errors = check_remotes(str(hub), items, cache)
+    assert fetches == ["broken"]
+    assert _counts(again)[GOOD] == (2, 3)
+    assert list(errors) == [BROKEN]
+
+    cache.ttl = 0
+    fetches.clear()
+    fresh, _ = check_remotes(str(hub), items, cache)
+    assert sorted(fetches) == ["broken", "good"]
+    assert _counts(fresh)[GOOD] == (2, 4)
+
+
+def test_cached_status_without_git(hub: Path, fetches: list[str]) -> None:
+    cache = RemoteCheckCache()
+    items = load_submodules(str(hub))
+    check_remotes(str(hub), items, cache)
+    fetches.clear()
+    cached = apply_cached_remote_status(str(hub), items, cache)
+    assert fetches == []
+    assert _counts(cached) == {GOOD: (2, 3), BROKEN: (None, None)}
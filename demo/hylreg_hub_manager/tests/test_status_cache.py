@@ -0,0 +1,43 @@
+"""core.status_cache：缓存保存加载前的指纹，仓库变化后指纹随之变化。"""
+
+from pathlib import Path
+
+import pytest
+
+from core.git_runner import load_submodules
+from core.status_cache import StatusCache, fingerprint
+
+
+@pytest.fixture
+def hub(tmp_path: Path, git, make_upstream) -> Path:
+    root = tmp_path / "hub"
+    git(tmp_path, "init", "-q", str(root))
+    git(root, "submodule", "add", "-q", str(make_upstream("lib", 2)), "libs/lib")
+    git(root, "commit", "-q", "-m", "add submodule")
+    return root
+
+
+def test_load_returns_stored_items_and_fingerprint(tmp_path: Path, hub: Path) -> None:
+    cache = StatusCache(tmp_path / "cache.sqlite3")
+    assert cache.load(str(hub)) is None
+    stamp = fingerprint(str(hub))
+    items = load_submodules(str(hub))
+    cache.store(str(hub), items, stamp)
+    assert cache.load(str(hub)) == (items, stamp)
+    assert fingerprint(str(hub)) == stamp
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda git, hub: git(hub / "libs/lib", "checkout", "-q", "HEAD~1"),
+        lambda git, hub: git(hub / "libs/lib", "commit", "-q", "--allow-empty", "-m", "local"),
+        lambda git, hub: git(hub, "submodule", "deinit", "-q", "-f", "libs/lib"),
+        lambda git, hub: git(hub, "config", "-f", ".gitmodules", "submodule.libs/lib.branch", "dev"),
+    ],
+    ids=["detach", "branch-commit", "deinit", "gitmodules"],
+)
+def test_fingerprint_changes_with_status(hub: Path, git, change) -> None:
+    stamp = fingerprint(str(hub))
+    change(git, hub)
+    assert fingerprint(str(hub)) != stamp
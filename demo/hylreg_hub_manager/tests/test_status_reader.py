@@ -0,0 +1,71 @@
+"""core.status_reader 与 git submodule status 的结果一致。"""
+
+from pathlib import Path
+
+import pytest
+
+from core.git_runner import parse_submodule_status, run_git_submodule_status
+from core.status_reader import read_submodule_status
+
+# 子模块 -> git submodule status 的行首符号
+EXPECTED = {
+    "libs/clean": "",  # 检出记录的 commit（分离 HEAD）
+    "libs/ahead": "+",  # 检出的 commit 与记录的不同
+    "libs/packed": "",  # HEAD 指向只存在于 packed-refs 中的分支
+    "libs/conflict": "U",  # hub 合并时 gitlink 冲突
+    "libs/uninit": "-",  # 已 deinit
+}
+
+
+@pytest.fixture
+def hub(tmp_path: Path, git, make_upstream) -> Path:
+    root = tmp_path / "hub"
+    git(tmp_path, "init", "-q", str(root))
+    git(root, "commit", "-q", "--allow-empty", "-m", "init")
+    for path in EXPECTED:
+        upstream = make_upstream(Path(path).name, 3)
+        git(root, "submodule", "add", "-q", str(upstream), path)
+    git(root, "commit", "-q", "-m", "add submodules")
+
+    # 两个分支把 libs/conflict 记录为不同的 commit，合并时产生冲突
+    conflict = root / "libs/conflict"
+    git(root, "checkout", "-q", "-b", "other")
+    git(conflict, "checkout", "-q", "HEAD~1")
+    git(root, "add", "libs/conflict")
+    git(root, "commit", "-q", "-m", "conflict: HEAD~1")
+    git(root, "checkout", "-q", "main")
+    git(conflict, "checkout", "-q", "HEAD~1")
+    git(root, "add", "libs/conflict")
+    git(root, "commit", "-q", "-m", "conflict: HEAD~2")
+
+    git(root / "libs/ahead", "checkout", "-q", "HEAD~1")
+    git(root / "libs/packed", "checkout", "-q", "-b", "work")
+    git(root / "libs/packed", "pack-refs", "--all")
+    assert not (root / ".git/modules/libs/packed/refs/heads/work").exists()
+    git(root, "submodule", "deinit", "-q", "-f", "libs/uninit")
+
+    merge = git(root, "merge", "--no-edit", "other", check=False)
+    assert "CONFLICT" in merge
+    return root
+
+
+def _git_status(root: Path, paths: list[str] | None = None) -> dict[str, tuple[str, str]]:
+    stdout, stderr, code = run_git_submodule_status(str(root), paths)
+    assert code == 0, stderr
+    return parse_submodule_status(stdout)
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_matches_git_submodule_status(hub: Path, git, version: int) -> None:
+    git(hub, "config", "index.version", str(version))
+    git(hub, "update-index", "--index-version", str(version))
+    assert int.from_bytes((hub / ".git/index").read_bytes()[4:8], "big") == version
+
+    expected = _git_status(hub)
+    assert {path: prefix for path, (_, prefix) in expected.items()} == EXPECTED
+    assert read_submodule_status(str(hub)) == expected
+
+
+def test_matches_for_selected_paths(hub: Path) -> None:
+    paths = ["libs/ahead", "libs/uninit"]
+    assert read_submodule_status(str(hub), paths) == _git_status(hub, paths)
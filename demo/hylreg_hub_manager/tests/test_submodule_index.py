@@ -0,0 +1,115 @@
+"""core.submodule_index.SubmoduleIndex 与逐条做子串 / 前缀匹配的朴素筛选结果一致。"""
+
+import random
+
+import pytest
+
+from core.models import SubmoduleInfo, SubmoduleStatus
+from core.submodule_index import SubmoduleIndex, status_matches
+
+NAMES = ["core", "Lib", "ui-Kit", "模块", "Ünïcode", "net", "日志", "a", "ab", "db"]
+STATUSES = list(SubmoduleStatus)
+
+
+def _items(rng: random.Random, count: int, start: int = 0) -> list[SubmoduleInfo]:
+    items = []
+    for n in range(start, start + count):
+        parts = [rng.choice(NAMES) for _ in range(rng.randint(1, 3))]
+        path = "/".join(parts) + f"-{n}"
+        url = f"https://Example.com/{rng.choice(NAMES)}/{parts[-1]}.git"
+        commit = "".join(rng.choice("0123456789abcdef") for _ in range(12)) if rng.random() > 0.1 else ""
+        items.append(SubmoduleInfo(path, url, commit, rng.choice(STATUSES)))
+    return items
+
+
+def _naive(items: list[SubmoduleInfo], query: str, status: SubmoduleStatus | None = None) -> set[str] | None:
+    """按 SubmoduleIndex 文档中的查询语法逐条匹配。"""
+    terms = query.split()
+    if not terms and status is None:
+        return None
+
+    def term_matches(info: SubmoduleInfo, term: str) -> bool:
+        field, _, value = term.partition(":")
+        field, value, term = field.lower(), value.lower(), term.lower()
+        path, url, commit = info.path.lower(), info.url.lower(), info.commit.lower()
+        if field == "path" and value:
+            return value in path
+        if field == "url" and value:
+            return value in url
+        if field == "commit" and value:
+            return bool(commit) and commit.startswith(value)
+        if field == "status" and value:
+            return info.status in status_matches(value)
+        if term in path or term in url:
+            return True
+        hex_term = len(term) >= 4 and all(c in "0123456789abcdef" for c in term)
+        return hex_term and bool(commit) and commit.startswith(term)
+
+    return {
+        info.path
+        for info in items
+        if (status is None or info.status == status) and all(term_matches(info, term) for term in terms)
+    }
+
+
+def _queries(rng: random.Random, items: list[SubmoduleInfo]) -> list[str]:
+    """从条目中截取片段并随机改变大小写，覆盖短词、长词、commit 前缀与字段限定。"""
+
+    def fragment(text: str, length: int) -> str:
+        start = rng.randrange(max(1, len(text) - length + 1))
+        piece = text[start : start + length]
+        return "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in piece)
+
+    queries = ["", "a", "Ü", "模", "日志", "git", "xyz", "zzzz", "path:", "status:mod", "status:有修改", "STATUS:领"]
+    for _ in range(150):
+        info = rng.choice(items)
+        kind = rng.random()
+        if kind < 0.4:
+            query = fragment(info.path, rng.randint(1, 6))
+        elif kind < 0.6:
+            query = f"{fragment(info.path, rng.randint(1, 3))} {fragment(info.url, rng.randint(2, 5))}"
+        elif kind < 0.75 and info.commit:
+            query = info.commit[: rng.randint(1, 8)].upper()
+        elif kind < 0.9:
+            field = rng.choice(["path", "URL", "commit"])
+            source = info.commit if field == "commit" else getattr(info, field.lower())
+            query = f"{field}:{source[: rng.randint(1, 5)] if field == 'commit' else fragment(source, rng.randint(1, 4))}"
+        else:
+            query = f"{fragment(info.path, 2)} status:{rng.choice(STATUSES).value[:3]}"
+        queries.append(query)
+    return queries
+
+
+def _check(index: SubmoduleIndex, items: list[SubmoduleInfo], rng: random.Random) -> None:
+    for query in _queries(rng, items):
+        for status in (None, rng.choice(STATUSES)):
+            assert index.search(query, status) == _naive(items, query, status), (query, status)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_naive_filter(seed: int) -> None:
+    rng = random.Random(seed)
+    items = _items(rng, 300)
+    index = SubmoduleIndex()
+    index.update(items)
+    assert len(index) == len(items)
+    _check(index, items, rng)
+
+
+def test_matches_naive_filter_after_incremental_updates() -> None:
+    rng = random.Random(7)
+    items = _items(rng, 200)
+    index = SubmoduleIndex()
+    index.update(items)
+    for round_ in range(1, 6):
+        # 删除一部分、改动 commit / 状态 / URL、新增一部分，覆盖倒排表中的失效编号
+        items = [info for info in items if rng.random() > 0.2]
+        for info in rng.sample(items, len(items) // 3):
+            info.status = rng.choice(STATUSES)
+            info.commit = info.commit[::-1]
+        for info in rng.sample(items, len(items) // 10):
+            info.url = info.url.replace("Example", "mirror")
+        items += _items(rng, 40, start=1000 * round_)
+        index.update([SubmoduleInfo(info.path, info.url, info.commit, info.status) for info in items])
+        assert len(index) == len(items)
+        _check(index, items, rng)